@@ -19,3 +19,13 @@ def append_log_entry(path: Path, entry: LogEntry) -> None:
     with open(path, "a") as f:
         f.write(line)
         f.flush()
+
+
+def append_log_entries(path: Path, entries: list[LogEntry]) -> None:
+    """Append several LogEntries as JSONL lines with a single write."""
+    if not entries:
+        return
+    lines = "".join(entry.model_dump_json() + "\n" for entry in entries)
+    with open(path, "a") as f:
+        f.write(lines)
+        f.flush()
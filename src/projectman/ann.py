@@ -0,0 +1,97 @@
+"""Inverted-file (IVF) approximate nearest-neighbour search in NumPy.
+
+Vectors are split into clusters by spherical k-means.  A query scores the
+cluster centroids and then only the rows of the nprobe closest clusters,
+so it reads a small fraction of the matrix instead of every row.
+EmbeddingStore keeps the centroids and each row's cluster in
+embeddings.db and uses this above its ann_threshold.
+"""
+
+import math
+from typing import Optional
+
+import numpy as np
+
+# Rows compared against the centroids per step; bounds the float32 copy
+# made of float16/int8 matrices.
+_CHUNK_ROWS = 4096
+
+# Training sample per cluster; k-means runs on at most this many rows each.
+_SAMPLE_PER_LIST = 64
+
+
+def list_count(n: int) -> int:
+    """Return the number of clusters to train for n vectors (about sqrt(n))."""
+    return max(1, int(round(math.sqrt(n))))
+
+
+def _unit_rows(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def nearest_centroids(matrix: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Return the index of the most similar centroid for each row of matrix.
+
+    matrix may be float16 or int8: rows are compared by direction only, so
+    int8 rows need no rescaling.
+    """
+    out = np.empty(len(matrix), dtype=np.int64)
+    for start in range(0, len(matrix), _CHUNK_ROWS):
+        chunk = matrix[start:start + _CHUNK_ROWS].astype(np.float32)
+        out[start:start + len(chunk)] = np.argmax(chunk @ centroids.T, axis=1)
+    return out
+
+
+def train_centroids(
+    matrix: np.ndarray, nlist: int, iterations: int = 10, seed: int = 0
+) -> np.ndarray:
+    """Run spherical k-means over a sample of matrix; return (nlist, dim) unit centroids."""
+    rng = np.random.default_rng(seed)
+    n = len(matrix)
+    nlist = max(1, min(nlist, n))
+    size = min(n, nlist * _SAMPLE_PER_LIST)
+    sample = _unit_rows(matrix[np.sort(rng.choice(n, size, replace=False))])
+    centroids = sample[rng.choice(size, nlist, replace=False)].copy()
+
+    for _ in range(iterations):
+        assigned = nearest_centroids(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assigned, sample)
+        # Clusters that lost every member keep their previous centroid.
+        filled = np.bincount(assigned, minlength=nlist) > 0
+        centroids[filled] = _unit_rows(sums[filled])
+    return centroids
+
+
+class InvertedLists:
+    """Rows of a matrix grouped by cluster, for probing at query time."""
+
+    def __init__(self, centroids: np.ndarray, assignments: np.ndarray) -> None:
+        self.centroids = centroids
+        self._order = np.argsort(assignments, kind="stable")
+        self._bounds = np.searchsorted(
+            assignments[self._order], np.arange(len(centroids) + 1)
+        )
+
+    def candidates(self, query: np.ndarray, nprobe: int) -> np.ndarray:
+        """Return the row indices in the nprobe clusters closest to query."""
+        scores = self.centroids @ query
+        nprobe = max(1, min(nprobe, len(scores)))
+        probe = np.argpartition(-scores, nprobe - 1)[:nprobe]
+        return np.concatenate(
+            [self._order[self._bounds[c]:self._bounds[c + 1]] for c in probe]
+        )
+
+
+def needs_training(centroids: Optional[np.ndarray], n: int, dim: int) -> bool:
+    """Whether centroids are missing, of another width, or too few for n rows.
+
+    Centroids are retrained once the collection has grown about fourfold
+    since training, i.e. when list_count(n) reaches twice their number.
+    """
+    if centroids is None or centroids.ndim != 2 or centroids.shape[1] != dim:
+        return True
+    return list_count(n) >= 2 * len(centroids)
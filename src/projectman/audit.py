@@ -7,7 +7,6 @@ from typing import Optional
 import yaml
 
 from .config import load_config
-from .deps import build_combined_dep_graph, detect_cycle
 from .store import Store
 
 
@@ -157,7 +156,7 @@ def run_audit(
 
     # Check 7: Empty active epic (active epic with no linked stories)
     for epic in store.list_epics(status="active"):
-        linked = [s for s in store.list_stories() if s.epic_id == epic.id]
+        linked = store.list_stories(epic_id=epic.id)
         if not linked:
             findings.append({
                 "severity": "warning",
@@ -168,7 +167,7 @@ def run_audit(
 
     # Check 8: Done epic with open stories
     for epic in store.list_epics(status="done"):
-        linked = [s for s in store.list_stories() if s.epic_id == epic.id]
+        linked = store.list_stories(epic_id=epic.id)
         open_stories = [s for s in linked if s.status.value not in ("done", "archived")]
         if open_stories:
             findings.append({
@@ -193,7 +192,7 @@ def run_audit(
     draft_threshold = date.today() - timedelta(days=30)
     for epic in store.list_epics(status="draft"):
         if epic.updated < draft_threshold:
-            linked = [s for s in store.list_stories() if s.epic_id == epic.id]
+            linked = store.list_stories(epic_id=epic.id)
             if not linked:
                 days = (date.today() - epic.updated).days
                 findings.append({
@@ -276,8 +275,7 @@ def run_audit(
     all_tasks = store.list_tasks()
     all_stories = store.list_stories()
     if all_tasks or all_stories:
-        graph = build_combined_dep_graph(all_tasks, all_stories)
-        cycle = detect_cycle(graph)
+        cycle = store.dependency_graph().find_cycle()
         if cycle is not None:
             path = " -> ".join(cycle)
             findings.append({
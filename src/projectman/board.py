@@ -0,0 +1,152 @@
+"""Task board shared by pm_board and /api/board, computed once per store generation.
+
+A board groups every task by workflow state and checks each todo task
+against the Definition of Ready.  Built per request, that meant a body
+read and a readiness check per task, and for each task with depends_on a
+status map rebuilt from every task and story.  get_board() builds the
+status map, story lookup and per-story topological positions once, checks
+each todo task against them, and keeps the result until
+Store.generation() changes.
+"""
+
+import threading
+from dataclasses import dataclass, field
+from typing import Optional
+
+from .deps import build_status_map, topological_sort
+from .models import StoryFrontmatter, TaskFrontmatter
+from .readiness import check_readiness, compute_hints
+from .store import Store
+
+# Story priority rank for ordering available tasks.
+PRIORITY_ORDER = {"must": 0, "should": 1, "could": 2, "wont": 3}
+
+COLUMNS = ("available", "not_ready", "in_progress", "in_review", "blocked")
+
+_STATUS_COLUMNS = {"in-progress": "in_progress", "review": "in_review", "blocked": "blocked"}
+
+
+@dataclass
+class BoardTask:
+    """One task on the board with what the surfaces display about it."""
+
+    task: TaskFrontmatter
+    story: Optional[StoryFrontmatter]
+    story_label: str
+    blockers: list[str] = field(default_factory=list)
+    hints: list[str] = field(default_factory=list)
+
+
+@dataclass
+class Board:
+    """Tasks per column; available is in pick order, the rest in list order."""
+
+    generation: tuple
+    columns: dict[str, list[BoardTask]]
+    topo_position: dict[str, int]
+
+    def filtered(
+        self, assignee: Optional[str] = None, tag: Optional[str] = None
+    ) -> dict[str, list[BoardTask]]:
+        """Return the columns restricted to one assignee and/or tag.
+
+        A task matches tag if it or its story carries it.  Filtering by
+        assignee leaves out the todo columns, which hold unassigned work.
+        """
+        if assignee is None and tag is None:
+            return self.columns
+
+        def keep(entry: BoardTask) -> bool:
+            if assignee and entry.task.assignee != assignee:
+                return False
+            if tag and tag not in entry.task.tags and (
+                entry.story is None or tag not in entry.story.tags
+            ):
+                return False
+            return True
+
+        return {
+            column: [] if assignee and column in ("available", "not_ready")
+            else [entry for entry in entries if keep(entry)]
+            for column, entries in self.columns.items()
+        }
+
+
+def sort_key(
+    task: TaskFrontmatter,
+    story: Optional[StoryFrontmatter],
+    topo_position: dict[str, int],
+) -> tuple:
+    """Pick order for ready tasks: story priority, story, dependency order, points."""
+    return (
+        PRIORITY_ORDER.get(story.priority.value if story else "should", 1),
+        task.story_id,
+        topo_position.get(task.id, 0),
+        task.points or 99,
+    )
+
+
+def topo_positions(tasks: list[TaskFrontmatter]) -> dict[str, int]:
+    """Return each task's index in its story's dependency order."""
+    by_story: dict[str, list[TaskFrontmatter]] = {}
+    for task in tasks:
+        by_story.setdefault(task.story_id, []).append(task)
+    positions: dict[str, int] = {}
+    for story_tasks in by_story.values():
+        try:
+            ordered = topological_sort(story_tasks)
+        except Exception:
+            ordered = story_tasks
+        for idx, task in enumerate(ordered):
+            positions[task.id] = idx
+    return positions
+
+
+def build_board(store: Store, generation: tuple = ()) -> Board:
+    """Compute the board for every task in store."""
+    tasks = store.list_tasks()
+    stories = {story.id: story for story in store.list_stories()}
+    status_map = build_status_map(tasks, list(stories.values()))
+    topo_position = topo_positions(tasks)
+    bodies = store.read_bodies("tasks", [t.id for t in tasks if t.status.value == "todo"])
+
+    columns: dict[str, list[BoardTask]] = {column: [] for column in COLUMNS}
+    for task in tasks:
+        story = stories.get(task.story_id)
+        entry = BoardTask(
+            task=task,
+            story=story,
+            story_label=f"{story.id} — {story.title}" if story else task.story_id,
+        )
+        status = task.status.value
+        if status in _STATUS_COLUMNS:
+            columns[_STATUS_COLUMNS[status]].append(entry)
+        elif status == "todo" and task.id in bodies:
+            body = bodies[task.id]
+            readiness = check_readiness(task, body, store, status_map=status_map)
+            if readiness["ready"]:
+                entry.hints = compute_hints(task, body)
+                columns["available"].append(entry)
+            else:
+                entry.blockers = readiness["blockers"]
+                columns["not_ready"].append(entry)
+    columns["available"].sort(key=lambda e: sort_key(e.task, e.story, topo_position))
+    return Board(generation=generation, columns=columns, topo_position=topo_position)
+
+
+_boards: dict[str, Board] = {}
+_boards_lock = threading.Lock()
+
+
+def get_board(store: Store) -> Board:
+    """Return the board for store, rebuilding it only after a change."""
+    generation = store.generation()
+    key = str(store.project_dir)
+    with _boards_lock:
+        board = _boards.get(key)
+    if board is not None and board.generation == generation:
+        return board
+    board = build_board(store, generation)
+    with _boards_lock:
+        _boards[key] = board
+    return board
@@ -357,11 +357,29 @@ def upgrade(check, no_skills):
 @click.option("--transport", type=click.Choice(["stdio", "sse"]), default="stdio", help="Transport mode (default: stdio)")
 @click.option("--host", default="127.0.0.1", help="Host to bind to (SSE mode only)")
 @click.option("--port", default=22001, type=int, help="Port to bind to (SSE mode only)")
-def serve(transport, host, port):
+@click.option(
+    "--index-flush-interval",
+    default=0.0,
+    type=float,
+    envvar="PROJECTMAN_INDEX_FLUSH_INTERVAL",
+    help="Rewrite index files from a background thread at most every N seconds instead of after each change (default: 0, write inline)",
+)
+@click.option(
+    "--preload-embeddings/--no-preload-embeddings",
+    default=False,
+    help="Load the embedding model in the background at startup (default: off)",
+)
+def serve(transport, host, port, index_flush_interval, preload_embeddings):
     """Start the MCP server."""
     try:
         from projectman.server import run_server
-        run_server(transport=transport, host=host, port=port)
+        run_server(
+            transport=transport,
+            host=host,
+            port=port,
+            index_flush_interval=index_flush_interval,
+            preload_embeddings=preload_embeddings,
+        )
     except ImportError:
         click.echo("Error: MCP extras not installed. Run: pip install projectman[mcp]", err=True)
         raise SystemExit(1)
@@ -2,8 +2,8 @@
 
 from __future__ import annotations
 
-from collections import defaultdict, deque
-from typing import Union
+from collections import defaultdict
+from typing import Callable, Iterable, Union
 
 from projectman.models import StoryFrontmatter, TaskFrontmatter
 
@@ -61,43 +61,129 @@ def detect_cycle(graph: dict[str, list[str]]) -> list[str] | None:
 
     Uses DFS with WHITE (0) / GRAY (1) / BLACK (2) node coloring.
     """
+    return _find_cycle(
+        sorted(graph), lambda node: [dep for dep in graph[node] if dep in graph]
+    )
+
+
+def _find_cycle(
+    starts: Iterable[str], neighbours: Callable[[str], Iterable[str]]
+) -> list[str] | None:
+    """Return the first cycle reachable from *starts*, or ``None``.
+
+    An iterative DFS with WHITE/GRAY/BLACK coloring, so chains of any
+    length fit in memory rather than the interpreter stack.  A back edge
+    node -> dep closes the cycle [dep, ..., node, dep].
+    """
     WHITE, GRAY, BLACK = 0, 1, 2
-    color: dict[str, int] = {node: WHITE for node in graph}
-    parent: dict[str, str | None] = {node: None for node in graph}
-
-    def _dfs(node: str) -> list[str] | None:
-        color[node] = GRAY
-        for dep in graph[node]:
-            if dep not in color:
-                continue
-            if color[dep] == GRAY:
-                # Back edge — reconstruct cycle
-                cycle = [dep, node]
-                cur = node
-                while cur != dep:
-                    cur = parent[cur]  # type: ignore[assignment]
-                    if cur is None or cur == dep:
-                        break
-                    cycle.append(cur)
-                cycle.append(dep)
-                cycle.reverse()
-                return cycle
-            if color[dep] == WHITE:
-                parent[dep] = node
-                result = _dfs(dep)
-                if result is not None:
-                    return result
-        color[node] = BLACK
-        return None
-
-    for node in sorted(graph):
-        if color[node] == WHITE:
-            result = _dfs(node)
-            if result is not None:
-                return result
+    color: dict[str, int] = {}
+    parent: dict[str, str | None] = {}
+
+    for root in starts:
+        if color.get(root, WHITE) != WHITE:
+            continue
+        color[root] = GRAY
+        parent[root] = None
+        stack = [(root, iter(neighbours(root)))]
+        while stack:
+            node, deps = stack[-1]
+            for dep in deps:
+                state = color.get(dep, WHITE)
+                if state == GRAY:
+                    # Back edge — reconstruct cycle
+                    cycle = [dep, node]
+                    cur = node
+                    while cur != dep:
+                        cur = parent[cur]  # type: ignore[assignment]
+                        if cur is None or cur == dep:
+                            break
+                        cycle.append(cur)
+                    cycle.append(dep)
+                    cycle.reverse()
+                    return cycle
+                if state == WHITE:
+                    color[dep] = GRAY
+                    parent[dep] = node
+                    stack.append((dep, iter(neighbours(dep))))
+                    break
+            else:
+                color[node] = BLACK
+                stack.pop()
     return None
 
 
+class DependencyGraph:
+    """Project-wide depends_on edges between tasks and stories.
+
+    Holds each item's depends_on list and the reverse edges, so both the
+    dependencies and the dependents of an item are dict lookups.  Edges to
+    IDs that are not in the graph are kept (the item may appear later) but
+    are not followed.  Store.dependency_graph() keeps one per project in
+    step with the item caches.
+    """
+
+    def __init__(self) -> None:
+        self._forward: dict[str, list[str]] = {}
+        self._reverse: dict[str, set[str]] = defaultdict(set)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._forward
+
+    def __len__(self) -> int:
+        return len(self._forward)
+
+    def set(self, item_id: str, depends_on: list[str]) -> None:
+        """Add item_id, or replace its edges with depends_on."""
+        self.discard(item_id)
+        self._forward[item_id] = list(depends_on)
+        for dep in depends_on:
+            self._reverse[dep].add(item_id)
+
+    def discard(self, item_id: str) -> None:
+        """Remove item_id and its outgoing edges, if present."""
+        for dep in self._forward.pop(item_id, ()):
+            dependents = self._reverse.get(dep)
+            if dependents is not None:
+                dependents.discard(item_id)
+                if not dependents:
+                    del self._reverse[dep]
+
+    def clear(self) -> None:
+        self._forward.clear()
+        self._reverse.clear()
+
+    def dependencies(self, item_id: str) -> list[str]:
+        """Return the IDs item_id depends on, as listed in its depends_on."""
+        return list(self._forward.get(item_id, ()))
+
+    def dependents(self, item_id: str) -> set[str]:
+        """Return the IDs of the items with item_id in their depends_on."""
+        return set(self._reverse.get(item_id, ()))
+
+    def as_dict(self) -> dict[str, list[str]]:
+        """Return the graph as an adjacency list, unknown IDs dropped."""
+        return {
+            item_id: [dep for dep in deps if dep in self._forward]
+            for item_id, deps in self._forward.items()
+        }
+
+    def find_cycle(self, start: Iterable[str] | None = None) -> list[str] | None:
+        """Return a cycle path, or ``None`` if there is none.
+
+        With start, only the items reachable from those IDs are explored:
+        after changing some items' depends_on in a graph that had no
+        cycle, any new cycle passes through one of them.  Without it the
+        whole graph is searched, as by detect_cycle.
+        """
+        starts = sorted(self._forward) if start is None else [
+            item_id for item_id in start if item_id in self._forward
+        ]
+        return _find_cycle(
+            starts,
+            lambda node: [dep for dep in self._forward[node] if dep in self._forward],
+        )
+
+
 def topological_sort(
     tasks: list[TaskFrontmatter],
 ) -> list[TaskFrontmatter]:
@@ -107,38 +193,50 @@ def topological_sort(
     sorted by ID for stable output.  Raises :class:`CycleError` if a
     cycle is detected.
     """
-    graph = build_dep_graph(tasks)
     task_map = {t.id: t for t in tasks}
+    return [task_map[tid] for tid in topological_order(build_dep_graph(tasks))]
 
-    # Check for cycles first
-    cycle = detect_cycle(graph)
-    if cycle is not None:
-        raise CycleError(cycle)
-
-    # Kahn's algorithm
-    in_degree: dict[str, int] = defaultdict(int)
-    dependents: dict[str, list[str]] = defaultdict(list)
 
-    for node in graph:
-        in_degree.setdefault(node, 0)
-        for dep in graph[node]:
-            dependents[dep].append(node)
-            in_degree[node] += 1
+def topological_order(graph: dict[str, list[str]]) -> list[str]:
+    """Return the IDs of an adjacency list in dependency order.
 
-    queue: deque[str] = deque(
-        sorted(node for node, deg in in_degree.items() if deg == 0)
-    )
-    result: list[str] = []
-
-    while queue:
-        node = queue.popleft()
-        result.append(node)
-        for dependent in sorted(dependents[node]):
+    Kahn's algorithm as in topological_sort, over any graph from
+    build_dep_graph or build_combined_dep_graph; dependencies missing
+    from the graph are ignored.  Raises :class:`CycleError` if a cycle
+    is detected.
+    """
+    in_degree: dict[str, int] = {}
+    dependents: dict[str, list[str]] = {}
+
+    for node, deps in graph.items():
+        count = 0
+        for dep in deps:
+            if dep in graph:
+                children = dependents.get(dep)
+                if children is None:
+                    dependents[dep] = [node]
+                else:
+                    children.append(node)
+                count += 1
+        in_degree[node] = count
+
+    # The result list doubles as the BFS queue: it grows as nodes
+    # become ready and the loop reaches them in turn.
+    result = sorted(node for node, deg in in_degree.items() if deg == 0)
+    for node in result:
+        children = dependents.get(node)
+        if not children:
+            continue
+        if len(children) > 1:
+            children.sort()
+        for dependent in children:
             in_degree[dependent] -= 1
             if in_degree[dependent] == 0:
-                queue.append(dependent)
+                result.append(dependent)
 
-    return [task_map[tid] for tid in result]
+    if len(result) < len(in_degree):
+        raise CycleError(detect_cycle(graph))
+    return result
 
 
 def incomplete_dependencies(
@@ -158,30 +256,50 @@ def incomplete_dependencies(
     ]
 
 
-def incomplete_task_dependencies(
-    task: TaskFrontmatter,
+def build_status_map(
     all_tasks: list[TaskFrontmatter],
     all_stories: list[StoryFrontmatter],
-) -> list[str]:
-    """Return depends_on IDs that are not done (cross-story aware).
-
-    A task dependency is incomplete if:
-    - It references a task that is not done
-    - It references a story that is not done
-    """
+) -> dict[str, str]:
+    """Return a mapping of every task and story ID to its status value."""
     status_map: dict[str, str] = {}
     for t in all_tasks:
         status_map[t.id] = t.status.value
     for s in all_stories:
         status_map[s.id] = s.status.value
+    return status_map
+
 
+def incomplete_in_status_map(
+    depends_on: list[str],
+    status_map: dict[str, str],
+) -> list[str]:
+    """Return the IDs in depends_on that are known to status_map and not done.
+
+    Lets callers checking many items build the status map once.
+    """
     return [
         dep
-        for dep in task.depends_on
+        for dep in depends_on
         if dep in status_map and status_map[dep] != "done"
     ]
 
 
+def incomplete_task_dependencies(
+    task: TaskFrontmatter,
+    all_tasks: list[TaskFrontmatter],
+    all_stories: list[StoryFrontmatter],
+) -> list[str]:
+    """Return depends_on IDs that are not done (cross-story aware).
+
+    A task dependency is incomplete if:
+    - It references a task that is not done
+    - It references a story that is not done
+    """
+    return incomplete_in_status_map(
+        task.depends_on, build_status_map(all_tasks, all_stories)
+    )
+
+
 def incomplete_story_dependencies(
     story: StoryFrontmatter,
     all_tasks: list[TaskFrontmatter],
@@ -193,14 +311,6 @@ def incomplete_story_dependencies(
     - It references a story that is not done
     - It references a task that is not done
     """
-    status_map: dict[str, str] = {}
-    for t in all_tasks:
-        status_map[t.id] = t.status.value
-    for s in all_stories:
-        status_map[s.id] = s.status.value
-
-    return [
-        dep
-        for dep in story.depends_on
-        if dep in status_map and status_map[dep] != "done"
-    ]
+    return incomplete_in_status_map(
+        story.depends_on, build_status_map(all_tasks, all_stories)
+    )
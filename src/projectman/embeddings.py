@@ -1,14 +1,290 @@
 """Embedding-based semantic search using fastembed + SQLite."""
 
+import atexit
 import hashlib
+import json
+import logging
+import os
 import sqlite3
-import struct
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterable, Optional
 
 import numpy as np
 
+from . import ann
+
+logger = logging.getLogger(__name__)
+
+MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+# Texts handed to the model per call by index_items().
+DEFAULT_BATCH_SIZE = 64
+
+# Schema version of embeddings.db, kept in PRAGMA user_version.
+#   0: embeddings(id, title, type, vector, content_hash), float32 vectors
+#   1: adds embeddings.encoding, the storage format of each row's vector
+#   2: adds embeddings.cluster and ivf_centroids for approximate search
+#   3: adds embeddings.status/tags/epic_id/story_id for search filters
+SCHEMA_VERSION = 3
+
+# Filterable item attributes stored next to each vector, as written by
+# item_attrs(); tags is kept as a JSON list.  A NULL tags column means the
+# row was indexed without attributes and only matches unfiltered searches.
+_ATTR_COLUMNS = ("status", "tags", "epic_id", "story_id")
+
+# Vector storage formats.  float32 is the original struct-packed layout;
+# float16 halves it; int8 stores a float32 scale (max |v| / 127) followed by
+# one signed byte per dimension, about a quarter of the float32 size.
+ENCODINGS = ("float32", "float16", "int8")
+
+# Storage format for stores opened by get_embedding_store().
+_default_encoding = os.environ.get("PROJECTMAN_EMBEDDING_ENCODING", "float32")
+
+# Rows scored per step when searching a float16/int8 matrix; each chunk is
+# widened to float32 on its own so the whole matrix never is.
+_SCORE_CHUNK_ROWS = 4096
+
+# Stores with at least this many vectors search an IVF index (see ann.py)
+# instead of scoring every row; smaller ones stay exact.
+ANN_THRESHOLD = 20000
+
+# Clusters scanned per query by the IVF index.
+DEFAULT_NPROBE = 16
+
+# One fastembed model per process, shared by every EmbeddingStore.  Loading
+# the ONNX model takes seconds, so it is created once, on first use or by
+# preload_model().
+_model = None
+_model_lock = threading.Lock()
+
+
+def get_model():
+    """Return the shared embedding model, loading it on first call.
+
+    Raises ImportError if fastembed is not installed.
+    """
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                from fastembed import TextEmbedding
+
+                _model = TextEmbedding(MODEL_NAME)
+    return _model
+
+
+# Query embeddings kept by embed_query(), keyed by normalized query text.
+# Each entry remembers the model that produced it.
+QUERY_CACHE_SIZE = 256
+_query_cache: OrderedDict[str, tuple[object, np.ndarray]] = OrderedDict()
+_query_cache_lock = threading.Lock()
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase query and collapse its whitespace.
+
+    The model (all-MiniLM-L6-v2) is uncased, so this does not change the
+    embedding; it only lets equivalent queries share a cache entry.
+    """
+    return " ".join(query.lower().split())
+
+
+def embed_query(query: str) -> np.ndarray:
+    """Embed one query string with the shared model.
+
+    The last QUERY_CACHE_SIZE distinct queries are cached, so repeating a
+    search does not run the model again.  The returned array is read-only.
+
+    Raises ImportError if fastembed is not installed.
+    """
+    key = normalize_query(query)
+    model = get_model()
+    with _query_cache_lock:
+        entry = _query_cache.get(key)
+        if entry is not None and entry[0] is model:
+            _query_cache.move_to_end(key)
+            return entry[1]
+    vector = np.asarray(next(model.embed([key])), dtype=np.float32)
+    vector.setflags(write=False)
+    with _query_cache_lock:
+        _query_cache[key] = (model, vector)
+        _query_cache.move_to_end(key)
+        while len(_query_cache) > QUERY_CACHE_SIZE:
+            _query_cache.popitem(last=False)
+    return vector
+
+
+def preload_model() -> threading.Thread:
+    """Warm the shared model in a background thread.
+
+    Failures (e.g. fastembed not installed) are logged and ignored; the
+    model is then loaded, or the error raised, on first use as before.
+    """
+
+    def _load() -> None:
+        try:
+            get_model()
+        except Exception as e:
+            logger.debug("embedding model preload failed: %s", e)
+
+    thread = threading.Thread(target=_load, name="projectman-embedding-preload", daemon=True)
+    thread.start()
+    return thread
+
+
+def _row_dtype(encoding: str, dim: int) -> np.dtype:
+    """Return the packed numpy record layout of one stored vector."""
+    if encoding == "int8":
+        return np.dtype([("scale", np.float32), ("v", np.int8, (dim,))])
+    return np.dtype([("v", np.dtype(encoding), (dim,))])
+
+
+def _row_dim(encoding: str, nbytes: int) -> int:
+    """Return the vector width of a blob, or -1 if the size does not fit."""
+    header, itemsize = (4, 1) if encoding == "int8" else (0, np.dtype(encoding).itemsize)
+    width, extra = divmod(nbytes - header, itemsize)
+    return width if not extra and width >= 0 else -1
+
+
+def encode_vector(vector, encoding: str = "float32") -> bytes:
+    """Serialize one embedding in the given storage format."""
+    v = np.asarray(vector, dtype=np.float32)
+    if encoding == "int8":
+        peak = float(np.abs(v).max()) if v.size else 0.0
+        scale = np.float32(peak / 127.0 if peak else 1.0)
+        q = np.clip(np.rint(v / scale), -127, 127).astype(np.int8)
+        return scale.tobytes() + q.tobytes()
+    return v.astype(encoding).tobytes()
+
+
+def decode_vector(blob: bytes, encoding: str = "float32") -> np.ndarray:
+    """Deserialize one stored embedding to a float32 array."""
+    dim = _row_dim(encoding, len(blob))
+    if dim < 0:
+        raise ValueError(f"{len(blob)}-byte blob is not a {encoding} vector")
+    row = np.frombuffer(blob, dtype=_row_dtype(encoding, dim))[0]
+    v = row["v"].astype(np.float32)
+    return v * row["scale"] if encoding == "int8" else v
+
+
+def item_attrs(meta) -> dict:
+    """Return the filterable attributes of a story or task frontmatter model.
+
+    Pass the result with an item to index_item/index_items so searches can
+    filter on status, tag and epic.  A task's epic is found through its
+    story_id at query time, so it follows the story if that moves.
+    """
+    status = getattr(meta, "status", None)
+    status = getattr(status, "value", status)
+    return {
+        "status": None if status is None else str(status),
+        "tags": [str(tag) for tag in getattr(meta, "tags", None) or []],
+        "epic_id": getattr(meta, "epic_id", None),
+        "story_id": getattr(meta, "story_id", None),
+    }
+
+
+def _attr_row(attrs: Optional[dict]) -> tuple[Optional[str], ...]:
+    """Return the _ATTR_COLUMNS values for attrs (all NULL when unknown)."""
+    if attrs is None:
+        return (None, None, None, None)
+    return (
+        attrs.get("status"),
+        json.dumps(list(attrs.get("tags") or [])),
+        attrs.get("epic_id"),
+        attrs.get("story_id"),
+    )
+
+
+def _tags(attr_row: tuple) -> tuple[str, ...]:
+    """Return the tags of an _attr_row()-style row."""
+    return tuple(json.loads(attr_row[1])) if attr_row[1] else ()
+
+
+class _RowAttrs:
+    """Per-row type and filter attributes of a loaded matrix.
+
+    Missing values are stored as "" so the object arrays compare and sort
+    cleanly; tag_rows maps each tag to the rows carrying it.
+    """
+
+    def __init__(self, ids: list[str], types: list[str], rows: list[tuple]) -> None:
+        self.ids = np.array(ids, dtype=object)
+        self.types = np.array(types, dtype=object)
+        self.statuses = np.array([row[0] or "" for row in rows], dtype=object)
+        self.epic_ids = np.array([row[2] or "" for row in rows], dtype=object)
+        self.story_ids = np.array([row[3] or "" for row in rows], dtype=object)
+        self.tags = [_tags(row) for row in rows]
+        tag_rows: dict[str, list[int]] = {}
+        for i, tags in enumerate(self.tags):
+            for tag in tags:
+                tag_rows.setdefault(tag, []).append(i)
+        self.tag_rows = {tag: np.array(idx, dtype=np.int64) for tag, idx in tag_rows.items()}
+
+    def update(self, rows: list[int], types: list[str], attr_rows: list[tuple]) -> None:
+        """Overwrite the type and attributes of existing rows in place."""
+        index = np.array(rows, dtype=np.int64)
+        self.types[index] = types
+        self.statuses[index] = [row[0] or "" for row in attr_rows]
+        self.epic_ids[index] = [row[2] or "" for row in attr_rows]
+        self.story_ids[index] = [row[3] or "" for row in attr_rows]
+        touched: set[str] = set()
+        for i, row in zip(rows, attr_rows):
+            tags = _tags(row)
+            touched.update(self.tags[i], tags)
+            self.tags[i] = tags
+        for tag in touched:
+            kept = self.tag_rows.get(tag, np.empty(0, dtype=np.int64))
+            kept = kept[~np.isin(kept, index)]
+            added = [i for i in rows if tag in self.tags[i]]
+            if len(kept) or added:
+                self.tag_rows[tag] = np.sort(np.concatenate([kept, added]).astype(np.int64))
+            else:
+                self.tag_rows.pop(tag, None)
+
+    def extended(self, ids: list[str], types: list[str], attr_rows: list[tuple]) -> "_RowAttrs":
+        """Return a copy with rows appended; self is left as it was."""
+        added = _RowAttrs(ids, types, attr_rows)
+        start = len(self.ids)
+        out = _RowAttrs.__new__(_RowAttrs)
+        for name in ("ids", "types", "statuses", "epic_ids", "story_ids"):
+            setattr(out, name, np.concatenate([getattr(self, name), getattr(added, name)]))
+        out.tags = self.tags + added.tags
+        out.tag_rows = dict(self.tag_rows)
+        for tag, idx in added.tag_rows.items():
+            out.tag_rows[tag] = np.concatenate(
+                [self.tag_rows.get(tag, np.empty(0, dtype=np.int64)), idx + start]
+            )
+        return out
+
+    def mask(
+        self,
+        item_type: Optional[str] = None,
+        status: Optional[str] = None,
+        tag: Optional[str] = None,
+        epic_id: Optional[str] = None,
+    ) -> Optional[np.ndarray]:
+        """Return a boolean mask of rows passing every given filter, or None if none are."""
+        if item_type is None and status is None and tag is None and epic_id is None:
+            return None
+        mask = np.ones(len(self.types), dtype=bool)
+        if item_type is not None:
+            mask &= self.types == item_type
+        if status is not None:
+            mask &= self.statuses == status
+        if tag is not None:
+            tagged = np.zeros(len(mask), dtype=bool)
+            tagged[self.tag_rows.get(tag, [])] = True
+            mask &= tagged
+        if epic_id is not None:
+            stories = self.ids[(self.epic_ids == epic_id) & (self.types == "story")]
+            mask &= (self.epic_ids == epic_id) | np.isin(self.story_ids, stories)
+        return mask
+
 
 @dataclass
 class EmbeddingResult:
@@ -19,79 +295,305 @@ class EmbeddingResult:
 
 
 class EmbeddingStore:
-    """SQLite-backed vector store for semantic search."""
+    """SQLite-backed vector store for semantic search.
+
+    SQLite is the source of truth.  For search, all vectors are held in one
+    contiguous matrix with the id/title/type columns in parallel lists,
+    loaded on first search and reloaded when the database file changes
+    (detected by its inode, size and mtime), so a query is a single
+    matrix-vector product.  Rows this store writes itself are patched
+    into the loaded matrix instead of forcing a reload.
+
+    encoding picks how vectors are stored, on disk and in that matrix (see
+    ENCODINGS).  Rows written in another format are converted when the
+    store is opened.  float16 and int8 matrices are scored directly, in
+    chunks, with int8 rows rescaled by their per-vector scale.
+
+    Once a store holds ann_threshold vectors, search switches to an IVF
+    index: k-means centroids are trained on first load and saved in
+    ivf_centroids, every row records its cluster, and a query scores only
+    the rows of the nprobe nearest clusters.  index_item assigns new rows
+    to a cluster as they are written; the centroids are retrained when
+    the store has grown about fourfold.
+
+    Items indexed with attributes (see item_attrs) can be filtered by
+    type, status, tag and epic.  Filters select rows before ranking, so a
+    filtered search still returns top_k hits when that many match.
 
-    def __init__(self, project_dir: Path):
+    Use get_embedding_store() to share one instance, and its connection,
+    per project directory.
+    """
+
+    def __init__(
+        self,
+        project_dir: Path,
+        encoding: str = "float32",
+        ann_threshold: int = ANN_THRESHOLD,
+        nprobe: int = DEFAULT_NPROBE,
+    ):
+        if encoding not in ENCODINGS:
+            raise ValueError(
+                f"Unknown embedding encoding {encoding!r}; expected one of {', '.join(ENCODINGS)}"
+            )
         self.db_path = project_dir / "embeddings.db"
+        self.encoding = encoding
+        self.ann_threshold = ann_threshold
+        self.nprobe = nprobe
         self._model = None
+        self._lock = threading.Lock()
+        # Held for a whole index_items call; taken before self._lock.
+        self._write_lock = threading.Lock()
+        self._matrix: Optional[np.ndarray] = None
+        self._scales: Optional[np.ndarray] = None
+        self._ids: list[str] = []
+        self._titles: list[str] = []
+        self._attrs = _RowAttrs([], [], [])
+        # Item ID -> row of the loaded matrix, and each row's IVF cluster
+        # while the IVF index is in use.
+        self._rows: dict[str, int] = {}
+        self._clusters: Optional[np.ndarray] = None
+        self._loaded_fingerprint: Optional[tuple[int, int, int]] = None
+        self._centroids: Optional[np.ndarray] = None
+        self._ivf: Optional[ann.InvertedLists] = None
         self._init_db()
 
     def _init_db(self):
-        conn = sqlite3.connect(str(self.db_path))
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        conn = self._conn
         conn.execute("""
             CREATE TABLE IF NOT EXISTS embeddings (
                 id TEXT PRIMARY KEY,
                 title TEXT,
                 type TEXT,
                 vector BLOB,
-                content_hash TEXT
+                content_hash TEXT,
+                encoding TEXT NOT NULL DEFAULT 'float32',
+                cluster INTEGER,
+                status TEXT,
+                tags TEXT,
+                epic_id TEXT,
+                story_id TEXT
+            )
+        """)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS ivf_centroids (
+                list INTEGER PRIMARY KEY,
+                centroid BLOB
             )
         """)
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < SCHEMA_VERSION:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(embeddings)")}
+            if "encoding" not in columns:
+                conn.execute(
+                    "ALTER TABLE embeddings ADD COLUMN encoding TEXT NOT NULL DEFAULT 'float32'"
+                )
+            if "cluster" not in columns:
+                conn.execute("ALTER TABLE embeddings ADD COLUMN cluster INTEGER")
+            for column in _ATTR_COLUMNS:
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE embeddings ADD COLUMN {column} TEXT")
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self._convert_rows()
         conn.commit()
-        conn.close()
+        self._centroids = self._read_centroids()
+
+    def _read_centroids(self) -> Optional[np.ndarray]:
+        blobs = [row[0] for row in self._conn.execute(
+            "SELECT centroid FROM ivf_centroids ORDER BY list"
+        )]
+        if not blobs or len({len(blob) for blob in blobs}) != 1:
+            return None
+        return np.frombuffer(b"".join(blobs), dtype=np.float32).reshape(len(blobs), -1)
+
+    def _cluster_of(self, vectors) -> list[Optional[int]]:
+        """Return the IVF cluster for each vector, or None before training."""
+        centroids = self._centroids
+        matrix = np.asarray(list(vectors), dtype=np.float32)
+        if centroids is None or matrix.ndim != 2 or matrix.shape[1] != centroids.shape[1]:
+            return [None] * len(matrix)
+        return ann.nearest_centroids(matrix, centroids).tolist()
+
+    def _convert_rows(self) -> None:
+        """Re-encode rows stored in a format other than self.encoding."""
+        rows = self._conn.execute(
+            "SELECT id, vector, encoding FROM embeddings"
+            " WHERE encoding != ? AND vector IS NOT NULL",
+            (self.encoding,),
+        ).fetchall()
+        converted = []
+        for item_id, blob, encoding in rows:
+            try:
+                vector = decode_vector(blob, encoding)
+            except (TypeError, ValueError):
+                continue  # unknown format or damaged blob; dropped at load
+            converted.append((encode_vector(vector, self.encoding), self.encoding, item_id))
+        if converted:
+            self._conn.executemany(
+                "UPDATE embeddings SET vector = ?, encoding = ? WHERE id = ?", converted
+            )
+            logger.info(
+                "embedding: converted %d vector(s) in %s to %s",
+                len(converted), self.db_path, self.encoding,
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
 
     @property
     def model(self):
         if self._model is None:
-            from fastembed import TextEmbedding
-            self._model = TextEmbedding("sentence-transformers/all-MiniLM-L6-v2")
+            self._model = get_model()
         return self._model
 
     def _content_hash(self, text: str) -> str:
         return hashlib.sha256(text.encode()).hexdigest()[:16]
 
     def _encode_vector(self, vector) -> bytes:
-        return struct.pack(f"{len(vector)}f", *vector)
+        return encode_vector(vector, self.encoding)
 
     def _decode_vector(self, blob: bytes) -> list[float]:
-        n = len(blob) // 4
-        return list(struct.unpack(f"{n}f", blob))
+        return decode_vector(blob, self.encoding).tolist()
 
-    def index_item(self, item_id: str, title: str, item_type: str, content: str):
-        """Index a single item. Skips if content_hash unchanged."""
-        text = f"{title} {content}"
-        content_hash = self._content_hash(text)
+    def index_item(
+        self,
+        item_id: str,
+        title: str,
+        item_type: str,
+        content: str,
+        attrs: Optional[dict] = None,
+    ):
+        """Index a single item. Skips embedding if content_hash unchanged."""
+        self.index_items([(item_id, title, item_type, content, attrs)])
 
-        conn = sqlite3.connect(str(self.db_path))
-        existing = conn.execute(
-            "SELECT content_hash FROM embeddings WHERE id = ?", (item_id,)
-        ).fetchone()
+    def index_items(
+        self,
+        items: Iterable[tuple],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> int:
+        """Index many (item_id, title, item_type, content[, attrs]) items at once.
 
-        if existing and existing[0] == content_hash:
-            conn.close()
-            return  # No change
+        Stored content hashes are fetched in one query and only new or
+        changed items are embedded, batch_size texts per model call; items
+        whose text is unchanged but whose attrs differ only have their
+        attributes rewritten.  All rows are written in a single
+        transaction.  progress, if given, is called with (embedded so far,
+        total to embed) after each batch.  Returns the number of items
+        embedded.
 
-        vector = next(self.model.embed([text]))
-        blob = self._encode_vector(vector)
+        Calls are serialized: rows stay uncommitted on the shared
+        connection across model calls, and a failed call rolls it back.
+        """
+        with self._write_lock:
+            with self._lock:
+                stored = {
+                    row[0]: (row[1], row[2:])
+                    for row in self._conn.execute(
+                        "SELECT id, content_hash, status, tags, epic_id, story_id FROM embeddings"
+                    )
+                }
 
-        conn.execute(
-            "INSERT OR REPLACE INTO embeddings (id, title, type, vector, content_hash) VALUES (?, ?, ?, ?, ?)",
-            (item_id, title, item_type, blob, content_hash),
-        )
-        conn.commit()
-        conn.close()
+            pending: dict[str, tuple[str, str, str, str, tuple]] = {}
+            retagged: dict[str, tuple] = {}
+            for item in items:
+                item_id, title, item_type, content = item[:4]
+                attrs = item[4] if len(item) > 4 else None
+                text = f"{title} {content}"
+                content_hash = self._content_hash(text)
+                stored_hash, stored_attrs = stored.get(item_id, (None, None))
+                attr_row = _attr_row(attrs)
+                if stored_hash != content_hash:
+                    if attrs is None and stored_attrs is not None:
+                        attr_row = stored_attrs
+                    pending[item_id] = (title, item_type, text, content_hash, attr_row)
+                elif attrs is not None and attr_row != stored_attrs:
+                    retagged[item_id] = attr_row
+            todo = list(pending.items())
+            if retagged:
+                with self._lock:
+                    self._conn.executemany(
+                        "UPDATE embeddings SET status = ?, tags = ?, epic_id = ?, story_id = ?"
+                        " WHERE id = ?",
+                        [(*attr_row, item_id) for item_id, attr_row in retagged.items()],
+                    )
+                    if not todo:
+                        current = self._db_fingerprint() == self._loaded_fingerprint
+                        self._conn.commit()
+                        if current:
+                            self._retag_matrix(retagged)
+                        else:
+                            self._matrix = None
+            if not todo:
+                if progress is not None:
+                    progress(0, 0)
+                return 0
 
-    def reindex_all(self, store):
-        """Reindex all stories and tasks from the store."""
+            batch_size = max(1, batch_size)
+            done = 0
+            written = []
+            try:
+                for start in range(0, len(todo), batch_size):
+                    batch = todo[start:start + batch_size]
+                    vectors = list(self.model.embed(
+                        [text for _, (_, _, text, _, _) in batch], batch_size=batch_size
+                    ))
+                    rows = [
+                        (item_id, title, item_type, self._encode_vector(vector), content_hash,
+                         self.encoding, cluster, *attr_row)
+                        for (item_id, (title, item_type, _, content_hash, attr_row)), vector, cluster
+                        in zip(batch, vectors, self._cluster_of(vectors))
+                    ]
+                    with self._lock:
+                        self._conn.executemany(
+                            "INSERT OR REPLACE INTO embeddings"
+                            " (id, title, type, vector, content_hash, encoding, cluster,"
+                            " status, tags, epic_id, story_id)"
+                            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                            rows,
+                        )
+                    written += rows
+                    done += len(batch)
+                    if progress is not None:
+                        progress(done, len(todo))
+            except BaseException:
+                with self._lock:
+                    self._conn.rollback()
+                raise
+            with self._lock:
+                current = self._db_fingerprint() == self._loaded_fingerprint
+                self._conn.commit()
+                if current:
+                    self._patch_matrix(written)
+                    self._retag_matrix(retagged)
+                else:
+                    self._matrix = None
+            return done
+
+    def reindex_all(
+        self,
+        store,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> int:
+        """Reindex all stories and tasks from the store.
+
+        Returns the number of items whose embedding was (re)computed; see
+        index_items for batch_size and progress.
+        """
+        items = []
         for story in store.list_stories():
             _, body = store.get_story(story.id)
             content = self._build_content(body, story.tags)
-            self.index_item(story.id, story.title, "story", content)
+            items.append((story.id, story.title, "story", content, item_attrs(story)))
 
         for task in store.list_tasks():
             meta, body = store.get_task(task.id)
             content = self._build_content(body, meta.tags)
-            self.index_item(task.id, task.title, "task", content)
+            items.append((task.id, task.title, "task", content, item_attrs(meta)))
+
+        return self.index_items(items, batch_size=batch_size, progress=progress)
 
     @staticmethod
     def _build_content(body: str, tags: list[str]) -> str:
@@ -100,22 +602,457 @@ class EmbeddingStore:
             return f"{body} tags: {' '.join(tags)}"
         return body
 
-    def search(self, query: str, top_k: int = 10) -> list[EmbeddingResult]:
-        """Search by semantic similarity using cosine distance (normalized dot product)."""
-        query_vec = next(self.model.embed([query]))
-
-        conn = sqlite3.connect(str(self.db_path))
-        rows = conn.execute("SELECT id, title, type, vector FROM embeddings").fetchall()
-        conn.close()
-
-        results = []
-        for row_id, title, item_type, blob in rows:
-            stored_vec = self._decode_vector(blob)
-            # Cosine similarity via dot product (vectors are normalized)
-            score = np.dot(query_vec, stored_vec)
-            results.append(EmbeddingResult(
-                id=row_id, title=title, type=item_type, score=float(score)
+    def _db_fingerprint(self) -> Optional[tuple[int, int, int]]:
+        try:
+            st = self.db_path.stat()
+        except OSError:
+            return None
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def _patch_matrix(self, rows: list[tuple]) -> None:
+        """Apply embedding rows this store just committed to the loaded matrix.
+
+        rows are as written by index_items.  Rows of known items are
+        overwritten in place and new ones appended (into new arrays, so a
+        search holding the old ones is not affected), and the IVF lists are
+        regrouped from the updated clusters.  Anything else (no matrix
+        yet, another vector width, crossing ann_threshold, centroids due
+        for retraining, rows without a cluster) drops the matrix for a
+        full reload.  Call with self._lock held, right after the commit,
+        and only if the database was unchanged since the matrix was loaded.
+        """
+        matrix = self._matrix
+        if matrix is None or not rows:
+            return
+        dim = _row_dim(self.encoding, len(rows[0][3]))
+        row_dtype = _row_dtype(self.encoding, max(dim, 0))
+        n = len(matrix) + sum(1 for row in rows if row[0] not in self._rows)
+        ivf = n >= self.ann_threshold
+        if (
+            not len(matrix)
+            or dim != matrix.shape[1]
+            or any(len(row[3]) != row_dtype.itemsize for row in rows)
+            or ivf != (self._ivf is not None)
+            or (ivf and (
+                ann.needs_training(self._centroids, n, dim)
+                or any(row[6] is None for row in rows)
             ))
+        ):
+            self._matrix = None
+            return
+
+        records = np.frombuffer(b"".join(row[3] for row in rows), dtype=row_dtype)
+        old = [i for i, row in enumerate(rows) if row[0] in self._rows]
+        new = [i for i, row in enumerate(rows) if row[0] not in self._rows]
+        clusters = self._clusters
+        if old:
+            at = [self._rows[rows[i][0]] for i in old]
+            matrix[at] = records["v"][old]
+            if self._scales is not None:
+                self._scales[at] = records["scale"][old]
+            for row, i in zip(at, old):
+                self._titles[row] = rows[i][1]
+            self._attrs.update(
+                at, [rows[i][2] for i in old], [tuple(rows[i][7:]) for i in old]
+            )
+            if ivf:
+                clusters = clusters.copy()
+                clusters[at] = [rows[i][6] for i in old]
+        if new:
+            for i in new:
+                self._rows[rows[i][0]] = len(self._rows)
+            self._matrix = np.concatenate([matrix, records["v"][new]])
+            if self._scales is not None:
+                self._scales = np.concatenate([self._scales, records["scale"][new]])
+            self._ids = self._ids + [rows[i][0] for i in new]
+            self._titles = self._titles + [rows[i][1] for i in new]
+            self._attrs = self._attrs.extended(
+                [rows[i][0] for i in new],
+                [rows[i][2] for i in new],
+                [tuple(rows[i][7:]) for i in new],
+            )
+            if ivf:
+                clusters = np.concatenate(
+                    [clusters, np.array([rows[i][6] for i in new], dtype=np.int64)]
+                )
+        if ivf:
+            self._clusters = clusters
+            self._ivf = ann.InvertedLists(self._centroids, clusters)
+        # Our own write should not trigger a reload.
+        self._loaded_fingerprint = self._db_fingerprint()
+
+    def _retag_matrix(self, retagged: dict[str, tuple]) -> None:
+        """Apply attribute rows this store just committed to the loaded matrix.
+
+        Only the filter attributes change, so the vectors and IVF lists
+        stay as they are.  Same calling rules as _patch_matrix.
+        """
+        if self._matrix is None or not retagged:
+            return
+        known = [item_id for item_id in retagged if item_id in self._rows]
+        if known:
+            at = [self._rows[item_id] for item_id in known]
+            self._attrs.update(
+                at, list(self._attrs.types[at]), [retagged[item_id] for item_id in known]
+            )
+        self._loaded_fingerprint = self._db_fingerprint()
+
+    def _load_matrix(
+        self,
+    ) -> tuple[
+        np.ndarray, Optional[np.ndarray], Optional[ann.InvertedLists], list[str], list[str],
+        _RowAttrs,
+    ]:
+        """Return (matrix, scales, ivf, ids, titles, attrs), reloading them if the db changed.
+
+        The matrix is (n, dim) in self.encoding's dtype; row i belongs to
+        ids[i].  scales holds the per-row int8 scale factors and is None
+        for the float encodings.  ivf is None below ann_threshold rows.
+        """
+        with self._lock:
+            fingerprint = self._db_fingerprint()
+            if self._matrix is None or fingerprint != self._loaded_fingerprint:
+                self._reload_matrix(fingerprint)
+            return (
+                self._matrix, self._scales, self._ivf, self._ids, self._titles, self._attrs
+            )
+
+    def _reload_matrix(self, fingerprint: Optional[tuple[int, int, int]]) -> None:
+        rows = []
+        for item_id, title, item_type, blob, encoding, cluster, *attr_row in self._conn.execute(
+            "SELECT id, title, type, vector, encoding, cluster,"
+            " status, tags, epic_id, story_id FROM embeddings WHERE vector IS NOT NULL"
+        ):
+            if encoding != self.encoding:
+                # Written by a process using another format since we opened.
+                try:
+                    blob = encode_vector(decode_vector(blob, encoding), self.encoding)
+                except (TypeError, ValueError):
+                    continue
+            rows.append((item_id, title, item_type, blob, cluster, tuple(attr_row)))
+
+        # All vectors come from one model; drop any row with a stray width.
+        dim = max((_row_dim(self.encoding, len(row[3])) for row in rows), default=0)
+        row_dtype = _row_dtype(self.encoding, max(dim, 0))
+        rows = [row for row in rows if dim > 0 and len(row[3]) == row_dtype.itemsize]
+        self._ids = [row[0] for row in rows]
+        self._titles = [row[1] for row in rows]
+        self._rows = {item_id: i for i, item_id in enumerate(self._ids)}
+        self._attrs = _RowAttrs(self._ids, [row[2] for row in rows], [row[5] for row in rows])
+        if rows:
+            records = np.frombuffer(b"".join(row[3] for row in rows), dtype=row_dtype)
+            # Copies, so rows can be rewritten in place after our own writes.
+            self._matrix = np.array(records["v"])
+            self._scales = np.array(records["scale"]) if self.encoding == "int8" else None
+        else:
+            self._matrix = np.empty((0, 0), dtype=self.encoding)
+            self._scales = None
+        self._loaded_fingerprint = fingerprint
+
+        self._centroids = self._read_centroids()
+        self._ivf = None
+        self._clusters = None
+        if rows and len(rows) >= self.ann_threshold:
+            clusters = np.array(
+                [-1 if row[4] is None else row[4] for row in rows], dtype=np.int64
+            )
+            self._ivf = self._build_ivf(clusters)
+
+    def _build_ivf(self, clusters: np.ndarray) -> ann.InvertedLists:
+        """Group the loaded rows by cluster, training or filling in clusters first.
+
+        Centroids are (re)trained when missing or outgrown; otherwise only
+        rows without a valid cluster are assigned.  Either way the changes
+        are written back so other processes and later loads reuse them.
+        """
+        matrix, n = self._matrix, len(self._matrix)
+        centroids = self._centroids
+        if ann.needs_training(centroids, n, matrix.shape[1]):
+            started = time.monotonic()
+            centroids = ann.train_centroids(matrix, ann.list_count(n))
+            changed = np.arange(n)
+            clusters = ann.nearest_centroids(matrix, centroids)
+            self._conn.execute("DELETE FROM ivf_centroids")
+            self._conn.executemany(
+                "INSERT INTO ivf_centroids (list, centroid) VALUES (?, ?)",
+                [(i, centroid.tobytes()) for i, centroid in enumerate(centroids)],
+            )
+            logger.info(
+                "embedding: trained %d IVF centroids over %d vectors in %.1fs",
+                len(centroids), n, time.monotonic() - started,
+            )
+        else:
+            changed = np.flatnonzero((clusters < 0) | (clusters >= len(centroids)))
+            if len(changed):
+                clusters[changed] = ann.nearest_centroids(matrix[changed], centroids)
+
+        if len(changed):
+            self._conn.executemany(
+                "UPDATE embeddings SET cluster = ? WHERE id = ?",
+                [(int(clusters[i]), self._ids[i]) for i in changed],
+            )
+            self._conn.commit()
+            # Our own write should not trigger another reload.
+            self._loaded_fingerprint = self._db_fingerprint()
+        self._centroids = centroids
+        self._clusters = clusters
+        return ann.InvertedLists(centroids, clusters)
+
+    @staticmethod
+    def _score(
+        matrix: np.ndarray, scales: Optional[np.ndarray], query_vec: np.ndarray
+    ) -> np.ndarray:
+        """Return matrix @ query_vec as float32, undoing any quantization."""
+        if matrix.dtype == np.float32:
+            return matrix @ query_vec
+        scores = np.empty(len(matrix), dtype=np.float32)
+        for start in range(0, len(matrix), _SCORE_CHUNK_ROWS):
+            chunk = matrix[start:start + _SCORE_CHUNK_ROWS]
+            scores[start:start + len(chunk)] = chunk.astype(np.float32) @ query_vec
+        if scales is not None:
+            scores *= scales
+        return scores
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 10,
+        item_type: Optional[str] = None,
+        status: Optional[str] = None,
+        tag: Optional[str] = None,
+        epic_id: Optional[str] = None,
+    ) -> list[EmbeddingResult]:
+        """Search by semantic similarity using cosine distance (normalized dot product).
+
+        item_type, status, tag and epic_id restrict the rows ranked; an
+        epic matches its stories and their tasks.
+        """
+        return self.search_vector(
+            next(self.model.embed([query])), top_k,
+            item_type=item_type, status=status, tag=tag, epic_id=epic_id,
+        )
+
+    def search_vector(
+        self,
+        query_vec,
+        top_k: int = 10,
+        item_type: Optional[str] = None,
+        status: Optional[str] = None,
+        tag: Optional[str] = None,
+        epic_id: Optional[str] = None,
+    ) -> list[EmbeddingResult]:
+        """Search with an already-embedded query, e.g. one shared across stores."""
+        query_vec = np.asarray(query_vec, dtype=np.float32)
+        matrix, scales, ivf, ids, titles, attrs = self._load_matrix()
+        mask = attrs.mask(item_type=item_type, status=status, tag=tag, epic_id=epic_id)
+        allowed = np.flatnonzero(mask) if mask is not None else None
+        n = len(matrix) if allowed is None else len(allowed)
+        if n == 0 or top_k <= 0:
+            return []
+        k = min(top_k, n)
+
+        # Probe the IVF lists when there are any, but fall back to every
+        # allowed row if the probed clusters hold fewer than k of them.
+        rows = ivf.candidates(query_vec, self.nprobe) if ivf is not None else None
+        if rows is not None and mask is not None:
+            rows = rows[mask[rows]]
+        if rows is None or len(rows) < k:
+            rows = allowed
+        if rows is not None:
+            matrix = matrix[rows]
+            scales = scales[rows] if scales is not None else None
+
+        # Cosine similarity via dot product (vectors are normalized)
+        scores = self._score(matrix, scales, query_vec)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [
+            EmbeddingResult(
+                id=ids[row],
+                title=titles[row],
+                type=attrs.types[row],
+                score=float(scores[i]),
+            )
+            for i, row in zip(top, rows[top] if rows is not None else top)
+        ]
+
+
+_stores: dict[str, EmbeddingStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_embedding_store(project_dir: Path) -> EmbeddingStore:
+    """Return the process-wide EmbeddingStore for project_dir.
+
+    Vectors are stored in the format named by PROJECTMAN_EMBEDDING_ENCODING
+    (float32 by default).  A new store is opened if the database file has
+    been removed since.
+    """
+    key = str(project_dir)
+    with _stores_lock:
+        emb_store = _stores.get(key)
+        if emb_store is None or not emb_store.db_path.exists():
+            if emb_store is not None:
+                emb_store.close()
+            emb_store = _stores[key] = EmbeddingStore(project_dir, encoding=_default_encoding)
+        return emb_store
+
+
+class EmbeddingWorker:
+    """Background thread that embeds items queued by Store mutations.
+
+    submit() records the latest (title, type, content, attrs) per project and item
+    id; re-submitting an item that is still queued replaces its content
+    instead of queueing it twice.  The worker takes up to batch_size items
+    at a time and indexes them with EmbeddingStore.index_items, so a burst
+    of writes costs one model call.  The queue holds at most max_pending
+    items; submit() blocks when it is full.
+    """
+
+    def __init__(self, max_pending: int = 1024, batch_size: int = DEFAULT_BATCH_SIZE) -> None:
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        # (project dir, item id) -> (title, item type, content, attrs, first enqueue time)
+        self._pending: OrderedDict[
+            tuple[str, str], tuple[str, str, str, Optional[dict], float]
+        ] = OrderedDict()
+        self._in_flight = 0
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._counts = {"submitted": 0, "coalesced": 0, "indexed": 0, "failed": 0}
+        self._last_lag = 0.0
+        self._thread = threading.Thread(
+            target=self._run, name="projectman-embedding-worker", daemon=True
+        )
+        self._thread.start()
+
+    def submit(
+        self,
+        project_dir: Path,
+        item_id: str,
+        title: str,
+        item_type: str,
+        content: str,
+        attrs: Optional[dict] = None,
+    ) -> None:
+        """Queue an item for (re)embedding; attrs as returned by item_attrs()."""
+        key = (str(project_dir), item_id)
+        with self._cond:
+            self._counts["submitted"] += 1
+            queued = self._pending.get(key)
+            if queued is not None:
+                self._counts["coalesced"] += 1
+                self._pending[key] = (title, item_type, content, attrs, queued[4])
+                return
+            while len(self._pending) >= self.max_pending and not self._stopping:
+                self._cond.wait()
+            self._pending[key] = (title, item_type, content, attrs, time.monotonic())
+            self._cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued item has been processed.
+
+        Returns False if timeout (seconds) expired first.
+        """
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not self._pending and not self._in_flight, timeout
+            )
+
+    def stats(self) -> dict:
+        """Return queue depth, lag and counters.
+
+        ``oldest_pending_seconds`` is how long the oldest queued item has
+        waited; ``last_batch_lag_seconds`` is the enqueue-to-indexed time of
+        the oldest item in the last completed batch.
+        """
+        with self._cond:
+            now = time.monotonic()
+            oldest = min((entry[4] for entry in self._pending.values()), default=now)
+            return {
+                "queue_depth": len(self._pending),
+                "in_flight": self._in_flight,
+                **self._counts,
+                "oldest_pending_seconds": round(now - oldest, 3),
+                "last_batch_lag_seconds": round(self._last_lag, 3),
+            }
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Process what is queued, then stop the thread."""
+        self.flush(timeout)
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def _take_batch(
+        self,
+    ) -> list[tuple[tuple[str, str], tuple[str, str, str, Optional[dict], float]]]:
+        batch = []
+        while self._pending and len(batch) < self.batch_size:
+            batch.append(self._pending.popitem(last=False))
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._stopping)
+                if self._stopping and not self._pending:
+                    return
+                batch = self._take_batch()
+                self._in_flight = len(batch)
+                self._cond.notify_all()
+
+            indexed = failed = 0
+            by_project: dict[str, list[tuple]] = {}
+            for (project_dir, item_id), (title, item_type, content, attrs, _) in batch:
+                by_project.setdefault(project_dir, []).append(
+                    (item_id, title, item_type, content, attrs)
+                )
+            for project_dir, items in by_project.items():
+                try:
+                    get_model()
+                    get_embedding_store(Path(project_dir)).index_items(
+                        items, batch_size=self.batch_size
+                    )
+                    indexed += len(items)
+                except ImportError:
+                    # fastembed not installed: embeddings are simply unavailable.
+                    failed += len(items)
+                except Exception:
+                    logger.warning(
+                        "embedding: failed to index %d item(s) in %s",
+                        len(items), project_dir, exc_info=True,
+                    )
+                    failed += len(items)
+
+            with self._cond:
+                self._counts["indexed"] += indexed
+                self._counts["failed"] += failed
+                self._last_lag = time.monotonic() - min(entry[4] for _, entry in batch)
+                self._in_flight = 0
+                self._cond.notify_all()
+
+
+_worker: Optional[EmbeddingWorker] = None
+_worker_lock = threading.Lock()
+
+
+def get_embedding_worker() -> EmbeddingWorker:
+    """Return the process-wide EmbeddingWorker, starting it on first use.
+
+    The worker is drained at interpreter exit so short-lived CLI commands
+    do not lose queued items.
+    """
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = EmbeddingWorker()
+            atexit.register(_worker.stop, 30)
+        return _worker
+
 
-        results.sort(key=lambda r: r.score, reverse=True)
-        return results[:top_k]
+def flush_embeddings(timeout: Optional[float] = None) -> bool:
+    """Wait for queued embedding work, if any. Returns False on timeout."""
+    worker = _worker
+    return worker.flush(timeout) if worker is not None else True
@@ -0,0 +1,75 @@
+"""Fast frontmatter reading and writing for item markdown files.
+
+Drop-in replacements for the parts of python-frontmatter the Store uses on
+hot paths.  ``read_meta`` parses only the YAML header and stops reading at
+the closing ``---``, so list calls never touch item bodies.  ``dump_post``
+produces the same text as ``frontmatter.dumps`` without building a Post.
+Both use libyaml's C loader/dumper when PyYAML was built with it.
+"""
+
+import re
+from pathlib import Path
+from typing import Any, Union
+
+import yaml
+
+try:
+    from yaml import CSafeDumper as _Dumper
+    from yaml import CSafeLoader as _Loader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper as _Dumper  # type: ignore[assignment]
+    from yaml import SafeLoader as _Loader  # type: ignore[assignment]
+
+# Same delimiter rule as python-frontmatter's YAMLHandler.
+_BOUNDARY = re.compile(r"^-{3,}\s*$", re.MULTILINE)
+
+
+def _load_yaml(text: str) -> dict[str, Any]:
+    data = yaml.load(text, Loader=_Loader)
+    return data if isinstance(data, dict) else {}
+
+
+def read_post(path: Union[str, Path]) -> tuple[dict[str, Any], str]:
+    """Read a whole file, returning (metadata, content) like frontmatter.load."""
+    with open(path, encoding="utf-8") as f:
+        return parse_post(f.read())
+
+
+def parse_post(text: str) -> tuple[dict[str, Any], str]:
+    """Parse file text, returning (metadata, content) like frontmatter.loads."""
+    text = text.strip()
+    if not _BOUNDARY.match(text):
+        return {}, text
+    try:
+        _, header, content = _BOUNDARY.split(text, 2)
+    except ValueError:
+        return {}, text
+    return _load_yaml(header), content.strip()
+
+
+def read_meta(path: Union[str, Path]) -> dict[str, Any]:
+    """Read only the frontmatter of a file, stopping at the closing delimiter.
+
+    Files that do not open with a delimiter line are handed to read_post so
+    that unusual layouts parse exactly as frontmatter.load would.
+    """
+    with open(path, encoding="utf-8") as f:
+        if not _BOUNDARY.match(f.readline()):
+            return read_post(path)[0]
+        lines = []
+        for line in f:
+            if _BOUNDARY.match(line):
+                break
+            lines.append(line)
+        else:
+            # No closing delimiter: frontmatter treats the file as all content.
+            return {}
+    return _load_yaml("".join(lines))
+
+
+def dump_post(metadata: dict[str, Any], content: str) -> str:
+    """Serialize metadata and content to the text frontmatter.dumps would produce."""
+    header = yaml.dump(
+        metadata, Dumper=_Dumper, default_flow_style=False, allow_unicode=True
+    ).strip()
+    return f"---\n{header}\n---\n\n{content}\n".strip()
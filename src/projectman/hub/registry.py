@@ -412,9 +412,10 @@ def repair(root: Optional[Path] = None) -> str:
     # 4. Rebuild hub embeddings from all subprojects
     embedded_count = 0
     try:
-        from ..embeddings import EmbeddingStore
+        from ..embeddings import get_embedding_store
 
-        emb_store = EmbeddingStore(hub_proj_dir)
+        emb_store = get_embedding_store(hub_proj_dir)
+        hub_items: list[tuple[str, str, str, str]] = []
 
         for name in config.projects:
             pm_dir = root / ".project" / "projects" / name
@@ -424,21 +425,30 @@ def repair(root: Optional[Path] = None) -> str:
             try:
                 store = Store(root, project_dir=pm_dir)
 
+                # Namespace IDs so they're unique across projects
                 for story in store.list_stories():
                     _, body = store.get_story(story.id)
-                    # Namespace IDs so they're unique across projects
-                    hub_id = f"{name}/{story.id}"
-                    emb_store.index_item(hub_id, f"[{name}] {story.title}", "story", body)
-                    embedded_count += 1
+                    hub_items.append(
+                        (f"{name}/{story.id}", f"[{name}] {story.title}", "story", body)
+                    )
 
                 for task in store.list_tasks():
                     _, body = store.get_task(task.id)
-                    hub_id = f"{name}/{task.id}"
-                    emb_store.index_item(hub_id, f"[{name}] {task.title}", "task", body)
-                    embedded_count += 1
+                    hub_items.append(
+                        (f"{name}/{task.id}", f"[{name}] {task.title}", "task", body)
+                    )
             except Exception as e:
                 report_lines.append(f"- **{name}** — embedding error: {e}")
 
+        if hub_items:
+            try:
+                emb_store.index_items(hub_items)
+                embedded_count = len(hub_items)
+            except ImportError:
+                raise
+            except Exception as e:
+                report_lines.append(f"- embedding error: {e}")
+
         if embedded_count > 0:
             report_lines.append(f"## Rebuilt hub embeddings\n")
             report_lines.append(f"- Indexed {embedded_count} items across all projects")
@@ -0,0 +1,165 @@
+"""Hybrid keyword + semantic search fused by reciprocal rank fusion (RRF).
+
+The keyword index (search.py) is good at identifiers and exact words; the
+embedding store is good at paraphrase.  hybrid_search runs both against
+one project at once and merges their rankings: an item scores
+sum(1 / (RRF_K + rank)) over the rankings it appears in, so items both
+retrievers agree on rise to the top without comparing BM25 and cosine
+scores directly.
+
+A query that is an item ID short-circuits to that item.  The keyword
+index is built before the first query of a process; after that it
+refreshes in the background, and the keyword side runs on a thread
+alongside the vector search.  By default both sides are always merged,
+so a query's results do not depend on machine load.  Latency-sensitive
+callers can pass a budget (e.g. LATENCY_BUDGET): for prose queries, if
+the keyword side has not finished that many seconds after the query
+started (e.g. a very common prefix matched) the semantic ranking is
+returned alone.  Identifier-like queries (grab_reclaim, v1.2,
+src/store.py) always wait for it, since the keyword side is the one that
+can find them.
+"""
+
+import logging
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+from .search import get_search_index
+
+logger = logging.getLogger(__name__)
+
+# RRF damping constant; 60 is the value from the original RRF paper.
+RRF_K = 60
+
+# Items taken from each retriever before fusion.
+CANDIDATES = 50
+
+# Suggested hybrid_search budget for callers that would rather drop a slow
+# keyword side than wait for it: seconds after which a prose query returns
+# the semantic results alone.
+LATENCY_BUDGET = 0.018
+
+# EPIC-XXX-1, US-XXX-1 and US-XXX-1-2.
+_ITEM_ID = re.compile(r"^(?:EPIC|US)-[A-Z0-9]+-\d+(?:-\d+)?$", re.IGNORECASE)
+
+# Marks of a code identifier, version, path or error code rather than prose:
+# joined words (snake_case, dotted, paths, kebab-case), digits, camelCase.
+_IDENTIFIER = re.compile(r"\w[_./:-]\w|\d|[a-z][A-Z]")
+
+_pool = ThreadPoolExecutor(thread_name_prefix="projectman-search")
+
+
+@dataclass
+class HybridResult:
+    id: str
+    title: str
+    type: str
+    score: float
+    snippet: str = ""
+
+
+def rrf(rankings: list[list[str]], k: int = RRF_K) -> dict[str, float]:
+    """Fuse ranked id lists; return id -> RRF score in first-seen order."""
+    scores: dict[str, float] = {}
+    for ranking in rankings:
+        for rank, item_id in enumerate(ranking, start=1):
+            scores[item_id] = scores.get(item_id, 0.0) + 1.0 / (k + rank)
+    return scores
+
+
+def exact_match(
+    query: str,
+    project_dir: Path,
+    tag: Optional[str] = None,
+    item_type: Optional[str] = None,
+    status: Optional[str] = None,
+    epic_id: Optional[str] = None,
+) -> Optional[HybridResult]:
+    """Return the item whose ID is query, if it exists and passes the filters."""
+    if not _ITEM_ID.match(query.strip()):
+        return None
+    hit = get_search_index(project_dir).get(
+        query, tag=tag, item_type=item_type, status=status, epic_id=epic_id
+    )
+    if hit is None:
+        return None
+    return HybridResult(hit.id, hit.title, hit.type, 1.0, hit.snippet)
+
+
+def hybrid_search(
+    query: str,
+    project_dir: Path,
+    top_k: int = 10,
+    query_vec=None,
+    tag: Optional[str] = None,
+    item_type: Optional[str] = None,
+    status: Optional[str] = None,
+    epic_id: Optional[str] = None,
+    budget: Optional[float] = None,
+) -> list[HybridResult]:
+    """Rank one project's items for query by fusing keyword and vector search.
+
+    query_vec is the embedded query, or None to rank by keywords only (as
+    when embeddings are unavailable).  Filters apply inside both indexes.
+    An exact item ID returns just that item with score 1.0.  With a
+    budget, keyword results of prose queries that arrive after budget
+    seconds are left out; without one (the default) they are always
+    merged, as are those of identifier-like queries.
+    """
+    index = get_search_index(project_dir)
+    index.warm()  # the first scan of a process is not held to the budget
+    deadline = None if budget is None else time.monotonic() + budget
+    filters = {"tag": tag, "item_type": item_type, "status": status, "epic_id": epic_id}
+    hit = exact_match(query, project_dir, **filters)
+    if hit is not None:
+        return [hit]
+
+    cancel = threading.Event()
+    lexical = _pool.submit(
+        index.search,
+        query, top_k=CANDIDATES, background_refresh=True, cancel=cancel, **filters,
+    )
+    semantic = []
+    if query_vec is not None:
+        try:
+            from .embeddings import get_embedding_store
+
+            semantic = get_embedding_store(project_dir).search_vector(
+                query_vec, top_k=CANDIDATES, **filters
+            )
+        except Exception as e:
+            logger.debug("hybrid search: vector search failed: %s", e)
+
+    try:
+        if deadline is not None and semantic and not _IDENTIFIER.search(query):
+            timeout = max(0.0, deadline - time.monotonic())
+        else:
+            timeout = None
+        keyword = lexical.result(timeout=timeout)
+    except FutureTimeoutError:
+        cancel.set()  # stop the abandoned query instead of letting it queue up
+        logger.debug("hybrid search: keyword search over budget; using vectors only")
+        keyword = []
+    except Exception as e:
+        if not semantic:
+            raise
+        logger.debug("hybrid search: keyword search failed: %s", e)
+        keyword = []
+
+    items = {r.id: HybridResult(r.id, r.title, r.type, 0.0) for r in semantic}
+    for r in keyword:
+        items.setdefault(r.id, HybridResult(r.id, r.title, r.type, 0.0)).snippet = r.snippet
+    fused = rrf([[r.id for r in semantic], [r.id for r in keyword]])
+    ranked = sorted(fused.items(), key=lambda pair: -pair[1])[:top_k]
+    results = []
+    for item_id, score in ranked:
+        result = items[item_id]
+        result.score = round(score, 4)
+        results.append(result)
+    return results
@@ -1,5 +1,8 @@
 """Build and write the project index from stories and tasks."""
 
+import hashlib
+import logging
+import threading
 from collections import Counter
 from pathlib import Path
 from typing import Optional
@@ -9,6 +12,8 @@ import yaml
 from .models import IndexEntry, ProjectIndex
 from .store import Store
 
+logger = logging.getLogger(__name__)
+
 _STATUS_EMOJI = {
     "backlog": "\U0001f4cb",  # clipboard
     "draft": "\U0001f4dd",  # memo
@@ -23,6 +28,62 @@ _STATUS_EMOJI = {
 }
 
 
+class _IndexState:
+    """What write_index last produced for one project directory.
+
+    ``entries`` maps (type, id) to the entry dict and its rendered YAML so
+    unchanged rows of index.yaml are not re-serialized.  ``written`` maps
+    each output path to the digest of the text last written there and the
+    file's (inode, size, mtime_ns) afterwards; a file is rewritten only when
+    its text changes or it was modified behind our back.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.entries: dict[tuple[str, str], tuple[dict, str]] = {}
+        self.written: dict[str, tuple[bytes, Optional[tuple[int, int, int]]]] = {}
+
+
+_index_state: dict[str, _IndexState] = {}
+_index_state_lock = threading.Lock()
+
+
+def _state_for(store: Store) -> _IndexState:
+    key = str(store.project_dir)
+    with _index_state_lock:
+        state = _index_state.get(key)
+        if state is None:
+            state = _index_state[key] = _IndexState()
+        return state
+
+
+def _fingerprint(path: Path) -> Optional[tuple[int, int, int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+def _write_if_changed(state: _IndexState, path: Path, text: str) -> bool:
+    """Write text to path unless the file already holds it. Returns True if written."""
+    digest = hashlib.sha1(text.encode("utf-8")).digest()
+    key = str(path)
+    last = state.written.get(key)
+    if last is not None:
+        unchanged = last[0] == digest and last[1] == _fingerprint(path)
+    else:
+        # First look at this file in this process: compare with what is there.
+        try:
+            unchanged = path.read_text() == text
+        except (OSError, UnicodeDecodeError):
+            unchanged = False
+    if not unchanged:
+        path.write_text(text)
+    state.written[key] = (digest, _fingerprint(path))
+    return not unchanged
+
+
 def _status_label(status: str) -> str:
     emoji = _STATUS_EMOJI.get(status, "")
     return f"{emoji} {status}" if emoji else status
@@ -143,6 +204,7 @@ def write_markdown_indexes(
 
     project_name = store.config.name
     is_hub = store.config.hub
+    state = _state_for(store)
 
     # --- INDEX.md (or README.md at repo root for hubs) ---
     # For hubs the index lives at the repo root as README.md, so links
@@ -171,8 +233,8 @@ def write_markdown_indexes(
         index_content = "\n".join(lines)
 
     if is_hub:
-        (store.root / "README.md").write_text(index_content)
-    (store.project_dir / "INDEX.md").write_text(index_content)
+        _write_if_changed(state, store.root / "README.md", index_content)
+    _write_if_changed(state, store.project_dir / "INDEX.md", index_content)
 
     # --- INDEX-EPICS.md ---
     lines = ["# Epics", ""]
@@ -191,7 +253,7 @@ def write_markdown_indexes(
     else:
         lines.append("_No epics yet._")
     lines.append("")
-    (store.project_dir / "INDEX-EPICS.md").write_text("\n".join(lines))
+    _write_if_changed(state, store.project_dir / "INDEX-EPICS.md", "\n".join(lines))
 
     # --- INDEX-STORIES.md ---
     lines = ["# Stories", ""]
@@ -216,7 +278,7 @@ def write_markdown_indexes(
     else:
         lines.append("_No stories yet._")
     lines.append("")
-    (store.project_dir / "INDEX-STORIES.md").write_text("\n".join(lines))
+    _write_if_changed(state, store.project_dir / "INDEX-STORIES.md", "\n".join(lines))
 
     # --- INDEX-TASKS.md ---
     lines = ["# Tasks", ""]
@@ -241,7 +303,7 @@ def write_markdown_indexes(
     else:
         lines.append("_No tasks yet._")
     lines.append("")
-    (store.project_dir / "INDEX-TASKS.md").write_text("\n".join(lines))
+    _write_if_changed(state, store.project_dir / "INDEX-TASKS.md", "\n".join(lines))
 
 
 def _progress_bar(completed: int, total: int, width: int = 20) -> str:
@@ -346,23 +408,146 @@ def _build_hub_readme(
     return "\n".join(lines)
 
 
-def write_index(store: Store) -> None:
+def _dump_index(state: _IndexState, index: ProjectIndex) -> str:
+    """Serialize index as yaml.dump would, re-rendering only changed entries.
+
+    With block style and an unindented sequence, the document is
+    ``entries:`` followed by each entry dumped as a one-item list, then the
+    totals, so per-entry fragments can be cached and concatenated.
+    """
+    data = index.model_dump(mode="json")
+    entries = data.pop("entries")
+    if not entries:
+        return yaml.dump(
+            {"entries": entries, **data}, default_flow_style=False, sort_keys=False
+        )
+
+    parts = ["entries:\n"]
+    rendered: dict[tuple[str, str], tuple[dict, str]] = {}
+    for entry in entries:
+        key = (entry["type"], entry["id"])
+        cached = state.entries.get(key)
+        if cached is None or cached[0] != entry:
+            cached = (
+                entry,
+                yaml.dump([entry], default_flow_style=False, sort_keys=False),
+            )
+        rendered[key] = cached
+        parts.append(cached[1])
+    state.entries = rendered
+    parts.append(yaml.dump(data, default_flow_style=False, sort_keys=False))
+    return "".join(parts)
+
+
+def write_index(store: Store, *, immediate: bool = False) -> None:
     """Build index and write index.yaml and markdown indexes to disk.
 
-    Always reads directly from disk to guarantee index reflects current state,
-    bypassing the cache which may be stale due to external changes (e.g., git pull).
+    Items come from the Store cache, which re-stats every item file and
+    re-parses only those changed since the last look, so external edits
+    (e.g., git pull) are still picked up without reading the whole project.
+    Archived items are included.  Only index rows whose item changed are
+    re-rendered, and files whose content is unchanged are not rewritten.
+
+    While a background flusher is running (see start_index_flusher) the
+    project is only marked dirty and written on the flusher's next tick,
+    unless immediate is True.
+    """
+    flusher = _flusher
+    if flusher is not None and not immediate:
+        flusher.mark_dirty(store)
+        return
+    _write_index_now(store)
+
+
+def _write_index_now(store: Store) -> None:
+    state = _state_for(store)
+    # Cache lock before state.lock, the order of a write_index call made
+    # inside a transaction.  The flusher thus waits for open transactions
+    # rather than indexing items they have only staged.
+    with store.cache_lock, state.lock:
+        epics = store._index_items("epics")
+        stories = store._index_items("stories")
+        tasks = store._index_items("tasks")
+
+        index = build_index(store, epics=epics, stories=stories, tasks=tasks)
+        _write_if_changed(state, store.project_dir / "index.yaml", _dump_index(state, index))
+        write_markdown_indexes(store, epics=epics, stories=stories, tasks=tasks)
+
+
+class IndexFlusher:
+    """Coalesce write_index calls and write dirty projects from a background thread.
+
+    Each tick (every ``interval`` seconds) writes the index of every project
+    marked dirty since the last tick, so a burst of mutations costs one
+    index write.  A project whose write fails stays dirty for the next tick.
+    A tick that lands while a transaction is open waits for its flush.
     """
-    epic_entries = store._read_epics_from_disk()
-    story_entries = store._read_stories_from_disk()
-    task_entries = store._read_tasks_from_disk()
 
-    epics = [meta for meta, _ in epic_entries]
-    stories = [meta for meta, _ in story_entries]
-    tasks = [meta for meta, _ in task_entries]
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self._dirty: dict[str, Store] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def pending(self) -> int:
+        """Number of projects waiting for an index write."""
+        with self._lock:
+            return len(self._dirty)
+
+    def mark_dirty(self, store: Store) -> None:
+        with self._lock:
+            self._dirty[str(store.project_dir)] = store
+
+    def flush(self) -> None:
+        """Write the index of every dirty project now."""
+        with self._lock:
+            dirty, self._dirty = self._dirty, {}
+        for key, store in dirty.items():
+            try:
+                _write_index_now(store)
+            except Exception:
+                logger.exception("index flush failed for %s", key)
+                with self._lock:
+                    self._dirty.setdefault(key, store)
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name="projectman-index-flusher", daemon=True
+        )
+        self._thread.start()
 
-    index = build_index(store, epics=epics, stories=stories, tasks=tasks)
-    index_path = store.project_dir / "index.yaml"
-    data = index.model_dump(mode="json")
-    with open(index_path, "w") as f:
-        yaml.dump(data, f, default_flow_style=False, sort_keys=False)
-    write_markdown_indexes(store, epics=epics, stories=stories, tasks=tasks)
+    def stop(self) -> None:
+        """Stop the thread and write anything still dirty."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+
+_flusher: Optional[IndexFlusher] = None
+
+
+def start_index_flusher(interval: float) -> IndexFlusher:
+    """Defer write_index calls to a background flusher ticking every interval seconds."""
+    global _flusher
+    if interval <= 0:
+        raise ValueError("Index flush interval must be positive")
+    stop_index_flusher()
+    _flusher = IndexFlusher(interval)
+    _flusher.start()
+    return _flusher
+
+
+def stop_index_flusher() -> None:
+    """Stop the background flusher, if any, after a final flush."""
+    global _flusher
+    flusher, _flusher = _flusher, None
+    if flusher is not None:
+        flusher.stop()
@@ -0,0 +1,265 @@
+"""Task leases: which agent holds each claimed task, and until when.
+
+Every agent session runs its own ``projectman serve`` process, so claiming
+a task by reading it, checking readiness and writing the assignee let two
+agents take the same task.  A claim now also takes a lease: a row in
+``.project/.cache/leases.db`` written with a compare-and-swap upsert that
+only succeeds when the task has no lease, the lease is already the
+claimant's, or it has expired.  SQLite makes the swap atomic across
+processes without a lock held around the whole grab.
+
+A lease lasts LEASE_SECONDS (PROJECTMAN_LEASE_SECONDS) and is extended by
+heartbeats (pm_heartbeat).  Once it expires, another agent may take the
+task over, and reclaim_expired() puts tasks whose holder went quiet back
+to todo.  Moving a task out of in-progress, or to another assignee,
+releases its lease (see Store.update).
+
+Like the snapshot, the table is only a guard next to the markdown files:
+if it cannot be opened, claims go ahead unguarded and a warning is logged.
+"""
+
+import logging
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Seconds a claim stays leased without a heartbeat.
+LEASE_SECONDS = float(os.environ.get("PROJECTMAN_LEASE_SECONDS", "3600"))
+
+
+@dataclass
+class Lease:
+    task_id: str
+    assignee: str
+    # Expiry and last heartbeat, as time.time() values.
+    expires: float
+    heartbeat: float
+
+    def expired(self, now: Optional[float] = None) -> bool:
+        return self.expires <= (time.time() if now is None else now)
+
+    def to_dict(self) -> dict:
+        return {
+            "assignee": self.assignee,
+            "expires": datetime.fromtimestamp(self.expires, timezone.utc).isoformat(
+                timespec="seconds"
+            ),
+        }
+
+
+class LeaseTable:
+    """SQLite-backed leases for one project directory."""
+
+    def __init__(self, project_dir: Path):
+        self.cache_dir = project_dir / ".cache"
+        self.db_path = self.cache_dir / "leases.db"
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            self._init_db()
+        return sqlite3.connect(str(self.db_path), timeout=5, isolation_level=None)
+
+    def _init_db(self) -> None:
+        if not self.cache_dir.parent.is_dir():
+            raise FileNotFoundError(f"Project directory not found: {self.cache_dir.parent}")
+        self.cache_dir.mkdir(exist_ok=True)
+        gitignore = self.cache_dir / ".gitignore"
+        if not gitignore.exists():
+            gitignore.write_text("*\n")
+        conn = sqlite3.connect(str(self.db_path), timeout=5)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS leases (
+                    task_id TEXT PRIMARY KEY,
+                    assignee TEXT NOT NULL,
+                    expires REAL NOT NULL,
+                    heartbeat REAL NOT NULL
+                )
+            """)
+            conn.commit()
+        finally:
+            conn.close()
+        self._initialized = True
+
+    def _query(self, sql: str, params: tuple = ()) -> list[tuple]:
+        conn = self._connect()
+        try:
+            return conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+
+    def get(self, task_id: str) -> Optional[Lease]:
+        """Return the lease on task_id, expired or not, or None."""
+        if not self.db_path.exists():
+            return None
+        try:
+            rows = self._query(
+                "SELECT task_id, assignee, expires, heartbeat FROM leases WHERE task_id = ?",
+                (task_id,),
+            )
+        except (sqlite3.Error, OSError) as e:
+            logger.debug("lease lookup failed for %s: %s", task_id, e)
+            return None
+        return Lease(*rows[0]) if rows else None
+
+    def acquire(
+        self, task_id: str, assignee: str, seconds: Optional[float] = None
+    ) -> tuple[bool, Lease]:
+        """Lease task_id to assignee unless someone else holds a live lease.
+
+        Returns (acquired, lease): on success the new lease, otherwise the
+        lease that is in the way.  Re-acquiring one's own lease extends it.
+        """
+        now = time.time()
+        expires = now + (LEASE_SECONDS if seconds is None else seconds)
+        lease = Lease(task_id, assignee, expires, now)
+        try:
+            conn = self._connect()
+            try:
+                cursor = conn.execute(
+                    "INSERT INTO leases (task_id, assignee, expires, heartbeat) "
+                    "VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (task_id) DO UPDATE SET "
+                    "assignee = excluded.assignee, expires = excluded.expires, "
+                    "heartbeat = excluded.heartbeat "
+                    "WHERE leases.assignee = excluded.assignee OR leases.expires <= ?",
+                    (task_id, assignee, lease.expires, now, now),
+                )
+                if cursor.rowcount == 1:
+                    return True, lease
+                row = conn.execute(
+                    "SELECT task_id, assignee, expires, heartbeat FROM leases WHERE task_id = ?",
+                    (task_id,),
+                ).fetchone()
+            finally:
+                conn.close()
+        except (sqlite3.Error, OSError) as e:
+            logger.warning("lease table unavailable, claiming %s unguarded: %s", task_id, e)
+            return True, lease
+        if row is None:  # released between the two statements
+            return self.acquire(task_id, assignee, seconds)
+        return False, Lease(*row)
+
+    def release(self, task_id: str, keep_for: Optional[str] = None) -> None:
+        """Drop the lease on task_id, unless it is held by keep_for."""
+        if not self.db_path.exists():
+            return
+        try:
+            self._query(
+                "DELETE FROM leases WHERE task_id = ? AND assignee IS NOT ?",
+                (task_id, keep_for),
+            )
+        except (sqlite3.Error, OSError) as e:
+            logger.debug("lease release failed for %s: %s", task_id, e)
+
+    def discard(self, lease: Lease) -> bool:
+        """Drop lease if it is still in the table unchanged; return whether it was.
+
+        Fails when the holder has since sent a heartbeat or another agent
+        has taken the task over.
+        """
+        if not self.db_path.exists():
+            return False
+        try:
+            conn = self._connect()
+            try:
+                cursor = conn.execute(
+                    "DELETE FROM leases WHERE task_id = ? AND assignee = ? AND expires = ?",
+                    (lease.task_id, lease.assignee, lease.expires),
+                )
+                return cursor.rowcount == 1
+            finally:
+                conn.close()
+        except (sqlite3.Error, OSError) as e:
+            logger.debug("lease release failed for %s: %s", lease.task_id, e)
+            return False
+
+    def expired(self) -> list[Lease]:
+        """Return every lease past its expiry."""
+        if not self.db_path.exists():
+            return []
+        try:
+            rows = self._query(
+                "SELECT task_id, assignee, expires, heartbeat FROM leases "
+                "WHERE expires <= ? ORDER BY task_id",
+                (time.time(),),
+            )
+        except (sqlite3.Error, OSError) as e:
+            logger.debug("expired lease lookup failed: %s", e)
+            return []
+        return [Lease(*row) for row in rows]
+
+
+def claim(store, task_id: str, assignee: str, seconds: Optional[float] = None) -> dict:
+    """Check task_id's readiness and lease it to assignee, atomically across processes.
+
+    A task whose lease has expired can be taken over from its holder.
+    Returns check_readiness's dict; when ready it also carries "lease".
+    The caller then records the claim with store.update().
+    """
+    from .readiness import check_readiness
+
+    task_meta, _ = store.get_task(task_id)
+    lease = store.get_lease(task_id)
+    holder = assignee
+    if lease is not None and lease.expired() and task_meta.assignee == lease.assignee:
+        holder = lease.assignee  # take over a claim whose lease ran out
+
+    def check() -> dict:
+        task_meta, task_body = store.get_task(task_id)
+        return check_readiness(task_meta, task_body, store, reclaim_for=holder)
+
+    readiness = check()
+    if not readiness["ready"]:
+        return readiness
+    acquired, lease = store.acquire_lease(task_id, assignee, seconds)
+    if not acquired:
+        return {
+            **readiness,
+            "ready": False,
+            "blockers": [
+                f"claimed by '{lease.assignee}' (lease expires {lease.to_dict()['expires']})"
+            ],
+        }
+    # Check again now that nobody else can claim it: the task may have been
+    # claimed and finished between the first check and the lease.  Inside a
+    # transaction the cache predates the block, so re-read the file.
+    store.refresh_item("tasks", task_id)
+    readiness = check()
+    if not readiness["ready"]:
+        store.release_lease(task_id)
+        return readiness
+    readiness["lease"] = lease
+    return readiness
+
+
+def reclaim_expired(store) -> list[str]:
+    """Return in-progress tasks whose lease expired to todo, unassigned.
+
+    Returns the IDs of the tasks put back.  Tasks that moved on by other
+    means only lose the stale lease.
+    """
+    reclaimed = []
+    expired = store.expired_leases()
+    if not expired:
+        return reclaimed
+    with store.transaction(message="pm: reclaim expired task claims"):
+        for lease in expired:
+            if not store.discard_lease(lease):
+                continue
+            try:
+                task_meta, _ = store.get_task(lease.task_id)
+            except FileNotFoundError:
+                continue
+            if task_meta.status.value == "in-progress" and task_meta.assignee == lease.assignee:
+                store.update(lease.task_id, status="todo", assignee="")
+                reclaimed.append(lease.task_id)
+    return reclaimed
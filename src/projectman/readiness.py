@@ -1,6 +1,6 @@
 """Task readiness checks — Definition of Ready enforcement."""
 
-from .deps import incomplete_task_dependencies
+from .deps import incomplete_in_status_map, incomplete_task_dependencies
 from .models import TaskFrontmatter, TaskStatus
 from .store import Store
 
@@ -10,6 +10,7 @@ def check_readiness(
     task_body: str,
     store: Store,
     reclaim_for: str | None = None,
+    status_map: dict[str, str] | None = None,
 ) -> dict:
     """Check if a task meets the Definition of Ready.
 
@@ -17,6 +18,10 @@ def check_readiness(
     is already assigned to this name and is todo or in-progress, the status
     and assignee gates pass so a repeated grab is idempotent.
 
+    status_map: task and story ID -> status value (deps.build_status_map),
+    for callers checking many tasks; without it the parent story is read
+    and, for tasks with depends_on, every task and story is listed.
+
     Returns: {"ready": bool, "blockers": list[str], "warnings": list[str]}
     """
     blockers = []
@@ -39,21 +44,28 @@ def check_readiness(
         blockers.append("description too thin (<50 chars)")
 
     # Parent story check
-    try:
-        story_meta, _ = store.get_story(task_meta.story_id)
-        if story_meta.status.value not in ("active", "ready"):
-            blockers.append(
-                f"parent story {task_meta.story_id} is '{story_meta.status.value}'"
-                " — must be 'active' or 'ready'"
-            )
-    except FileNotFoundError:
-        blockers.append(f"parent story {task_meta.story_id} not found")
+    story_status = status_map.get(task_meta.story_id) if status_map else None
+    if story_status is None:
+        # Archived stories are not in the status map; read the file.
+        try:
+            story_meta, _ = store.get_story(task_meta.story_id)
+            story_status = story_meta.status.value
+        except FileNotFoundError:
+            blockers.append(f"parent story {task_meta.story_id} not found")
+    if story_status is not None and story_status not in ("active", "ready"):
+        blockers.append(
+            f"parent story {task_meta.story_id} is '{story_status}'"
+            " — must be 'active' or 'ready'"
+        )
 
     # Dependency check (cross-story aware)
     if task_meta.depends_on:
-        all_tasks = store.list_tasks()
-        all_stories = store.list_stories()
-        incomplete = incomplete_task_dependencies(task_meta, all_tasks, all_stories)
+        if status_map is not None:
+            incomplete = incomplete_in_status_map(task_meta.depends_on, status_map)
+        else:
+            all_tasks = store.list_tasks()
+            all_stories = store.list_stories()
+            incomplete = incomplete_task_dependencies(task_meta, all_tasks, all_stories)
         if incomplete:
             dep_list = ", ".join(incomplete)
             blockers.append(f"incomplete dependencies: {dep_list}")
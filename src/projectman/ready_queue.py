@@ -0,0 +1,333 @@
+"""Ready queue of unassigned todo tasks, kept up to date between calls.
+
+pm_done_next used to list every task, rebuild the story priority map and
+topologically sort every story on each call, then run check_readiness down
+the candidate list.  A ReadyQueue holds the tasks that pass the Definition
+of Ready hard gates in heaps keyed like the board's pick order (see
+board.sort_key), one for the project and one per story.  Each call asks the
+Store for the tasks and stories changed since the last one and re-checks
+only those, their dependents (from Store.dependency_graph()) and, when a
+story changed or its dependency order moved, that story's tasks.  Picking
+the next task is then a heap lookup.
+
+The queue mirrors check_readiness's blockers so it does not offer tasks
+that cannot be grabbed; pm_grab still runs the full check on the pick.
+"""
+
+import heapq
+import threading
+from typing import Iterable, Iterator, Optional
+
+from .board import sort_key
+from .deps import DependencyGraph, topological_sort
+from .models import StoryFrontmatter, TaskFrontmatter
+from .store import Store
+
+# Story statuses whose tasks can be picked up.
+_OPEN_STORY_STATUSES = ("active", "ready")
+
+# Minimum task description length, as in check_readiness.
+_MIN_BODY_CHARS = 50
+
+
+class ReadyQueue:
+    """Ready, unassigned todo tasks of one project in pick order."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._story_generation = 0
+        self._task_generation = 0
+        self._reset()
+
+    def _reset(self) -> None:
+        self._tasks: dict[str, TaskFrontmatter] = {}
+        self._stories: dict[str, StoryFrontmatter] = {}
+        # Task ID -> whether its description is too thin; only known for
+        # tasks that reached the body check.
+        self._thin: dict[str, bool] = {}
+        self._story_tasks: dict[str, set[str]] = {}
+        self._topo: dict[str, int] = {}
+        # Ready task ID -> its heap key.  Heap entries whose key no longer
+        # matches are stale and skipped.
+        self._keys: dict[str, tuple] = {}
+        self._heap: list[tuple[tuple, str]] = []
+        self._story_heaps: dict[str, list[tuple[tuple, str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def count(self, story_id: Optional[str] = None) -> int:
+        """Return how many tasks are ready, in story_id only if given."""
+        with self._lock:
+            if story_id is None:
+                return len(self._keys)
+            story_tasks = self._story_tasks.get(story_id, ())
+            return sum(1 for task_id in story_tasks if task_id in self._keys)
+
+    def sync(self, store: Store) -> None:
+        """Bring the queue up to date with store."""
+        with store.cache_lock, self._lock:
+            story_generation, story_changes = store.changes_since(
+                "stories", self._story_generation
+            )
+            task_generation, task_changes = store.changes_since(
+                "tasks", self._task_generation
+            )
+            if story_changes is None or task_changes is None:
+                self._reload(store)
+            elif story_changes or task_changes:
+                self._apply(store, story_changes, task_changes)
+            self._story_generation = story_generation
+            self._task_generation = task_generation
+
+    def next(
+        self,
+        story_id: Optional[str] = None,
+        same_story_only: bool = False,
+        skip: frozenset = frozenset(),
+    ) -> Optional[TaskFrontmatter]:
+        """Return the task to pick next, or None.
+
+        Tasks of story_id come first; with same_story_only, only those.
+        IDs in skip (e.g. tasks that just failed to grab) are passed over.
+        """
+        with self._lock:
+            heaps = [self._story_heaps.get(story_id, [])] if story_id is not None else []
+            if not same_story_only:
+                heaps.append(self._heap)
+            for heap in heaps:
+                for task_id in self._walk(heap):
+                    if task_id not in skip:
+                        return self._tasks[task_id]
+            return None
+
+    def peek(self, limit: int) -> list[TaskFrontmatter]:
+        """Return up to limit ready tasks in pick order."""
+        with self._lock:
+            found = []
+            for task_id in self._walk(self._heap):
+                if len(found) >= limit:
+                    break
+                found.append(self._tasks[task_id])
+            return found
+
+    def batch(
+        self,
+        n: int,
+        graph: DependencyGraph,
+        taken: Iterable[TaskFrontmatter] = (),
+        skip: frozenset = frozenset(),
+    ) -> list[TaskFrontmatter]:
+        """Return up to n ready tasks to hand to parallel agents.
+
+        No two of the tasks returned, or of them and taken, have a
+        dependency edge between them (readiness already rules most of
+        these out).  The best task of each story not in taken comes first,
+        in pick order, so agents work on different stories; further tasks
+        from the same stories follow only if that is not enough.
+        """
+        with self._lock:
+            taken = list(taken)
+            found: list[TaskFrontmatter] = []
+            held = {task.id for task in taken}
+            stories = {task.story_id for task in taken}
+
+            def fits(task_id: str) -> bool:
+                return task_id not in skip and held.isdisjoint(
+                    graph.dependencies(task_id)
+                ) and held.isdisjoint(graph.dependents(task_id))
+
+            def add(task_id: str) -> None:
+                task = self._tasks[task_id]
+                found.append(task)
+                held.add(task_id)
+                stories.add(task.story_id)
+
+            firsts = []
+            for story_id, heap in self._story_heaps.items():
+                if story_id in stories:
+                    continue
+                for task_id in self._walk(heap):
+                    if fits(task_id):
+                        firsts.append((self._keys[task_id], task_id))
+                        break
+            for _, task_id in heapq.nsmallest(n, firsts):
+                if fits(task_id):
+                    add(task_id)
+            if len(found) < n:
+                for task_id in self._walk(self._heap):
+                    if len(found) >= n:
+                        break
+                    if task_id not in held and fits(task_id):
+                        add(task_id)
+            return found
+
+    def _reload(self, store: Store) -> None:
+        self._reset()
+        stories = {story.id: story for story in store.list_stories()}
+        tasks = {task.id: task for task in store.list_tasks()}
+        self._apply(store, stories, tasks)
+
+    def _apply(
+        self,
+        store: Store,
+        story_changes: dict[str, Optional[StoryFrontmatter]],
+        task_changes: dict[str, Optional[TaskFrontmatter]],
+    ) -> None:
+        graph = store.dependency_graph()
+        recheck: set[str] = set()
+        reorder: set[str] = set()
+
+        for story_id, meta in story_changes.items():
+            old = self._stories.pop(story_id, None)
+            if meta is not None:
+                self._stories[story_id] = meta
+            recheck |= self._story_tasks.get(story_id, set())
+            if _status(old) != _status(meta):
+                recheck |= graph.dependents(story_id)
+
+        for task_id, meta in task_changes.items():
+            old = self._tasks.pop(task_id, None)
+            if old is not None:
+                self._unlink(old)
+            if meta is not None:
+                self._tasks[task_id] = meta
+                self._link(meta)
+            else:
+                self._topo.pop(task_id, None)
+            self._thin.pop(task_id, None)
+            recheck.add(task_id)
+            if _status(old) != _status(meta):
+                recheck |= graph.dependents(task_id)
+            if (
+                old is None
+                or meta is None
+                or old.story_id != meta.story_id
+                or old.depends_on != meta.depends_on
+            ):
+                reorder.update(t.story_id for t in (old, meta) if t is not None)
+
+        for story_id in reorder:
+            task_ids = self._story_tasks.get(story_id, set())
+            recheck |= task_ids
+            story_tasks = [self._tasks[task_id] for task_id in sorted(task_ids)]
+            try:
+                ordered = topological_sort(story_tasks)
+            except Exception:
+                ordered = story_tasks
+            for idx, task in enumerate(ordered):
+                self._topo[task.id] = idx
+
+        self._check_bodies(store, recheck)
+        for task_id in recheck:
+            self._set_key(task_id, self._key(task_id))
+        if len(self._heap) > 2 * len(self._keys) + 64:
+            self._compact()
+
+    def _link(self, task: TaskFrontmatter) -> None:
+        self._story_tasks.setdefault(task.story_id, set()).add(task.id)
+
+    def _unlink(self, task: TaskFrontmatter) -> None:
+        _discard(self._story_tasks, task.story_id, task.id)
+
+    def _check_bodies(self, store: Store, task_ids: set[str]) -> None:
+        """Record _thin for tasks that pass every gate but the body one."""
+        unread = [
+            task_id
+            for task_id in task_ids
+            if task_id not in self._thin and self._passes_frontmatter_gates(task_id)
+        ]
+        if not unread:
+            return
+        bodies = store.read_bodies("tasks", unread)
+        for task_id in unread:
+            body = bodies.get(task_id)
+            self._thin[task_id] = body is None or len(body.strip()) < _MIN_BODY_CHARS
+
+    def _passes_frontmatter_gates(self, task_id: str) -> bool:
+        task = self._tasks.get(task_id)
+        if task is None or task.status.value != "todo" or task.assignee is not None:
+            return False
+        if task.points is None:
+            return False
+        if _status(self._stories.get(task.story_id)) not in _OPEN_STORY_STATUSES:
+            return False
+        return not any(_status(self._item(dep)) not in (None, "done") for dep in task.depends_on)
+
+    def _item(self, item_id: str):
+        return self._tasks.get(item_id) or self._stories.get(item_id)
+
+    def _key(self, task_id: str) -> Optional[tuple]:
+        if not self._passes_frontmatter_gates(task_id) or self._thin.get(task_id, True):
+            return None
+        task = self._tasks[task_id]
+        return sort_key(task, self._stories[task.story_id], self._topo) + (task_id,)
+
+    def _set_key(self, task_id: str, key: Optional[tuple]) -> None:
+        if key is None:
+            self._keys.pop(task_id, None)
+            return
+        if self._keys.get(task_id) == key:
+            return
+        self._keys[task_id] = key
+        heapq.heappush(self._heap, (key, task_id))
+        heapq.heappush(self._story_heaps.setdefault(key[1], []), (key, task_id))
+
+    def _compact(self) -> None:
+        self._heap = [(key, task_id) for task_id, key in self._keys.items()]
+        heapq.heapify(self._heap)
+        self._story_heaps = {}
+        for entry in self._heap:
+            self._story_heaps.setdefault(entry[0][1], []).append(entry)
+        for heap in self._story_heaps.values():
+            heapq.heapify(heap)
+
+    def _walk(self, heap: list[tuple[tuple, str]]) -> Iterator[str]:
+        """Yield the live task IDs in heap in key order without popping them.
+
+        Stale entries at the top are dropped first; the rest of the heap is
+        visited best-first through a frontier of heap positions, so taking
+        the first k IDs costs O(k log k).  A task whose key changed and
+        changed back has two identical entries, which come out one after
+        the other; only the first is yielded.
+        """
+        while heap and self._keys.get(heap[0][1]) != heap[0][0]:
+            heapq.heappop(heap)
+        frontier = [(heap[0], 0)] if heap else []
+        previous = None
+        while frontier:
+            entry, pos = heapq.heappop(frontier)
+            key, task_id = entry
+            if self._keys.get(task_id) == key and entry != previous:
+                previous = entry
+                yield task_id
+            for child in (2 * pos + 1, 2 * pos + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], child))
+
+
+def _status(item) -> Optional[str]:
+    return item.status.value if item is not None else None
+
+
+def _discard(index: dict[str, set[str]], key: str, item_id: str) -> None:
+    ids = index.get(key)
+    if ids is not None:
+        ids.discard(item_id)
+        if not ids:
+            del index[key]
+
+
+_queues: dict[str, ReadyQueue] = {}
+_queues_lock = threading.Lock()
+
+
+def get_ready_queue(store: Store) -> ReadyQueue:
+    """Return the ready queue for store's project, synced with the store."""
+    key = str(store.project_dir)
+    with _queues_lock:
+        queue = _queues.get(key)
+        if queue is None:
+            queue = _queues[key] = ReadyQueue()
+    queue.sync(store)
+    return queue
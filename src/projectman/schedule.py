@@ -0,0 +1,249 @@
+"""Schedule of the remaining work for a fleet of parallel agents.
+
+The remaining tasks and the depends_on edges between them and their
+stories form a DAG weighted by points.  plan_schedule() walks it once in
+topological order for each task's earliest start (the longest chain of
+work before it) and the critical path, once backwards for each task's
+remaining chain length (its bottom level) and slack, and then runs a
+greedy list schedule for K agents: whenever an agent is free it takes
+the ready task with the longest chain still ahead of it.
+
+The critical path bounds how fast the work can go however many agents
+there are, and total points / critical path is the most parallelism the
+graph offers.  The scaling rows compare the makespan of one agent with
+the fleet's (and optionally half the fleet's), which is what adding
+agents actually buys.
+
+Times are in points from now.  Done tasks and stories are treated as
+finished; a story finishes when its remaining tasks do, and its tasks
+wait for the stories and tasks it depends on.  Tasks without an estimate
+count as DEFAULT_POINTS.
+"""
+
+import heapq
+from dataclasses import dataclass, field
+
+from .deps import build_combined_dep_graph, topological_order
+from .models import StoryFrontmatter, StoryStatus, TaskFrontmatter, TaskStatus
+
+# Points assumed for tasks without an estimate.
+DEFAULT_POINTS = 3
+
+
+@dataclass
+class ScheduledTask:
+    id: str
+    points: int
+    # Earliest possible start with unlimited agents, and how far the task
+    # can slip past it without delaying the critical path.
+    earliest_start: int
+    slack: int
+    # Placement in the list schedule for Plan.agents agents.
+    agent: int
+    start: int
+    finish: int
+
+
+@dataclass
+class Plan:
+    agents: int
+    total_points: int
+    critical_path: list[str]
+    critical_path_points: int
+    makespan: int
+    # Task schedule in start order.
+    tasks: list[ScheduledTask]
+    # {"agents", "makespan", "speedup", "efficiency"} per fleet size.
+    scaling: list[dict] = field(default_factory=list)
+    unestimated: list[str] = field(default_factory=list)
+
+    @property
+    def parallelism(self) -> float:
+        """Total points over critical path points: the most speedup possible."""
+        return self.total_points / self.critical_path_points if self.critical_path_points else 0.0
+
+
+def _fleet_sizes(agents: int, compare: bool) -> list[int]:
+    """One agent and the whole fleet, plus half the fleet with compare."""
+    sizes = {1, agents}
+    if compare:
+        sizes.add((agents + 1) // 2)
+    return sorted(sizes)
+
+
+def _list_schedule(
+    durations: list[int],
+    dependents: list[list[int]],
+    in_degree: list[int],
+    priority: list[tuple[int, int]],
+    agents: int,
+) -> tuple[int, list[int], list[int]]:
+    """Simulate agents taking the highest-priority ready node.
+
+    priority[v] is (-chain length, v), so the ready node with the longest
+    chain of work ahead goes first and topological order breaks ties.
+    Story nodes (zero points) finish as soon as they are ready without
+    taking an agent.  Returns the makespan and each node's agent and start.
+    """
+    n = len(durations)
+    remaining = list(in_degree)
+    ready = [priority[v] for v in range(n) if not remaining[v]]
+    heapq.heapify(ready)
+    free = list(range(agents - 1, -1, -1))  # a stack; agent 0 goes first
+    agent_of = [0] * n
+    start = [0] * n
+    running: list[tuple[int, int]] = []  # (finish, node)
+    now = 0
+    heappop, heappush = heapq.heappop, heapq.heappush
+
+    while ready or running:
+        while ready and (free or not durations[ready[0][1]]):
+            v = heappop(ready)[1]
+            if durations[v]:
+                agent_of[v] = free.pop()
+                start[v] = now
+                heappush(running, (now + durations[v], v))
+                continue
+            for w in dependents[v]:
+                remaining[w] -= 1
+                if not remaining[w]:
+                    heappush(ready, priority[w])
+        if not running:
+            break
+        now = running[0][0]
+        while running and running[0][0] == now:
+            v = heappop(running)[1]
+            free.append(agent_of[v])
+            for w in dependents[v]:
+                remaining[w] -= 1
+                if not remaining[w]:
+                    heappush(ready, priority[w])
+    return now, agent_of, start
+
+
+def plan_schedule(
+    tasks: list[TaskFrontmatter],
+    stories: list[StoryFrontmatter],
+    agents: int = 4,
+    compare: bool = False,
+) -> Plan:
+    """Plan the tasks not yet done for agents parallel agents.
+
+    The scaling rows cover one agent (which needs no simulation) and the
+    whole fleet; compare adds a simulated run for half the fleet.
+
+    Raises CycleError if the remaining work has a dependency cycle and
+    ValueError if agents is below 1.
+    """
+    if agents < 1:
+        raise ValueError("agents must be at least 1")
+    open_tasks = [t for t in tasks if t.status is not TaskStatus.done]
+    open_stories = [
+        s for s in stories
+        if s.status is not StoryStatus.done and s.status is not StoryStatus.archived
+    ]
+    story_deps = {s.id: s.depends_on for s in open_stories}
+
+    graph = build_combined_dep_graph(open_tasks, open_stories)
+    # A story is only linked to its tasks when something depends on it.
+    awaited = {dep for deps in graph.values() for dep in deps if dep in story_deps}
+    for task in open_tasks:
+        # Tasks wait for what their story depends on; the story waits for them.
+        inherited = story_deps.get(task.story_id)
+        if inherited:
+            graph[task.id] += [dep for dep in inherited if dep in graph and dep != task.id]
+        if task.story_id in awaited:
+            graph[task.story_id].append(task.id)
+    order = topological_order(graph)
+
+    index = dict(zip(order, range(len(order))))
+    task_points = {
+        t.id: t.points if t.points is not None else DEFAULT_POINTS for t in open_tasks
+    }
+    durations = [task_points.get(item_id, 0) for item_id in order]
+    n = len(order)
+    in_degree = [0] * n
+    dependents: list[list[int]] = [[] for _ in range(n)]
+    for v, item_id in enumerate(order):
+        deps = graph[item_id]
+        in_degree[v] = len(deps)
+        for dep in deps:
+            dependents[index[dep]].append(v)
+
+    # Forward pass in topological order: each node's earliest start is
+    # final once it is reached, and so is the dependency that sets it.
+    earliest = [0] * n
+    via = [-1] * n
+    for v in range(n):
+        end = earliest[v] + durations[v]
+        for w in dependents[v]:
+            if end > earliest[w]:
+                earliest[w] = end
+                via[w] = v
+    # Backward pass: longest chain of work from each node to the end.
+    chain = list(durations)
+    for v in range(n - 1, -1, -1):
+        tail = 0
+        for w in dependents[v]:
+            if chain[w] > tail:
+                tail = chain[w]
+        chain[v] += tail
+
+    finish = [earliest[v] + durations[v] for v in range(n)]
+    critical_points = max(finish, default=0)
+    critical_path: list[str] = []
+    v = finish.index(critical_points) if n else -1
+    while v >= 0:
+        if order[v] in task_points:
+            critical_path.append(order[v])
+        v = via[v]
+    critical_path.reverse()
+
+    total = sum(durations)
+    priority = [(-length, v) for v, length in enumerate(chain)]
+    makespan, agent_of, start = _list_schedule(
+        durations, dependents, in_degree, priority, agents
+    )
+    scaling = []
+    for size in _fleet_sizes(agents, compare):
+        if size == agents:
+            span = makespan
+        elif size == 1:
+            span = total  # one agent is never idle on a DAG
+        else:
+            span = _list_schedule(
+                durations, dependents, in_degree, priority, size
+            )[0]
+        speedup = total / span if span else 1.0
+        scaling.append({
+            "agents": size,
+            "makespan": span,
+            "speedup": round(speedup, 2),
+            "efficiency": round(speedup / size, 2),
+        })
+
+    # Start order, agent breaking ties (sorts are stable).
+    placed = [v for v in range(n) if order[v] in task_points]
+    placed.sort(key=agent_of.__getitem__)
+    placed.sort(key=start.__getitem__)
+    return Plan(
+        agents=agents,
+        total_points=total,
+        critical_path=critical_path,
+        critical_path_points=critical_points,
+        makespan=makespan,
+        tasks=[
+            ScheduledTask(
+                id=order[v],
+                points=durations[v],
+                earliest_start=earliest[v],
+                slack=critical_points - chain[v] - earliest[v],
+                agent=agent_of[v],
+                start=start[v],
+                finish=start[v] + durations[v],
+            )
+            for v in placed
+        ],
+        scaling=scaling,
+        unestimated=sorted(t.id for t in open_tasks if t.points is None),
+    )
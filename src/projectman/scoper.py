@@ -265,7 +265,7 @@ def _tree(root: Path, depth: int, exclude: set[str], prefix: str = "") -> list[s
 def scope_epic(store: Store, epic_id: str) -> str:
     """Return epic content + linked stories + decomposition guidance."""
     meta, body = store.get_epic(epic_id)
-    linked_stories = [s for s in store.list_stories() if s.epic_id == epic_id]
+    linked_stories = store.list_stories(epic_id=epic_id)
 
     guidance = {
         "rules": [
@@ -1,9 +1,66 @@
-"""Keyword search — substring matching fallback when embeddings aren't available."""
+"""Keyword search over a persistent inverted index with BM25 ranking.
 
-from pathlib import Path
+Used when embeddings aren't available.  Titles, bodies and tags of every
+epic, story and task are tokenized into an inverted index stored in
+``.project/.cache/search.db`` (git-ignored, like the Store snapshot).  The
+index is kept current two ways: the Store pushes every item it writes, and
+each query re-stats the item directories and re-indexes only files whose
+(inode, size, mtime_ns) fingerprint changed, so external edits are seen too.
+Latency-sensitive callers can instead pass ``background_refresh`` and have
+that re-stat run on a thread after the first query of the process.
+
+Ranking runs inside SQLite: document frequencies are kept per term by
+triggers, and BM25 is one grouped query over the matching postings.
+
+substring_search keeps the original exact-substring semantics (file paths,
+error strings) without reading item files: a trigram index (SQLite FTS5)
+narrows the candidates to docs containing every trigram of the query, and
+each candidate's stored text is then checked for the substring itself.
+"""
+
+import logging
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
 from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, Optional
+
+from .frontmatter_io import read_post
+
+logger = logging.getLogger(__name__)
+
+# Bump when the schema or tokenization changes; a mismatch rebuilds the index.
+SEARCH_INDEX_VERSION = 5
+
+# (subdirectory, item type) for every indexed kind of item.
+_KINDS = (("epics", "epic"), ("stories", "story"), ("tasks", "task"))
 
-import frontmatter
+# BM25 parameters.  Title tokens are counted TITLE_WEIGHT times so a match in
+# the title outranks the same match in the body.
+BM25_K1 = 1.2
+BM25_B = 0.75
+TITLE_WEIGHT = 2
+
+# background_refresh starts at most one re-scan per this many seconds, so a
+# burst of queries does not keep a scan of a large project running.
+REFRESH_INTERVAL = 2.0
+
+# A query token expands to at most this many indexed terms, shortest first,
+# so a one- or two-letter prefix cannot pull in most of the vocabulary.
+MAX_PREFIX_TERMS = 32
+
+# SQLite virtual-machine steps between checks of a search's cancel event.
+_CANCEL_CHECK_STEPS = 1000
+
+_TOKEN = re.compile(r"\w+")
+
+Fingerprint = tuple[int, int, int]
 
 
 @dataclass
@@ -15,49 +72,631 @@ class SearchResult:
     snippet: str
 
 
-def keyword_search(query: str, project_dir: Path, top_k: int = 10, tag: str | None = None) -> list[SearchResult]:
-    """Scan all stories/tasks for substring matches in title + content."""
-    results = []
-    query_lower = query.lower()
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase word tokens."""
+    return _TOKEN.findall(text.lower())
 
-    for subdir, item_type in [("epics", "epic"), ("stories", "story"), ("tasks", "task")]:
-        search_dir = project_dir / subdir
-        if not search_dir.exists():
-            continue
-        for path in search_dir.glob("*.md"):
-            post = frontmatter.load(str(path))
-            title = post.metadata.get("title", "")
 
-            # Tag filter: skip items that don't have the requested tag
-            if tag:
-                item_tags = post.metadata.get("tags", []) or []
-                if tag not in item_tags:
+def _scan(dir_path: Path) -> dict[str, Fingerprint]:
+    fingerprints: dict[str, Fingerprint] = {}
+    try:
+        with os.scandir(dir_path) as it:
+            for entry in it:
+                if entry.name.startswith(".") or not entry.name.endswith(".md"):
+                    continue
+                try:
+                    if not entry.is_file():
+                        continue
+                    st = entry.stat()
+                except OSError:
                     continue
+                fingerprints[entry.name] = (st.st_ino, st.st_size, st.st_mtime_ns)
+    except (FileNotFoundError, NotADirectoryError):
+        pass
+    return fingerprints
+
+
+class SearchIndex:
+    """Inverted index for one project directory.
+
+    ``docs`` holds one row per item file (with its fingerprint, so a query
+    can tell which files changed), ``postings`` maps each term to the docs
+    containing it with term frequency and doc length, and ``tags`` lets the
+    tag filter run inside the index.  Malformed files keep a docs row with
+    a NULL id so they are not re-parsed on every query.
+
+    Connections are opened per operation.  If the on-disk database cannot
+    be used the index falls back to an in-memory one, which is rebuilt per
+    process but behaves the same.
+    """
+
+    def __init__(self, project_dir: Path):
+        self.project_dir = project_dir
+        self.db_path = project_dir / ".cache" / "search.db"
+        self._lock = threading.RLock()
+        self._initialized = False
+        self._memory: Optional[sqlite3.Connection] = None
+        # Bumped whenever this process changes the index; lets derived
+        # structures (e.g. the typeahead index) tell when to rebuild.
+        self.generation = 0
+        self._refreshed = False
+        self._refreshed_at = 0.0
+        self._refresher: Optional[threading.Thread] = None
+        self._refresher_lock = threading.Lock()
+
+    # ─── Storage ─────────────────────────────────────────────────
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Yield a connection to the index; callers hold self._lock."""
+        conn = self._memory
+        if conn is None:
+            try:
+                if not self._initialized:
+                    self._open(self.db_path).close()
+                    self._initialized = True
+                conn = sqlite3.connect(str(self.db_path), timeout=5)
+            except (sqlite3.Error, OSError) as e:
+                logger.debug("search index: falling back to memory: %s", e)
+                conn = self._memory = self._open(None)
+        try:
+            yield conn
+        finally:
+            if conn is not self._memory:
+                conn.close()
+
+    def _open(self, db_path: Optional[Path]) -> sqlite3.Connection:
+        if db_path is not None:
+            if not self.project_dir.is_dir():
+                raise FileNotFoundError(f"Project directory not found: {self.project_dir}")
+            db_path.parent.mkdir(exist_ok=True)
+            gitignore = db_path.parent / ".gitignore"
+            if not gitignore.exists():
+                gitignore.write_text("*\n")
+        conn = sqlite3.connect(
+            str(db_path) if db_path is not None else ":memory:",
+            timeout=5,
+            check_same_thread=False,
+        )
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != SEARCH_INDEX_VERSION:
+                conn.executescript(
+                    "DROP TABLE IF EXISTS docs; DROP TABLE IF EXISTS postings; "
+                    "DROP TABLE IF EXISTS tags; DROP TABLE IF EXISTS terms; "
+                    "DROP TABLE IF EXISTS stats; DROP TABLE IF EXISTS grams;"
+                )
+                conn.execute(f"PRAGMA user_version = {SEARCH_INDEX_VERSION}")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS docs (
+                    doc INTEGER PRIMARY KEY,
+                    type TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    ino INTEGER,
+                    size INTEGER,
+                    mtime_ns INTEGER,
+                    id TEXT,
+                    title TEXT,
+                    status TEXT,
+                    epic_id TEXT,
+                    story_id TEXT,
+                    length INTEGER,
+                    text TEXT,
+                    UNIQUE (type, name)
+                );
+                CREATE INDEX IF NOT EXISTS docs_id ON docs (id COLLATE NOCASE);
+                CREATE INDEX IF NOT EXISTS docs_epic ON docs (epic_id);
+                CREATE TABLE IF NOT EXISTS stats (
+                    one INTEGER PRIMARY KEY CHECK (one = 1),
+                    n_docs INTEGER NOT NULL,
+                    total_length INTEGER NOT NULL
+                );
+                INSERT OR IGNORE INTO stats VALUES (1, 0, 0);
+                CREATE TRIGGER IF NOT EXISTS docs_insert AFTER INSERT ON docs
+                WHEN new.id IS NOT NULL BEGIN
+                    UPDATE stats SET n_docs = n_docs + 1, total_length = total_length + new.length;
+                END;
+                CREATE TRIGGER IF NOT EXISTS docs_delete AFTER DELETE ON docs
+                WHEN old.id IS NOT NULL BEGIN
+                    UPDATE stats SET n_docs = n_docs - 1, total_length = total_length - old.length;
+                END;
+                CREATE TABLE IF NOT EXISTS postings (
+                    term TEXT NOT NULL,
+                    doc INTEGER NOT NULL,
+                    tf INTEGER NOT NULL,
+                    dl INTEGER NOT NULL,
+                    PRIMARY KEY (term, doc)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc);
+                CREATE TABLE IF NOT EXISTS terms (
+                    term TEXT PRIMARY KEY,
+                    df INTEGER NOT NULL
+                ) WITHOUT ROWID;
+                CREATE TRIGGER IF NOT EXISTS postings_insert AFTER INSERT ON postings BEGIN
+                    INSERT INTO terms (term, df) VALUES (new.term, 1)
+                    ON CONFLICT (term) DO UPDATE SET df = df + 1;
+                END;
+                CREATE TRIGGER IF NOT EXISTS postings_delete AFTER DELETE ON postings BEGIN
+                    UPDATE terms SET df = df - 1 WHERE term = old.term;
+                END;
+                CREATE TABLE IF NOT EXISTS tags (
+                    tag TEXT NOT NULL,
+                    doc INTEGER NOT NULL,
+                    PRIMARY KEY (tag, doc)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS tags_doc ON tags (doc);
+            """)
+            try:
+                # Trigram postings over docs.text, kept in step by triggers.
+                conn.executescript("""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS grams USING fts5 (
+                        text, content='docs', content_rowid='doc',
+                        tokenize='trigram', detail='none'
+                    );
+                    CREATE TRIGGER IF NOT EXISTS grams_insert AFTER INSERT ON docs
+                    WHEN new.text IS NOT NULL BEGIN
+                        INSERT INTO grams (rowid, text) VALUES (new.doc, new.text);
+                    END;
+                    CREATE TRIGGER IF NOT EXISTS grams_delete AFTER DELETE ON docs
+                    WHEN old.text IS NOT NULL BEGIN
+                        INSERT INTO grams (grams, rowid, text) VALUES ('delete', old.doc, old.text);
+                    END;
+                """)
+            except sqlite3.OperationalError as e:
+                # SQLite older than 3.34 or built without FTS5.
+                logger.debug("search index: no trigram index, substring search scans: %s", e)
+            conn.commit()
+        except sqlite3.Error:
+            conn.close()
+            raise
+        return conn
+
+    # ─── Maintenance ─────────────────────────────────────────────
+
+    @staticmethod
+    def _delete(conn: sqlite3.Connection, doc: int) -> None:
+        conn.execute("DELETE FROM postings WHERE doc = ?", (doc,))
+        conn.execute("DELETE FROM tags WHERE doc = ?", (doc,))
+        conn.execute("DELETE FROM docs WHERE doc = ?", (doc,))
+
+    @staticmethod
+    def _put(
+        conn: sqlite3.Connection,
+        item_type: str,
+        name: str,
+        fp: Fingerprint,
+        metadata: Optional[dict],
+        body: str,
+    ) -> None:
+        row = conn.execute(
+            "SELECT doc FROM docs WHERE type = ? AND name = ?", (item_type, name)
+        ).fetchone()
+        if row is not None:
+            SearchIndex._delete(conn, row[0])
+        if metadata is None:
+            conn.execute(
+                "INSERT INTO docs (type, name, ino, size, mtime_ns) VALUES (?, ?, ?, ?, ?)",
+                (item_type, name, *fp),
+            )
+            return
+
+        title = str(metadata.get("title", "") or "")
+        tags = [str(t) for t in (metadata.get("tags") or [])]
+        status = metadata.get("status")
+        status = getattr(status, "value", status)
+        counts = Counter(tokenize(body))
+        counts.update(tokenize(" ".join(tags)))
+        for token in tokenize(title):
+            counts[token] += TITLE_WEIGHT
+        length = sum(counts.values())
+
+        cur = conn.execute(
+            "INSERT INTO docs (type, name, ino, size, mtime_ns, id, title, status, "
+            "epic_id, story_id, length, text) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                item_type, name, *fp,
+                str(metadata.get("id") or name[:-3]),
+                title,
+                None if status is None else str(status),
+                metadata.get("epic_id"),
+                metadata.get("story_id"),
+                length,
+                f"{title} {body}",
+            ),
+        )
+        doc = cur.lastrowid
+        conn.executemany(
+            "INSERT INTO postings (term, doc, tf, dl) VALUES (?, ?, ?, ?)",
+            [(term, doc, tf, length) for term, tf in counts.items()],
+        )
+        conn.executemany(
+            "INSERT OR IGNORE INTO tags (tag, doc) VALUES (?, ?)",
+            [(tag, doc) for tag in tags],
+        )
+
+    def refresh(self) -> None:
+        """Re-index item files added, changed or removed since the last look."""
+        scans = [
+            (subdir, item_type, _scan(self.project_dir / subdir))
+            for subdir, item_type in _KINDS
+        ]
+        with self._lock, self._connection() as conn:
+            known: dict[tuple[str, str], tuple[int, Fingerprint]] = {
+                (item_type, name): (doc, (ino, size, mtime_ns))
+                for doc, item_type, name, ino, size, mtime_ns in conn.execute(
+                    "SELECT doc, type, name, ino, size, mtime_ns FROM docs"
+                )
+            }
+        # Parse changed files without holding the lock, so searches against
+        # the current index are not blocked behind a large refresh.
+        changed = []
+        for subdir, item_type, current in scans:
+            for name, fp in current.items():
+                entry = known.pop((item_type, name), None)
+                if entry is not None and entry[1] == fp:
+                    continue
+                try:
+                    metadata, body = read_post(self.project_dir / subdir / name)
+                except (OSError, UnicodeDecodeError):
+                    continue
+                except Exception:
+                    metadata, body = None, ""
+                changed.append((item_type, name, fp, metadata, body))
+        if changed or known:
+            with self._lock, self._connection() as conn, conn:
+                for item_type, name, fp, metadata, body in changed:
+                    self._put(conn, item_type, name, fp, metadata, body)
+                for doc, _ in known.values():
+                    self._delete(conn, doc)
+                self.generation += 1
+        self._refreshed = True
+        self._refreshed_at = time.monotonic()
+
+    def _refresh_quietly(self) -> None:
+        try:
+            self.refresh()
+        except Exception as e:
+            logger.debug("search index: background refresh failed: %s", e)
+
+    def warm(self) -> None:
+        """Scan the item directories if this process has not done so yet."""
+        if not self._refreshed:
+            self.refresh()
 
-            content = post.content
-            combined = f"{title} {content}".lower()
+    def refresh_in_background(self) -> None:
+        """Start refresh() on a daemon thread.
 
-            if query_lower in combined:
-                # Simple scoring: title match scores higher
-                score = 0.0
-                if query_lower in title.lower():
-                    score = 1.0
-                else:
-                    score = 0.5
+        Skipped while one is running or within REFRESH_INTERVAL seconds of
+        the last refresh.
+        """
+        with self._refresher_lock:
+            if self._refresher is not None and self._refresher.is_alive():
+                return
+            if time.monotonic() - self._refreshed_at < REFRESH_INTERVAL:
+                return
+            self._refresher = threading.Thread(
+                target=self._refresh_quietly, name="projectman-search-refresh", daemon=True
+            )
+            self._refresher.start()
 
-                # Extract snippet around match
-                idx = combined.find(query_lower)
+    def update(self, item_type: str, metadata: dict, body: str) -> None:
+        """Index an item the Store just wrote, recording its file's fingerprint.
+
+        A no-op until the index has been built on disk by a first query;
+        that query indexes every file anyway.
+        """
+        subdir = next(d for d, t in _KINDS if t == item_type)
+        name = f"{metadata['id']}.md"
+        with self._lock:
+            if self._memory is None and not self.db_path.exists():
+                return
+            try:
+                st = (self.project_dir / subdir / name).stat()
+            except OSError:
+                return
+            with self._connection() as conn, conn:
+                self._put(
+                    conn, item_type, name, (st.st_ino, st.st_size, st.st_mtime_ns),
+                    metadata, body,
+                )
+                self.generation += 1
+
+    # ─── Querying ────────────────────────────────────────────────
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 10,
+        tag: Optional[str] = None,
+        item_type: Optional[str] = None,
+        status: Optional[str] = None,
+        epic_id: Optional[str] = None,
+        background_refresh: bool = False,
+        cancel: Optional[threading.Event] = None,
+    ) -> list[SearchResult]:
+        """Rank items against query with BM25, best first.
+
+        Each query token matches every indexed term it is a prefix of, so
+        "auth" finds "authentication" (up to MAX_PREFIX_TERMS terms per
+        token); a doc scores the best such term per query token.  tag,
+        item_type, status and epic_id (an epic's stories and their tasks)
+        restrict the candidate docs inside the index before scoring.
+
+        The item directories are re-scanned before ranking unless
+        background_refresh is set; then, after the process's first query,
+        the scan runs on a thread (at most every REFRESH_INTERVAL seconds)
+        and this query sees the index as it was.
+
+        Setting cancel interrupts the ranking query, which then raises
+        sqlite3.OperationalError; used to abandon a query that is too slow.
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+
+        if background_refresh and self._refreshed:
+            self.refresh_in_background()
+        else:
+            self.refresh()
+        with self._lock, self._connection() as conn:
+            if cancel is not None:
+                conn.set_progress_handler(cancel.is_set, _CANCEL_CHECK_STEPS)
+            try:
+                return self._rank(conn, tokens, tag, item_type, status, epic_id, top_k)
+            finally:
+                if cancel is not None:
+                    conn.set_progress_handler(None, 0)
+
+    @staticmethod
+    def _rank(
+        conn: sqlite3.Connection,
+        tokens: list[str],
+        tag: Optional[str],
+        item_type: Optional[str],
+        status: Optional[str],
+        epic_id: Optional[str],
+        top_k: int,
+    ) -> list[SearchResult]:
+        n_docs, total_length = conn.execute(
+            "SELECT n_docs, total_length FROM stats"
+        ).fetchone()
+        if not n_docs:
+            return []
+        avg_len = total_length / n_docs
+
+        # (term, query token, idf) for the indexed terms each token prefixes.
+        expanded = []
+        for tok, token in enumerate(tokens):
+            for term, df in conn.execute(
+                "SELECT term, df FROM terms WHERE term >= ? AND term < ? AND df > 0 "
+                "ORDER BY length(term), term LIMIT ?",
+                (token, token + "\U0010ffff", MAX_PREFIX_TERMS),
+            ):
+                idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                expanded.append((term, tok, idf))
+        if not expanded:
+            return []
+
+        where, params = _filter_sql(tag, item_type, status, epic_id)
+        values = ", ".join(["(?, ?, ?)"] * len(expanded))
+        rows = conn.execute(
+            f"WITH q (term, tok, idf) AS (VALUES {values}) "
+            "SELECT best.doc, SUM(best.score) AS total, d.id, d.title, d.type, d.text "
+            "FROM ("
+            "  SELECT p.doc AS doc, MAX("
+            "    q.idf * p.tf * ? / (p.tf + ? * (1 - ? + ? * p.dl / ?))"
+            "  ) AS score"
+            "  FROM q JOIN postings p ON p.term = q.term"
+            "  GROUP BY p.doc, q.tok"
+            ") AS best JOIN docs d ON d.doc = best.doc "
+            f"WHERE {where} "
+            "GROUP BY best.doc ORDER BY total DESC, best.doc LIMIT ?",
+            (
+                *(v for row in expanded for v in row),
+                BM25_K1 + 1, BM25_K1, BM25_B, BM25_B, avg_len,
+                *params, top_k,
+            ),
+        ).fetchall()
+        return [
+            SearchResult(
+                id=item_id,
+                title=title,
+                type=doc_type,
+                score=round(score, 3),
+                snippet=_snippet(text, tokens),
+            )
+            for _, score, item_id, title, doc_type, text in rows
+        ]
+
+    def substring_search(
+        self,
+        query: str,
+        top_k: int = 10,
+        tag: Optional[str] = None,
+        item_type: Optional[str] = None,
+        status: Optional[str] = None,
+        epic_id: Optional[str] = None,
+    ) -> list[SearchResult]:
+        """Return items whose "title body" text contains query, case-insensitively.
+
+        Items matching in the title score 1.0 and the rest 0.5; ties keep
+        index order.  Queries of three or more characters are narrowed by
+        the trigram index, shorter ones check every doc's stored text.
+        """
+        needle = query.lower()
+        self.refresh()
+        where, params = _filter_sql(tag, item_type, status, epic_id)
+        with self._lock, self._connection() as conn:
+            grams = _trigrams(needle)
+            if grams and _has_grams(conn):
+                rows = conn.execute(
+                    "SELECT d.id, d.title, d.type, d.text FROM grams "
+                    f"JOIN docs d ON d.doc = grams.rowid WHERE grams MATCH ? AND {where} "
+                    "ORDER BY d.doc",
+                    (grams, *params),
+                )
+            else:
+                rows = conn.execute(
+                    f"SELECT d.id, d.title, d.type, d.text FROM docs d WHERE {where} "
+                    "ORDER BY d.doc",
+                    params,
+                )
+            results, title_hits = [], 0
+            for item_id, title, doc_type, text in rows:
+                if title_hits >= top_k:
+                    break  # nothing later can outrank top_k title matches
+                combined = text.lower()
+                idx = combined.find(needle)
+                if idx < 0:
+                    continue
+                in_title = needle in title.lower()
+                title_hits += in_title
                 start = max(0, idx - 50)
-                end = min(len(combined), idx + len(query_lower) + 50)
-                snippet = combined[start:end].strip()
-
-                results.append(SearchResult(
-                    id=post.metadata.get("id", path.stem),
-                    title=title,
-                    type=item_type,
-                    score=score,
-                    snippet=snippet,
-                ))
-
-    results.sort(key=lambda r: r.score, reverse=True)
-    return results[:top_k]
+                end = min(len(combined), idx + len(needle) + 50)
+                results.append(
+                    SearchResult(
+                        id=item_id,
+                        title=title,
+                        type=doc_type,
+                        score=1.0 if in_title else 0.5,
+                        snippet=combined[start:end].strip(),
+                    )
+                )
+        results.sort(key=lambda r: r.score, reverse=True)
+        return results[:top_k]
+
+    def get(
+        self,
+        item_id: str,
+        tag: Optional[str] = None,
+        item_type: Optional[str] = None,
+        status: Optional[str] = None,
+        epic_id: Optional[str] = None,
+    ) -> Optional[SearchResult]:
+        """Return the indexed item with this id if it passes the filters.
+
+        IDs are compared case-insensitively, preferring one spelled exactly
+        as given.  Reads the index as it stands, re-scanning the directories
+        only if this process has not done so yet.
+        """
+        self.warm()
+        item_id = item_id.strip()
+        where, params = _filter_sql(tag, item_type, status, epic_id)
+        with self._lock, self._connection() as conn:
+            row = conn.execute(
+                f"SELECT d.id, d.title, d.type, d.text FROM docs d "
+                f"WHERE d.id = ? COLLATE NOCASE AND {where} "
+                f"ORDER BY d.id = ? DESC LIMIT 1",
+                (item_id, *params, item_id),
+            ).fetchone()
+        if row is None:
+            return None
+        found_id, title, doc_type, text = row
+        return SearchResult(
+            id=found_id, title=title, type=doc_type, score=1.0, snippet=text[:100].strip()
+        )
+
+    def titles(self) -> tuple[int, list[tuple[str, str, str]]]:
+        """Return (generation, [(id, title, type), ...]) for every indexed item.
+
+        Reads the index as it stands, re-scanning the directories only if
+        this process has not done so yet.
+        """
+        self.warm()
+        with self._lock, self._connection() as conn:
+            return self.generation, conn.execute(
+                "SELECT id, title, type FROM docs WHERE id IS NOT NULL ORDER BY doc"
+            ).fetchall()
+
+
+def _filter_sql(
+    tag: Optional[str],
+    item_type: Optional[str],
+    status: Optional[str],
+    epic_id: Optional[str],
+) -> tuple[str, list]:
+    """Return a WHERE clause over docs ``d`` for the search filters, and its params."""
+    where, params = ["d.id IS NOT NULL"], []
+    if item_type is not None:
+        where.append("d.type = ?")
+        params.append(item_type)
+    if status is not None:
+        where.append("d.status = ?")
+        params.append(status)
+    if tag is not None:
+        where.append("d.doc IN (SELECT doc FROM tags WHERE tag = ?)")
+        params.append(tag)
+    if epic_id is not None:
+        where.append(
+            "(d.epic_id = ? OR d.story_id IN "
+            "(SELECT id FROM docs WHERE type = 'story' AND epic_id = ?))"
+        )
+        params.extend([epic_id, epic_id])
+    return " AND ".join(where), params
+
+
+def _trigrams(needle: str) -> str:
+    """Return an FTS5 query requiring every trigram of needle, or "" if it is too short."""
+    grams = dict.fromkeys(needle[i:i + 3] for i in range(len(needle) - 2))
+    return " AND ".join('"' + gram.replace('"', '""') + '"' for gram in grams)
+
+
+def _has_grams(conn: sqlite3.Connection) -> bool:
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'grams'"
+    ).fetchone() is not None
+
+
+def _snippet(text: str, tokens: list[str]) -> str:
+    """Return ~100 characters of text around the first query token."""
+    lowered = text.lower()
+    positions = [i for i in (lowered.find(t) for t in tokens) if i >= 0]
+    idx = min(positions) if positions else 0
+    start = max(0, idx - 50)
+    end = min(len(lowered), idx + 50 + (len(tokens[0]) if tokens else 0))
+    return lowered[start:end].strip()
+
+
+_indexes: dict[str, SearchIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_search_index(project_dir: Path) -> SearchIndex:
+    """Return the process-wide SearchIndex for project_dir."""
+    key = str(project_dir)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None:
+            index = _indexes[key] = SearchIndex(project_dir)
+        return index
+
+
+def keyword_search(
+    query: str,
+    project_dir: Path,
+    top_k: int = 10,
+    tag: str | None = None,
+    item_type: str | None = None,
+    status: str | None = None,
+    epic_id: str | None = None,
+) -> list[SearchResult]:
+    """Rank epics, stories and tasks against query using the keyword index."""
+    return get_search_index(project_dir).search(
+        query, top_k=top_k, tag=tag, item_type=item_type, status=status, epic_id=epic_id
+    )
+
+
+def substring_search(
+    query: str,
+    project_dir: Path,
+    top_k: int = 10,
+    tag: str | None = None,
+    item_type: str | None = None,
+    status: str | None = None,
+    epic_id: str | None = None,
+) -> list[SearchResult]:
+    """Find epics, stories and tasks containing query as an exact substring."""
+    return get_search_index(project_dir).substring_search(
+        query, top_k=top_k, tag=tag, item_type=item_type, status=status, epic_id=epic_id
+    )
@@ -1,6 +1,7 @@
 """ProjectMan MCP server — FastMCP-based with stdio/SSE transport."""
 
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
@@ -11,7 +12,7 @@ from mcp.types import ToolAnnotations
 
 from .config import find_project_root, load_config
 from .event_bus import EventBus, NoOpEventBus
-from .indexer import build_index, write_index
+from .indexer import build_index, start_index_flusher, stop_index_flusher, write_index
 from .models import ChangesetStatus, ProjectIndex
 from .store import Store
 
@@ -68,6 +69,19 @@ def _store(project: Optional[str] = None) -> Store:
 
 def _emit_status_change(
     store: Store, item_id: str, old_status: str, new_status: str, meta: object
+) -> None:
+    """Emit the appropriate event(s) for a status change once it is on disk.
+
+    Inside a transaction the events wait for the flush and are dropped if
+    the transaction fails.
+    """
+    store.on_commit(
+        lambda: _publish_status_change(store, item_id, old_status, new_status, meta)
+    )
+
+
+def _publish_status_change(
+    store: Store, item_id: str, old_status: str, new_status: str, meta: object
 ) -> None:
     """Emit the appropriate event(s) for a status change."""
     from .models import TaskFrontmatter, StoryFrontmatter
@@ -412,71 +426,225 @@ def pm_active(
         return f"error: {e}"
 
 
+def _semantic_search(
+    proj_dir: Path, query_vec, filters: dict, top_k: int = 10
+) -> Optional[list[dict]]:
+    """Embedding search of one .project dir.
+
+    filters (tag, status, item_type, epic_id) are applied inside the
+    embedding store before ranking.  Returns None when nothing matched or
+    the dir has no readable embeddings, so the caller can fall back to
+    keyword search.
+    """
+    try:
+        from .embeddings import get_embedding_store
+
+        results = get_embedding_store(proj_dir).search_vector(
+            query_vec, top_k=top_k, **filters
+        )
+    except Exception:
+        return None
+    if not results:
+        return None
+    return [
+        {"id": r.id, "title": r.title, "type": r.type, "score": round(r.score, 3)}
+        for r in results
+    ]
+
+
+def _keyword_search(
+    query: str, proj_dir: Path, filters: dict, top_k: int = 10, substring: bool = False
+) -> list[dict]:
+    from .search import keyword_search, substring_search
+
+    search = substring_search if substring else keyword_search
+    return [
+        {
+            "id": r.id,
+            "title": r.title,
+            "type": r.type,
+            "score": r.score,
+            "snippet": r.snippet,
+        }
+        for r in search(query, proj_dir, top_k=top_k, **filters)
+    ]
+
+
+def _hybrid_search(
+    query: str, proj_dir: Path, query_vec, filters: dict, top_k: int = 10
+) -> list[dict]:
+    """Keyword and embedding search of one .project dir, fused by rank."""
+    from .hybrid import hybrid_search
+
+    hits = []
+    for r in hybrid_search(query, proj_dir, top_k=top_k, query_vec=query_vec, **filters):
+        hit = {"id": r.id, "title": r.title, "type": r.type, "score": r.score}
+        if r.snippet:
+            hit["snippet"] = r.snippet
+        hits.append(hit)
+    return hits
+
+
+def _embed_query(query: str):
+    """Return the query's embedding, or None if embeddings are unavailable."""
+    try:
+        from .embeddings import embed_query
+
+        return embed_query(query)
+    except Exception:
+        return None
+
+
+def _hub_project_dirs() -> Optional[list[tuple[str, Path]]]:
+    """Return (name, .project dir) for each hub subproject, or None outside a hub."""
+    root = find_project_root()
+    config = load_config(root)
+    if not config.hub:
+        return None
+    dirs = []
+    for name in config.projects:
+        pm_dir = root / ".project" / "projects" / name
+        if (pm_dir / "config.yaml").exists():
+            dirs.append((name, pm_dir))
+    return dirs
+
+
+def _federated_search(
+    query: str,
+    project_dirs: list[tuple[str, Path]],
+    filters: dict,
+    top_k: int = 10,
+    mode: str = "hybrid",
+) -> list[dict]:
+    """Search every hub subproject in parallel and merge the best top_k hits.
+
+    The query is embedded once and scored against each project's vectors.
+    In hybrid mode an exact item ID returns just that item.  In semantic
+    mode, semantic hits are used if any project has embeddings; otherwise
+    every project is keyword-searched.  Each hit records its project.
+    """
+    if not project_dirs:
+        return []
+    query_vec = _embed_query(query) if mode in ("hybrid", "semantic") else None
+
+    def exact(entry: tuple[str, Path]) -> Optional[list[dict]]:
+        from .hybrid import exact_match
+
+        try:
+            hit = exact_match(query, entry[1], **filters)
+        except Exception:
+            return None
+        if hit is None:
+            return None
+        return [{"id": hit.id, "title": hit.title, "type": hit.type, "score": hit.score}]
+
+    def hybrid(entry: tuple[str, Path]) -> Optional[list[dict]]:
+        try:
+            return _hybrid_search(query, entry[1], query_vec, filters, top_k)
+        except Exception:
+            return None  # one unreadable project should not fail the search
+
+    def semantic(entry: tuple[str, Path]) -> Optional[list[dict]]:
+        return _semantic_search(entry[1], query_vec, filters, top_k)
+
+    def keyword(entry: tuple[str, Path]) -> Optional[list[dict]]:
+        try:
+            return _keyword_search(
+                query, entry[1], filters, top_k, substring=mode == "substring"
+            )
+        except Exception:
+            return None
+
+    with ThreadPoolExecutor(max_workers=min(len(project_dirs), 16)) as pool:
+        per_project: list[Optional[list[dict]]] = [None] * len(project_dirs)
+        if mode == "hybrid":
+            per_project = list(pool.map(exact, project_dirs))
+            if all(hits is None for hits in per_project):
+                per_project = list(pool.map(hybrid, project_dirs))
+        else:
+            if mode == "semantic" and query_vec is not None:
+                per_project = list(pool.map(semantic, project_dirs))
+            if all(hits is None for hits in per_project):
+                per_project = list(pool.map(keyword, project_dirs))
+
+    merged = [
+        {"project": name, **hit}
+        for (name, _), hits in zip(project_dirs, per_project)
+        for hit in hits or []
+    ]
+    # Stable sort: equal scores keep hub registration order.
+    merged.sort(key=lambda hit: -hit["score"])
+    return merged[:top_k]
+
+
 @mcp.tool(
     title="Search Items",
     annotations=ToolAnnotations(title="Search Items", readOnlyHint=True),
 )
 def pm_search(
-    query: str, project: Optional[str] = None, tag: Optional[str] = None
+    query: str,
+    project: Optional[str] = None,
+    tag: Optional[str] = None,
+    status: Optional[str] = None,
+    item_type: Optional[str] = None,
+    epic_id: Optional[str] = None,
+    mode: str = "hybrid",
 ) -> str:
-    """Search stories and tasks by keyword or semantic similarity.
+    """Search stories and tasks by keyword and semantic similarity.
+
+    By default keyword and embedding rankings are fused (hybrid mode), and
+    a query that is an item ID returns just that item.  Filters are
+    applied before ranking, so up to 10 matching items are always
+    returned.  In hub mode with no project, every subproject is searched
+    in parallel and the merged top 10 hits each carry a "project" field.
 
     Args:
         query: Search query string
-        project: Optional project name (hub mode only)
+        project: Optional project name (hub mode only; omit to search all projects)
         tag: Optional tag to filter results (only items with this tag are returned)
+        status: Optional status to filter results (e.g. "todo", "active")
+        item_type: Optional item type to filter results: "story" or "task"
+        epic_id: Optional epic ID; only its stories and their tasks are returned
+        mode: "hybrid" (default), "semantic" (embeddings, falling back to
+            keywords when unavailable), "keyword", or "substring" (items
+            containing the query verbatim, e.g. a file path or error message)
     """
     try:
-        proj_dir = _resolve_project_dir(project)
-
-        # Try embeddings first, fall back to keyword
-        try:
-            from .embeddings import EmbeddingStore
-
-            emb_store = EmbeddingStore(proj_dir)
-            results = emb_store.search(query, top_k=10)
-            if results:
-                # Post-filter by tag if specified
-                if tag:
-                    store = Store(proj_dir)
-                    filtered = []
-                    for r in results:
-                        try:
-                            meta, _ = store.get(r.id)
-                            if tag in (meta.tags if hasattr(meta, "tags") else []):
-                                filtered.append(r)
-                        except Exception:
-                            pass
-                    results = filtered
+        if mode not in ("hybrid", "semantic", "keyword", "substring"):
+            return (
+                f"error: unknown mode '{mode}'. "
+                "Use: hybrid, semantic, keyword, or substring"
+            )
+        filters = {
+            key: value
+            for key, value in (
+                ("tag", tag), ("status", status), ("item_type", item_type), ("epic_id", epic_id)
+            )
+            if value
+        }
+        if not project:
+            project_dirs = _hub_project_dirs()
+            if project_dirs is not None:
                 return _yaml_dump(
-                    [
-                        {
-                            "id": r.id,
-                            "title": r.title,
-                            "type": r.type,
-                            "score": round(r.score, 3),
-                        }
-                        for r in results
-                    ]
+                    _federated_search(query, project_dirs, filters, mode=mode)
                 )
-        except (ImportError, Exception):
-            pass
 
-        from .search import keyword_search
+        proj_dir = _resolve_project_dir(project)
+        if mode == "hybrid":
+            return _yaml_dump(
+                _hybrid_search(query, proj_dir, _embed_query(query), filters)
+            )
 
-        results = keyword_search(query, proj_dir, tag=tag)
-        return _yaml_dump(
-            [
-                {
-                    "id": r.id,
-                    "title": r.title,
-                    "type": r.type,
-                    "score": r.score,
-                    "snippet": r.snippet,
-                }
-                for r in results
-            ]
-        )
+        # Try embeddings first, fall back to keyword
+        results = None
+        query_vec = _embed_query(query) if mode == "semantic" else None
+        if query_vec is not None:
+            results = _semantic_search(proj_dir, query_vec, filters)
+        if results is None:
+            results = _keyword_search(
+                query, proj_dir, filters, substring=mode == "substring"
+            )
+        return _yaml_dump(results)
     except Exception as e:
         return f"error: {e}"
 
@@ -500,118 +668,28 @@ def pm_board(
         limit: Max items per board group (default 10). Totals are always shown.
     """
     try:
-        from .readiness import check_readiness, compute_hints
-        from .deps import topological_sort
+        from .board import get_board
 
         store = _store(project)
-        all_tasks = store.list_tasks()
-
-        # Build a story lookup for priority ordering and context
-        story_cache = {}
-        for story in store.list_stories():
-            story_cache[story.id] = story
-
-        # Build topological position map per story for dependency-aware ordering
-        story_tasks: dict[str, list] = {}
-        for task in all_tasks:
-            story_tasks.setdefault(task.story_id, []).append(task)
-        topo_position: dict[str, int] = {}
-        for sid, tasks_in_story in story_tasks.items():
-            try:
-                sorted_tasks = topological_sort(tasks_in_story)
-            except Exception:
-                sorted_tasks = tasks_in_story
-            for idx, t in enumerate(sorted_tasks):
-                topo_position[t.id] = idx
-
-        available = []
-        not_ready = []
-        in_progress = []
-        in_review = []
-        blocked = []
-
-        for task in all_tasks:
-            _, task_body = store.get_task(task.id)
-            story = story_cache.get(task.story_id)
-            story_label = f"{story.id} — {story.title}" if story else task.story_id
-
-            if assignee and task.assignee != assignee:
-                continue
-
-            if tag:
-                task_has_tag = tag in task.tags
-                story_has_tag = story is not None and tag in story.tags
-                if not task_has_tag and not story_has_tag:
-                    continue
-
-            if task.status.value == "in-progress":
-                in_progress.append(
-                    {
-                        "id": task.id,
-                        "title": task.title,
-                        "points": task.points,
-                        "assignee": task.assignee,
-                        "story": story_label,
-                    }
-                )
-            elif task.status.value == "review":
-                in_review.append(
-                    {
-                        "id": task.id,
-                        "title": task.title,
-                        "points": task.points,
-                        "assignee": task.assignee,
-                        "story": story_label,
-                    }
-                )
-            elif task.status.value == "blocked":
-                blocked.append(
-                    {
-                        "id": task.id,
-                        "title": task.title,
-                        "points": task.points,
-                        "assignee": task.assignee,
-                        "story": story_label,
-                    }
-                )
-            elif task.status.value == "todo" and not assignee:
-                readiness = check_readiness(task, task_body, store)
-                if readiness["ready"]:
-                    hints = compute_hints(task, task_body)
-                    priority_order = {"must": 0, "should": 1, "could": 2, "wont": 3}
-                    story_priority = priority_order.get(
-                        story.priority.value if story else "should", 1
-                    )
-                    available.append(
-                        {
-                            "id": task.id,
-                            "title": task.title,
-                            "points": task.points,
-                            "story": story_label,
-                            "hints": hints,
-                            "_sort": (
-                                story_priority,
-                                task.story_id,
-                                topo_position.get(task.id, 0),
-                                task.points or 99,
-                            ),
-                        }
-                    )
-                else:
-                    not_ready.append(
-                        {
-                            "id": task.id,
-                            "title": task.title,
-                            "points": task.points,
-                            "story": story_label,
-                            "blockers": readiness["blockers"],
-                        }
-                    )
-
-        # Sort available tasks by priority > story > topological order > points
-        available.sort(key=lambda t: t["_sort"])
-        for t in available:
-            del t["_sort"]
+        columns = get_board(store).filtered(assignee=assignee, tag=tag)
+
+        def row(entry, *fields):
+            task = entry.task
+            data = {"id": task.id, "title": task.title, "points": task.points}
+            if "assignee" in fields:
+                data["assignee"] = task.assignee
+            data["story"] = entry.story_label
+            if "hints" in fields:
+                data["hints"] = entry.hints
+            if "blockers" in fields:
+                data["blockers"] = entry.blockers
+            return data
+
+        available = [row(e, "hints") for e in columns["available"]]
+        not_ready = [row(e, "blockers") for e in columns["not_ready"]]
+        in_progress = [row(e, "assignee") for e in columns["in_progress"]]
+        in_review = [row(e, "assignee") for e in columns["in_review"]]
+        blocked = [row(e, "assignee") for e in columns["blocked"]]
 
         result = {
             "board": {
@@ -675,6 +753,73 @@ def pm_burndown(project: Optional[str] = None) -> str:
         return f"error: {e}"
 
 
+@mcp.tool(
+    title="Schedule Plan",
+    annotations=ToolAnnotations(title="Schedule Plan", readOnlyHint=True),
+)
+def pm_schedule(
+    agents: int = 4,
+    limit: int = 20,
+    compare: bool = False,
+    project: Optional[str] = None,
+) -> str:
+    """Plan the remaining tasks for parallel agents — critical path, earliest starts and a schedule.
+
+    Times are in points.  The scaling rows compare the makespan for 1 agent
+    and the whole fleet (plus half the fleet with compare); parallelism
+    (total points over the critical path) is the most speedup any number of
+    agents can give.
+
+    Args:
+        agents: Number of agents working in parallel (default 4)
+        limit: Max scheduled tasks to list, in start order (default 20). Totals are always shown.
+        compare: Also simulate half the fleet for the scaling rows (default false)
+        project: Optional project name (hub mode only)
+    """
+    try:
+        from .schedule import plan_schedule
+
+        store = _store(project)
+        plan = plan_schedule(
+            store.list_tasks(), store.list_stories(), agents, compare=compare
+        )
+        points = {task.id: task.points for task in plan.tasks}
+        result = {
+            "summary": {
+                "agents": plan.agents,
+                "tasks": len(plan.tasks),
+                "total_points": plan.total_points,
+                "critical_path_points": plan.critical_path_points,
+                "parallelism": round(plan.parallelism, 2),
+                "makespan": plan.makespan,
+            },
+            "critical_path": [
+                {"id": task_id, "points": points[task_id]} for task_id in plan.critical_path
+            ],
+            "scaling": plan.scaling,
+            "schedule": [
+                {
+                    "id": task.id,
+                    "agent": task.agent,
+                    "start": task.start,
+                    "finish": task.finish,
+                    "earliest_start": task.earliest_start,
+                    "slack": task.slack,
+                }
+                for task in plan.tasks[:limit]
+            ],
+            "limit": limit,
+        }
+        if plan.unestimated:
+            result["unestimated"] = {
+                "count": len(plan.unestimated),
+                "ids": plan.unestimated[:limit],
+            }
+        return _yaml_dump(result)
+    except Exception as e:
+        return f"error: {e}"
+
+
 # ─── Write Tools ────────────────────────────────────────────────
 
 
@@ -717,18 +862,19 @@ def pm_create_story(
         )
         tag_list = [t.strip() for t in tags.split(",")] if tags else None
         dep_list = [d.strip() for d in depends_on.split(",")] if depends_on else None
-        meta, test_tasks = store.create_story(
-            title,
-            description,
-            priority,
-            points,
-            tags=tag_list,
-            acceptance_criteria=ac_list,
-            depends_on=dep_list,
-        )
-        if epic_id:
-            store.update(meta.id, epic_id=epic_id)
-            meta, _ = store.get_story(meta.id)
+        with store.transaction():
+            meta, test_tasks = store.create_story(
+                title,
+                description,
+                priority,
+                points,
+                tags=tag_list,
+                acceptance_criteria=ac_list,
+                depends_on=dep_list,
+            )
+            if epic_id:
+                store.update(meta.id, epic_id=epic_id)
+                meta, _ = store.get_story(meta.id)
         write_index(store)
         # Echo identity + non-empty settable fields, not the full object
         dumped = meta.model_dump(mode="json")
@@ -809,7 +955,7 @@ def pm_epic(
         meta, body = store.get_epic(id)
 
         # Find linked stories — compute rollup from ALL, paginate the detail list
-        linked_stories = [s for s in store.list_stories() if s.epic_id == id]
+        linked_stories = store.list_stories(epic_id=id)
         story_data = []
         total_points = 0
         completed_points = 0
@@ -1191,32 +1337,38 @@ def _do_grab(store, task_id: str, assignee: str, include_story: bool) -> dict:
 
     Returns a dict — either {"error", "blockers"} or {"grabbed": {...}}.
     """
-    from .readiness import check_readiness
+    from .leases import claim
 
-    task_meta, task_body = store.get_task(task_id)
+    task_meta, _ = store.get_task(task_id)
 
-    # Validate readiness (re-claiming your own task is idempotent)
-    readiness = check_readiness(task_meta, task_body, store, reclaim_for=assignee)
+    # Validate readiness and take the lease (re-claiming your own task is
+    # idempotent; a task whose lease expired can be taken over)
+    readiness = claim(store, task_id, assignee)
     if not readiness["ready"]:
         return {
             "error": "task is not ready to grab",
             "blockers": readiness["blockers"],
         }
 
-    # Claim: set assignee and status
+    # Claim: set assignee and status (the caller rebuilds the index once when
+    # this runs inside a transaction)
     old_status = task_meta.status.value
-    store.update(task_id, assignee=assignee, status="in-progress")
-    write_index(store)
+    try:
+        store.update(task_id, assignee=assignee, status="in-progress")
+    except Exception:
+        if not store.in_transaction:
+            store.release_lease(task_id)
+        raise
+    if not store.in_transaction:
+        write_index(store)
     if old_status != "in-progress":
-        _emit(
-            "task.status_update",
-            {
-                "taskId": task_id,
-                "oldStatus": old_status,
-                "newStatus": "in-progress",
-                "storyId": task_meta.story_id,
-            },
-        )
+        event = {
+            "taskId": task_id,
+            "oldStatus": old_status,
+            "newStatus": "in-progress",
+            "storyId": task_meta.story_id,
+        }
+        store.on_commit(lambda: _emit("task.status_update", event))
 
     # Re-read updated task
     task_meta, task_body = store.get_task(task_id)
@@ -1292,6 +1444,7 @@ def _do_grab(store, task_id: str, assignee: str, include_story: bool) -> dict:
             "sibling_tasks_done": len(all_siblings) - len(open_siblings),
             "dependency_status": dependency_status,
             "warnings": readiness["warnings"],
+            "lease": readiness["lease"].to_dict(),
         },
     }
 
@@ -1312,6 +1465,8 @@ def pm_grab(
 
     Re-claiming a task already assigned to the same assignee (e.g. pre-claimed
     by an orchestrator via pm_done_next) succeeds and returns the same payload.
+    The claim holds a lease that expires unless renewed with pm_heartbeat;
+    another assignee may take over a task whose lease has expired.
 
     Args:
         task_id: Task ID to claim (e.g. US-PRJ-1-1)
@@ -1326,6 +1481,105 @@ def pm_grab(
         return f"error: {e}"
 
 
+@mcp.tool(
+    title="Grab Task Batch",
+    annotations=ToolAnnotations(
+        title="Grab Task Batch", readOnlyHint=False, destructiveHint=False
+    ),
+)
+def pm_grab_batch(
+    n: int,
+    assignees: str = "claude",
+    project: Optional[str] = None,
+) -> str:
+    """Claim up to n ready tasks at once for parallel agents — use this instead of pm_board + n pm_grab calls.
+
+    Picks tasks with no dependencies on each other, from different stories
+    where possible, and claims them all in one write with one index rebuild.
+    Each task comes with its body and lease; story titles are listed once.
+    Agents grab their task again with pm_grab for the full context.
+
+    Args:
+        n: Number of tasks to claim
+        assignees: Comma-separated agent names, one per task in order, or a single name for all (default "claude")
+        project: Optional project name (hub mode only)
+    """
+    try:
+        store = _store(project)
+        names = [a.strip() for a in assignees.split(",") if a.strip()]
+        grabbed = store.grab_batch(n, names)
+        write_index(store)
+
+        bodies = store.read_bodies("tasks", [task.id for task, _ in grabbed])
+        story_titles = {story.id: story.title for story in store.list_stories()}
+        tasks = []
+        stories = {}
+        for task, lease in grabbed:
+            _emit(
+                "task.status_update",
+                {
+                    "taskId": task.id,
+                    "oldStatus": "todo",
+                    "newStatus": "in-progress",
+                    "storyId": task.story_id,
+                },
+            )
+            stories[task.story_id] = story_titles.get(task.story_id)
+            entry = {
+                "id": task.id,
+                "title": task.title,
+                "points": task.points,
+                "story_id": task.story_id,
+                "assignee": task.assignee,
+                "lease": lease.to_dict(),
+                "body": bodies.get(task.id, ""),
+            }
+            if task.depends_on:
+                entry["depends_on"] = task.depends_on
+            tasks.append(entry)
+
+        result = {"grabbed": tasks, "stories": stories}
+        if len(tasks) < n:
+            result["note"] = f"only {len(tasks)} of {n} tasks were ready to grab"
+        return _yaml_dump(result)
+    except Exception as e:
+        return f"error: {e}"
+
+
+@mcp.tool(
+    title="Renew Task Claim",
+    annotations=ToolAnnotations(
+        title="Renew Task Claim", readOnlyHint=False, destructiveHint=False
+    ),
+)
+def pm_heartbeat(
+    task_id: str,
+    assignee: str = "claude",
+    project: Optional[str] = None,
+) -> str:
+    """Renew the lease on a grabbed task so it is not reclaimed — call periodically during long tasks.
+
+    Args:
+        task_id: Task ID held by assignee (e.g. US-PRJ-1-1)
+        assignee: Who holds the task (default "claude")
+        project: Optional project name (hub mode only)
+    """
+    try:
+        store = _store(project)
+        task_meta, _ = store.get_task(task_id)
+        if task_meta.status.value != "in-progress" or task_meta.assignee != assignee:
+            return (
+                f"error: {task_id} is not in progress for '{assignee}' "
+                f"(status '{task_meta.status.value}', assignee '{task_meta.assignee}')"
+            )
+        acquired, lease = store.acquire_lease(task_id, assignee)
+        if not acquired:
+            return f"error: {task_id} was taken over by '{lease.assignee}'"
+        return _yaml_dump({"task_id": task_id, "lease": lease.to_dict()})
+    except Exception as e:
+        return f"error: {e}"
+
+
 @mcp.tool(
     title="Complete Task & Grab Next",
     annotations=ToolAnnotations(
@@ -1356,86 +1610,61 @@ def pm_done_next(
         project: Optional project name (hub mode only)
     """
     try:
-        from .deps import topological_sort
-        from .readiness import check_readiness
+        from .leases import reclaim_expired
+        from .ready_queue import get_ready_queue
 
         store = _store(project)
         task_meta, _ = store.get_task(task_id)
         story_id = task_meta.story_id
         old_status = task_meta.status.value
 
-        # 1. Complete the task (+ run log when a note is given)
-        kwargs = {"status": "done"}
-        if note is not None:
-            kwargs["outcome"] = outcome
-            kwargs["note"] = note
-        meta = store.update(task_id, **kwargs)
-        write_index(store)
-        if old_status != "done":
-            _emit_status_change(store, task_id, old_status, "done", meta)
-
-        result = {"completed": {"id": task_id, "status": "done"}}
-        if note is not None:
-            result["completed"]["run_log"] = outcome
-
-        # 2. Close the parent story if this was its last open task
-        siblings = store.list_tasks(story_id=story_id)
-        open_siblings = [s for s in siblings if s.status.value != "done"]
-        if not open_siblings:
-            try:
-                story_meta, _ = store.get_story(story_id)
-                if story_meta.status.value not in ("done", "archived"):
-                    old_story_status = story_meta.status.value
-                    story_meta = store.update(story_id, status="done")
-                    write_index(store)
-                    _emit_status_change(
-                        store, story_id, old_story_status, "done", story_meta
-                    )
-                result["story_closed"] = story_id
-            except Exception as e:
-                result["story_close_error"] = str(e)
-
-        # 3. Pick the next ready task: same story first (topological order),
-        # then other stories by priority > story > topological order > points
-        all_tasks = store.list_tasks()
-        story_priority = {}
-        priority_order = {"must": 0, "should": 1, "could": 2, "wont": 3}
-        for s in store.list_stories():
-            story_priority[s.id] = priority_order.get(s.priority.value, 1)
-
-        story_tasks: dict[str, list] = {}
-        for t in all_tasks:
-            story_tasks.setdefault(t.story_id, []).append(t)
-        topo_position: dict[str, int] = {}
-        for sid, tasks_in_story in story_tasks.items():
-            try:
-                sorted_tasks = topological_sort(tasks_in_story)
-            except Exception:
-                sorted_tasks = tasks_in_story
-            for idx, t in enumerate(sorted_tasks):
-                topo_position[t.id] = idx
-
-        candidates = [
-            t for t in all_tasks if t.status.value == "todo" and not t.assignee
-        ]
-        if same_story_only:
-            candidates = [t for t in candidates if t.story_id == story_id]
-        candidates.sort(
-            key=lambda t: (
-                t.story_id != story_id,  # same story first
-                story_priority.get(t.story_id, 1),
-                t.story_id,
-                topo_position.get(t.id, 0),
-                t.points or 99,
-            )
-        )
-
-        # Readiness-check candidates lazily until one is grabbable
-        next_grab = None
-        not_ready_count = 0
-        for candidate in candidates:
-            _, cand_body = store.get_task(candidate.id)
-            if check_readiness(candidate, cand_body, store)["ready"]:
+        # Put tasks whose claim lapsed back in the pool before picking
+        if reclaim_expired(store):
+            write_index(store)
+
+        # Completion, story close and the next claim are flushed together:
+        # one write pass, one log batch, one auto-commit, one index rebuild.
+        with store.transaction():
+            # 1. Complete the task (+ run log when a note is given)
+            kwargs = {"status": "done"}
+            if note is not None:
+                kwargs["outcome"] = outcome
+                kwargs["note"] = note
+            meta = store.update(task_id, **kwargs)
+            if old_status != "done":
+                _emit_status_change(store, task_id, old_status, "done", meta)
+
+            result = {"completed": {"id": task_id, "status": "done"}}
+            if note is not None:
+                result["completed"]["run_log"] = outcome
+
+            # 2. Close the parent story if this was its last open task
+            siblings = store.list_tasks(story_id=story_id)
+            open_siblings = [s for s in siblings if s.status.value != "done"]
+            if not open_siblings:
+                try:
+                    story_meta, _ = store.get_story(story_id)
+                    if story_meta.status.value not in ("done", "archived"):
+                        old_story_status = story_meta.status.value
+                        story_meta = store.update(story_id, status="done")
+                        _emit_status_change(
+                            store, story_id, old_story_status, "done", story_meta
+                        )
+                    result["story_closed"] = story_id
+                except Exception as e:
+                    result["story_close_error"] = str(e)
+
+            # 3. Pick the next ready task: same story first (topological order),
+            # then other stories by priority > story > topological order > points
+            queue = get_ready_queue(store)
+            next_grab = None
+            skipped: set[str] = set()
+            while True:
+                candidate = queue.next(
+                    story_id, same_story_only=same_story_only, skip=skipped
+                )
+                if candidate is None:
+                    break
                 grab = _do_grab(
                     store,
                     candidate.id,
@@ -1445,18 +1674,26 @@ def pm_done_next(
                 if "grabbed" in grab:
                     next_grab = grab["grabbed"]
                     break
-                not_ready_count += 1
-            else:
-                not_ready_count += 1
+                skipped.add(candidate.id)
+        write_index(store)
 
         if next_grab:
             result["next"] = next_grab
         else:
             scope_note = "in this story" if same_story_only else "in this project"
+            todo = [
+                t
+                for t in store.list_tasks(
+                    story_id=story_id if same_story_only else None, status="todo"
+                )
+                if not t.assignee
+            ]
+            # Ready tasks that failed to grab (e.g. leased elsewhere) are not blocked
+            blocked = len(todo) - queue.count(story_id if same_story_only else None)
             result["next"] = None
             result["next_info"] = (
                 f"no ready unassigned tasks {scope_note} "
-                f"({len(candidates)} todo, {not_ready_count} blocked — see pm_board)"
+                f"({len(todo)} todo, {blocked} blocked — see pm_board)"
             )
         return _yaml_dump(result)
     except Exception as e:
@@ -1811,15 +2048,15 @@ def pm_reindex(project: Optional[str] = None) -> str:
     """
     try:
         store = _store(project)
-        write_index(store)
+        write_index(store, immediate=True)
 
         # Try to reindex embeddings too
         try:
-            from .embeddings import EmbeddingStore
+            from .embeddings import get_embedding_store
 
-            emb = EmbeddingStore(store.project_dir)
-            emb.reindex_all(store)
-            return "reindexed: index.yaml + embeddings"
+            emb = get_embedding_store(store.project_dir)
+            updated = emb.reindex_all(store)
+            return f"reindexed: index.yaml + embeddings ({updated} updated)"
         except (ImportError, Exception):
             return "reindexed: index.yaml (embeddings not available)"
     except Exception as e:
@@ -2817,7 +3054,11 @@ def pm_run_log(
 
 
 def run_server(
-    transport: str = "stdio", host: str = "127.0.0.1", port: int = 22001
+    transport: str = "stdio",
+    host: str = "127.0.0.1",
+    port: int = 22001,
+    index_flush_interval: float = 0.0,
+    preload_embeddings: bool = False,
 ) -> None:
     """Run the MCP server with the specified transport.
 
@@ -2825,6 +3066,12 @@ def run_server(
         transport: "stdio" or "sse"
         host: Host to bind to (SSE mode only)
         port: Port to bind to (SSE mode only)
+        index_flush_interval: If positive, tools only mark the index dirty and
+            a background thread rewrites it at most once per this many
+            seconds.  A final flush runs on shutdown.
+        preload_embeddings: If true, load the shared embedding model in a
+            background thread at startup so the first search or write does
+            not pay for it.
     """
     global _event_bus
 
@@ -2851,4 +3098,17 @@ def run_server(
         web_app.state.store = Store(root)
         mcp._custom_starlette_routes.append(Mount("/", app=web_app))
 
-    mcp.run(transport=transport)
+    if preload_embeddings:
+        try:
+            from .embeddings import preload_model
+
+            preload_model()
+        except ImportError:
+            pass
+
+    if index_flush_interval > 0:
+        start_index_flusher(index_flush_interval)
+    try:
+        mcp.run(transport=transport)
+    finally:
+        stop_index_flusher()
@@ -0,0 +1,131 @@
+"""Persistent snapshot of parsed item files for fast cold starts.
+
+Every ``projectman serve`` process starts with an empty in-memory cache.
+The snapshot stores the parsed frontmatter of each epic, story and task as
+JSON in SQLite, keyed by item type and file name together with the file's
+(inode, size, mtime_ns) fingerprint.  Bodies are not stored; the Store
+loads them lazily.  A fresh Store restores the
+rows and only re-parses files whose fingerprint no longer matches.
+
+The database lives in ``.project/.cache/``, which carries its own
+``.gitignore`` so it is never picked up by ``git add .project``.
+"""
+
+import logging
+import sqlite3
+from pathlib import Path
+from typing import Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bump when the row layout or the stored frontmatter shape changes; a
+# mismatch drops the table so stale rows are never restored.
+SNAPSHOT_VERSION = 2
+
+Fingerprint = tuple[int, int, int]
+SnapshotRow = tuple[Fingerprint, Optional[str], Optional[str]]
+
+
+class Snapshot:
+    """SQLite-backed snapshot of parsed items for one project directory.
+
+    Rows are ``(fingerprint, item_id, meta_json)``; item_id and
+    meta_json are None for files that are known but not cached (archived
+    or malformed).  All failures are logged and swallowed — the snapshot
+    is only an accelerator and the markdown files remain the source of truth.
+    """
+
+    def __init__(self, project_dir: Path):
+        self.cache_dir = project_dir / ".cache"
+        self.db_path = self.cache_dir / "snapshot.db"
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            self._init_db()
+        return sqlite3.connect(str(self.db_path), timeout=5)
+
+    def _init_db(self) -> None:
+        if not self.cache_dir.parent.is_dir():
+            raise FileNotFoundError(f"Project directory not found: {self.cache_dir.parent}")
+        self.cache_dir.mkdir(exist_ok=True)
+        gitignore = self.cache_dir / ".gitignore"
+        if not gitignore.exists():
+            gitignore.write_text("*\n")
+        conn = sqlite3.connect(str(self.db_path), timeout=5)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != SNAPSHOT_VERSION:
+                conn.execute("DROP TABLE IF EXISTS files")
+                conn.execute(f"PRAGMA user_version = {SNAPSHOT_VERSION}")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS files (
+                    item_type TEXT,
+                    name TEXT,
+                    ino INTEGER,
+                    size INTEGER,
+                    mtime_ns INTEGER,
+                    item_id TEXT,
+                    meta TEXT,
+                    PRIMARY KEY (item_type, name)
+                )
+            """)
+            conn.commit()
+        finally:
+            conn.close()
+        self._initialized = True
+
+    def load(self, item_type: str) -> dict[str, SnapshotRow]:
+        """Return {file name: row} for item_type, or {} if unavailable."""
+        if not self.db_path.exists():
+            return {}
+        try:
+            conn = self._connect()
+            try:
+                rows = conn.execute(
+                    "SELECT name, ino, size, mtime_ns, item_id, meta "
+                    "FROM files WHERE item_type = ?",
+                    (item_type,),
+                ).fetchall()
+            finally:
+                conn.close()
+        except (sqlite3.Error, OSError) as e:
+            logger.debug("snapshot load failed for %s: %s", item_type, e)
+            return {}
+        return {
+            name: ((ino, size, mtime_ns), item_id, meta)
+            for name, ino, size, mtime_ns, item_id, meta in rows
+        }
+
+    def save(
+        self,
+        item_type: str,
+        rows: dict[str, SnapshotRow],
+        removed: Iterable[str] = (),
+    ) -> None:
+        """Upsert *rows* and delete *removed* file names in one transaction."""
+        removed = list(removed)
+        if not rows and not removed:
+            return
+        try:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO files "
+                        "(item_type, name, ino, size, mtime_ns, item_id, meta) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        [
+                            (item_type, name, *fp, item_id, meta)
+                            for name, (fp, item_id, meta) in rows.items()
+                        ],
+                    )
+                    conn.executemany(
+                        "DELETE FROM files WHERE item_type = ? AND name = ?",
+                        [(item_type, name) for name in removed],
+                    )
+            finally:
+                conn.close()
+        except (sqlite3.Error, OSError) as e:
+            logger.debug("snapshot save failed for %s: %s", item_type, e)
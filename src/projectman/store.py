@@ -1,37 +1,273 @@
-"""CRUD operations for stories and tasks via python-frontmatter."""
+"""CRUD operations for stories and tasks stored as frontmatter markdown."""
 
+import itertools
 import logging
 import os
 import subprocess
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+from contextlib import contextmanager
 from datetime import date, datetime, timezone
 from pathlib import Path
-from typing import Optional
-
-import frontmatter
+from typing import Callable, Iterable, Iterator, Optional, Sequence
 
 import yaml
 
-from projectman.deps import detect_cycle
+from projectman.deps import DependencyGraph
+from projectman.frontmatter_io import dump_post, parse_post, read_meta, read_post
+from projectman.leases import Lease, LeaseTable
+from projectman.snapshot import Snapshot
 
 logger = logging.getLogger(__name__)
 
-# Module-level cache: keyed by (base_dir, item_type) where item_type is
-# "stories", "tasks", or "epics".  Values are lists of (frontmatter, body)
-# tuples.  Populated on first list call; get methods extract from here first.
-_cache: dict[tuple[str, str], list[tuple]] = {}
 
-# Track when each cache entry was last populated (mtime of newest file at populate time)
-_cache_mtimes: dict[tuple[str, str], tuple[float, int]] = {}
+# Source of _ItemCache.generation values.
+_generations = itertools.count(1)
+
+# Number of recent puts and removes each _ItemCache remembers for
+# changed_since(); older changes are dropped half a log at a time.
+CHANGE_LOG_SIZE = 4096
+
+
+class _ItemCache:
+    """Cached frontmatter for one item type, keyed by ID.
+
+    Alongside the ID map it maintains secondary indexes on story_id, status,
+    epic_id, tags and assignee so that filtered lookups cost O(result) rather
+    than a scan of every item.  Iteration yields entries in file-name order.
+    """
+
+    INDEXED_FIELDS = ("story_id", "status", "epic_id", "tags", "assignee")
+
+    def __init__(self) -> None:
+        # Drawn from a process-wide counter on creation and on every change,
+        # so a value is never reused, even by a cache that replaces this one.
+        self.generation = next(_generations)
+        # (generation, item_id) per put/remove after _changes_floor.
+        self._changes: list[tuple[int, str]] = []
+        self._changes_floor = self.generation
+        self._entries: dict[str, object] = {}
+        self._names: dict[str, str] = {}
+        self._indexes: dict[str, dict[str, set[str]]] = {
+            field: {} for field in self.INDEXED_FIELDS
+        }
+        self._order: Optional[list[str]] = None
+        self._rank: Optional[dict[str, int]] = None
+
+    @staticmethod
+    def _index_values(meta, field: str) -> list[str]:
+        value = getattr(meta, field, None)
+        if value is None:
+            return []
+        if field == "tags":
+            return list(value)
+        return [value.value if hasattr(value, "value") else value]
+
+    def put(self, meta, name: str) -> None:
+        """Insert or replace the entry for meta.id, backed by file *name*."""
+        item_id = meta.id
+        if item_id in self._entries:
+            self._unindex(item_id)
+        if self._names.get(item_id) != name:
+            self._order = self._rank = None
+        self._entries[item_id] = meta
+        self._names[item_id] = name
+        self._log_change(item_id)
+        for field in self.INDEXED_FIELDS:
+            for value in self._index_values(meta, field):
+                self._indexes[field].setdefault(value, set()).add(item_id)
+
+    def remove(self, item_id: str) -> None:
+        """Drop the entry for item_id if present."""
+        if item_id not in self._entries:
+            return
+        self._unindex(item_id)
+        del self._entries[item_id]
+        del self._names[item_id]
+        self._order = self._rank = None
+        self._log_change(item_id)
+
+    def _log_change(self, item_id: str) -> None:
+        self.generation = next(_generations)
+        self._changes.append((self.generation, item_id))
+        if len(self._changes) > CHANGE_LOG_SIZE:
+            drop = len(self._changes) // 2
+            self._changes_floor = self._changes[drop - 1][0]
+            del self._changes[:drop]
+
+    def changed_since(self, generation: int) -> Optional[set[str]]:
+        """Return the IDs put or removed after generation.
+
+        Returns None when the change log does not reach back that far,
+        including for a generation taken from a different cache.
+        """
+        if generation < self._changes_floor:
+            return None
+        start = bisect_left(self._changes, (generation + 1,))
+        return {item_id for _, item_id in self._changes[start:]}
+
+    def _unindex(self, item_id: str) -> None:
+        meta = self._entries[item_id]
+        for field in self.INDEXED_FIELDS:
+            index = self._indexes[field]
+            for value in self._index_values(meta, field):
+                ids = index.get(value)
+                if ids is not None:
+                    ids.discard(item_id)
+                    if not ids:
+                        del index[value]
+
+    def get(self, item_id: str):
+        """Return the frontmatter for item_id, or None."""
+        return self._entries.get(item_id)
+
+    def _ordered_ids(self) -> list[str]:
+        if self._order is None:
+            self._order = sorted(self._entries, key=self._names.__getitem__)
+            self._rank = {item_id: i for i, item_id in enumerate(self._order)}
+        return self._order
+
+    def select(self, **filters) -> list:
+        """Return frontmatter matching every non-None filter, in file-name order.
+
+        Filter keys are names from INDEXED_FIELDS (``tags`` matches items
+        carrying that tag).  With no filters all entries are returned.
+        """
+        order = self._ordered_ids()
+        candidates: Optional[set[str]] = None
+        for field, value in filters.items():
+            if value is None:
+                continue
+            ids = self._indexes[field].get(value, set())
+            candidates = ids if candidates is None else candidates & ids
+            if not candidates:
+                return []
+        if candidates is None:
+            return [self._entries[item_id] for item_id in order]
+        return [
+            self._entries[item_id]
+            for item_id in sorted(candidates, key=self._rank.__getitem__)
+        ]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._entries
+
+    def __iter__(self):
+        return iter(self.select())
+
+
+class _BodyCache:
+    """Bounded LRU of item bodies, keyed by (base_dir, item_type, item_id).
+
+    List paths only parse frontmatter; bodies are read on demand by get_*
+    and kept here so repeated reads of the same items stay in memory.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._bodies: OrderedDict[tuple[str, str, str], str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[str, str, str]) -> Optional[str]:
+        with self._lock:
+            body = self._bodies.get(key)
+            if body is not None:
+                self._bodies.move_to_end(key)
+            return body
+
+    def put(self, key: tuple[str, str, str], body: str) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._bodies[key] = body
+            self._bodies.move_to_end(key)
+            while len(self._bodies) > self.maxsize:
+                self._bodies.popitem(last=False)
+
+    def discard(self, key: tuple[str, str, str]) -> None:
+        with self._lock:
+            self._bodies.pop(key, None)
+
+    def discard_type(self, cache_key: tuple[str, str]) -> None:
+        """Drop every body belonging to one (base_dir, item_type) cache key."""
+        with self._lock:
+            for key in [k for k in self._bodies if k[:2] == cache_key]:
+                del self._bodies[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._bodies.clear()
+
+    def __len__(self) -> int:
+        return len(self._bodies)
+
+
+# Module-level cache: keyed by (base_dir, item_type) where item_type is
+# "stories", "tasks", or "epics".  Values are _ItemCache instances holding
+# frontmatter by ID.  Populated on first list call; get methods extract
+# from here first and load bodies lazily through _body_cache.
+_cache: dict[tuple[str, str], _ItemCache] = {}
+
+# Recently used item bodies.  Size is set by PROJECTMAN_BODY_CACHE_SIZE.
+_body_cache = _BodyCache(int(os.environ.get("PROJECTMAN_BODY_CACHE_SIZE", "256")))
+
+# Per-file fingerprints for each cache entry: file name -> (fingerprint, item_id).
+# A fingerprint is (inode, size, mtime_ns); item_id is None for files that are
+# not held in the cache (malformed or archived).  Lets a refresh re-parse only
+# the files that were added or changed since the last look.
+_cache_fingerprints: dict[
+    tuple[str, str], dict[str, tuple[tuple[int, int, int], Optional[str]]]
+] = {}
 
 # Cache statistics — only tracked when PROJECTMAN_CACHE_DEBUG is set.
 _cache_stats: dict[str, int] = {"hits": 0, "misses": 0, "invalidations": 0}
 _cache_debug: bool = bool(os.environ.get("PROJECTMAN_CACHE_DEBUG"))
 
+# Parsed frontmatter for files the cache does not hold (archived or malformed),
+# keyed like _cache_fingerprints: file name -> (fingerprint, frontmatter or None).
+# Only the index reads these, and re-parses a file only when it changes.
+_uncached_meta: dict[tuple[str, str], dict[str, tuple[tuple[int, int, int], object]]] = {}
+
+# Persist parsed items to .project/.cache/snapshot.db so new processes can
+# skip re-parsing unchanged files.  Set PROJECTMAN_NO_SNAPSHOT to disable.
+_snapshot_enabled: bool = not os.environ.get("PROJECTMAN_NO_SNAPSHOT")
+
+
+# Project-wide dependency graphs kept in step with the caches by
+# Store.dependency_graph(): project dir -> (graph, stories generation,
+# tasks generation).
+_graphs: dict[str, tuple[DependencyGraph, int, int]] = {}
+_graphs_lock = threading.Lock()
+
+# One lock per project dir over that project's entries in the caches above.
+# A transaction holds it from its first staged write until the flush has
+# published them, so other threads wait rather than see items that are not
+# on disk yet.  Code that holds another lock while reading the caches must
+# take this one first (see Store.cache_lock).
+_cache_locks: dict[str, threading.RLock] = {}
+_cache_locks_lock = threading.Lock()
+
+
+def _cache_lock_for(project_dir: Path) -> threading.RLock:
+    """Return the cache lock shared by every Store of project_dir."""
+    with _cache_locks_lock:
+        lock = _cache_locks.get(str(project_dir))
+        if lock is None:
+            lock = _cache_locks[str(project_dir)] = threading.RLock()
+        return lock
+
 
 def clear_all_caches() -> None:
     """Clear the entire module-level cache and reset stats."""
     _cache.clear()
-    _cache_mtimes.clear()
+    _cache_fingerprints.clear()
+    _body_cache.clear()
+    _uncached_meta.clear()
+    _graphs.clear()
     _cache_stats["hits"] = 0
     _cache_stats["misses"] = 0
     _cache_stats["invalidations"] = 0
@@ -66,6 +302,38 @@ from .models import (
 )
 
 
+# Cache item type -> item type used by the keyword search index.
+_SEARCH_TYPES = {"epics": "epic", "stories": "story", "tasks": "task"}
+
+
+class _Transaction:
+    """Mutations staged by Store.transaction() until the block exits."""
+
+    def __init__(self, actor: str) -> None:
+        self.actor = actor
+        # Item file path -> staged text; reads of these paths see this text.
+        self.files: dict[Path, str] = {}
+        # (item_type, item_id) -> (frontmatter, cached) for fingerprint/snapshot
+        # bookkeeping once the files exist.
+        self.cache_records: dict[tuple[str, str], tuple[object, bool]] = {}
+        self.log_entries: list[LogEntry] = []
+        self.run_logs: list[tuple[str, RunLogEntry]] = []
+        self.embeddings: dict[str, tuple[str, str, str, object]] = {}
+        # (item_type, item_id) -> (frontmatter, body) for the keyword index.
+        self.search_docs: dict[tuple[str, str], tuple[object, str]] = {}
+        self.cycle_checks: set[str] = set()
+        # Leases taken inside the block (released if it fails), and task ID
+        # -> assignee whose lease to keep for releases deferred to the flush.
+        self.leases: list[Lease] = []
+        self.lease_releases: dict[str, Optional[str]] = {}
+        self.commit_files: list[Path] = []
+        self.commit_messages: list[str] = []
+        # The Store's cache lock once the block has staged a write.
+        self.lock: Optional[threading.RLock] = None
+        # Run after a successful flush, e.g. to publish events.
+        self.on_commit: list[Callable[[], None]] = []
+
+
 class Store:
     """File-backed store for stories and tasks."""
 
@@ -78,6 +346,10 @@ class Store:
         self.tasks_dir = self.project_dir / "tasks"
         self.epics_dir = self.project_dir / "epics"
         self.config = load_config(root) if project_dir is None else self._load_config()
+        self._snapshot = Snapshot(self.project_dir) if _snapshot_enabled else None
+        self._leases = LeaseTable(self.project_dir)
+        self._local = threading.local()
+        self._cache_lock = _cache_lock_for(self.project_dir)
 
     def _load_config(self) -> ProjectConfig:
         """Load config.yaml from self.project_dir."""
@@ -126,13 +398,167 @@ class Store:
         parts = item_id.split("-")
         return len(parts) >= 3 and parts[-1].isdigit() and parts[-2].isdigit()
 
+    # ─── Transactions ────────────────────────────────────────────
+
+    @property
+    def _txn(self) -> Optional[_Transaction]:
+        return getattr(self._local, "txn", None)
+
+    @property
+    def in_transaction(self) -> bool:
+        """True while the current thread is inside a transaction() block."""
+        return self._txn is not None
+
+    @property
+    def cache_lock(self) -> threading.RLock:
+        """The lock over this project's item caches, held by writing transactions."""
+        return self._cache_lock
+
+    @contextmanager
+    def transaction(self, message: Optional[str] = None) -> Iterator["Store"]:
+        """Stage creates and updates, then flush them together on exit.
+
+        Inside the block, epic/story/task files are written to an in-memory
+        overlay that the Store's own reads see, while activity-log entries,
+        run-log entries, embedding updates, dependency-cycle checks and
+        auto-commit files are collected.  On a clean exit the cycle checks run
+        once, each staged file is written once, the activity log is appended
+        in one batch and a single auto-commit is made (with *message*, if
+        given).  If the block raises or a cycle is found, no item file is
+        written and the cache is reset from disk.  Counters in config.yaml
+        are still advanced, so IDs handed out inside a failed block are not
+        reused.
+
+        Nested calls join the outer transaction.  Transactions are per
+        thread.  Staged writes go into the project's shared caches, so from
+        its first staged write until they are on disk the block holds the
+        project's cache lock: other threads reading its items meanwhile
+        wait for the flush (or rollback).  Other projects are not affected.
+        """
+        if self._txn is not None:
+            yield self
+            return
+        # The cache must hold every item up front: staged files are not on
+        # disk, so a later first load would miss them.
+        for item_type in ("epics", "stories", "tasks"):
+            self._load_cache(item_type)
+        txn = _Transaction(self._resolve_actor())
+        self._local.txn = txn
+        try:
+            try:
+                yield self
+                self._local.txn = None
+                if txn.cycle_checks:
+                    self._check_dependency_cycles(txn.cycle_checks)
+            except BaseException:
+                self._local.txn = None
+                self.clear_cache()
+                for lease in txn.leases:
+                    self._leases.discard(lease)
+                raise
+            self._flush_transaction(txn, message)
+        finally:
+            if txn.lock is not None:
+                txn.lock.release()
+        for callback in txn.on_commit:
+            callback()
+
+    def on_commit(self, callback: Callable[[], None]) -> None:
+        """Call callback once the open transaction is flushed, or now outside one.
+
+        Callbacks of a transaction that fails are dropped, so side effects
+        such as events never announce writes that did not happen.
+        """
+        txn = self._txn
+        if txn is not None:
+            txn.on_commit.append(callback)
+        else:
+            callback()
+
+    def _flush_transaction(self, txn: _Transaction, message: Optional[str]) -> None:
+        """Write everything a committed transaction staged."""
+        from .activity_log import append_log_entries
+
+        for path, text in txn.files.items():
+            path.write_text(text)
+        for task_id, keep_for in txn.lease_releases.items():
+            self._leases.release(task_id, keep_for)
+
+        snapshot_records: dict[str, list[tuple[object, bool]]] = {}
+        for (item_type, item_id), (meta, cached) in txn.cache_records.items():
+            self._cache_record_file(item_type, item_id, cached)
+            snapshot_records.setdefault(item_type, []).append((meta, cached))
+        for item_type, records in snapshot_records.items():
+            self._snapshot_record(item_type, records)
+
+        try:
+            append_log_entries(self.project_dir / "activity.jsonl", txn.log_entries)
+        except Exception:
+            logger.debug("activity log: failed to append transaction batch")
+
+        run_logs: dict[str, list[RunLogEntry]] = {}
+        for item_id, entry in txn.run_logs:
+            run_logs.setdefault(item_id, []).append(entry)
+        for item_id, entries in run_logs.items():
+            try:
+                logs_dir = self.project_dir / "logs"
+                logs_dir.mkdir(exist_ok=True)
+                with open(logs_dir / f"{item_id}.jsonl", "a") as f:
+                    f.write("".join(e.model_dump_json() + "\n" for e in entries))
+            except Exception:
+                logger.debug("run log: failed to append for %s", item_id)
+
+        for item_id, (title, item_type, body, meta) in txn.embeddings.items():
+            self._index_embedding(item_id, title, item_type, body, meta=meta)
+        for (item_type, _), (meta, body) in txn.search_docs.items():
+            self._index_search(item_type, meta, body)
+
+        if txn.commit_files:
+            if message is None:
+                if len(txn.commit_messages) == 1:
+                    message = txn.commit_messages[0]
+                else:
+                    message = f"pm: {len(txn.commit_messages)} changes\n\n" + "\n".join(
+                        txn.commit_messages
+                    )
+            self._auto_commit(list(dict.fromkeys(txn.commit_files)), message)
+
+    def _item_exists(self, path: Path) -> bool:
+        """Whether an item file exists, counting files staged in a transaction."""
+        txn = self._txn
+        return (txn is not None and path in txn.files) or path.exists()
+
+    def _read_item(self, path: Path) -> tuple[dict, str]:
+        """Read (metadata, body) of an item file, preferring staged content."""
+        txn = self._txn
+        if txn is not None and path in txn.files:
+            return parse_post(txn.files[path])
+        return read_post(path)
+
+    def _write_item(self, path: Path, text: str) -> None:
+        """Write an item file, or stage it when a transaction is open."""
+        txn = self._txn
+        if txn is not None:
+            if txn.lock is None:
+                self._cache_lock.acquire()  # released after the flush
+                txn.lock = self._cache_lock
+            txn.files[path] = text
+        else:
+            path.write_text(text)
+
     def _auto_commit(self, files: list[Path], message: str) -> None:
         """Auto-commit specific files if auto_commit is enabled.
 
         Silently skips if git is not available, not in a repo, or commit fails.
+        Inside a transaction the files are collected for one commit at the end.
         """
         if not self.config.auto_commit:
             return
+        txn = self._txn
+        if txn is not None:
+            txn.commit_files.extend(files)
+            txn.commit_messages.append(message)
+            return
 
         import subprocess
 
@@ -214,6 +640,7 @@ class Store:
         """Emit an activity log entry. Failures are silently swallowed."""
         from .activity_log import append_log_entry
 
+        txn = self._txn
         try:
             entry = LogEntry(
                 event_type=event_type,
@@ -221,9 +648,12 @@ class Store:
                 item_type=item_type,
                 changes=changes or {},
                 timestamp=datetime.now(timezone.utc),
-                actor=self._resolve_actor(),
+                actor=txn.actor if txn is not None else self._resolve_actor(),
                 source=LogSource.cli,
             )
+            if txn is not None:
+                txn.log_entries.append(entry)
+                return
             log_path = self.project_dir / "activity.jsonl"
             append_log_entry(log_path, entry)
         except Exception:
@@ -239,16 +669,20 @@ class Store:
         """Append a run-log entry for an item. Failures are silently swallowed."""
         import json as _json
 
+        txn = self._txn
         try:
-            logs_dir = self.project_dir / "logs"
-            logs_dir.mkdir(exist_ok=True)
             entry = RunLogEntry(
                 timestamp=datetime.now(timezone.utc),
                 outcome=Outcome(outcome),
                 status=status,
                 note=note,
-                actor=self._resolve_actor(),
+                actor=txn.actor if txn is not None else self._resolve_actor(),
             )
+            if txn is not None:
+                txn.run_logs.append((item_id, entry))
+                return
+            logs_dir = self.project_dir / "logs"
+            logs_dir.mkdir(exist_ok=True)
             log_path = logs_dir / f"{item_id}.jsonl"
             with open(log_path, "a") as f:
                 f.write(entry.model_dump_json() + "\n")
@@ -257,22 +691,52 @@ class Store:
             logger.debug("run log: failed to append for %s", item_id)
 
     def _index_embedding(
-        self, item_id: str, title: str, item_type: str, body: str
+        self, item_id: str, title: str, item_type: str, body: str, meta=None
     ) -> None:
-        """Index or re-index an item in the embedding store.
-
-        Silently skips if embeddings are not available (fastembed not installed).
-        Only indexes stories and tasks (epics are not indexed).
+        """Queue an item for (re)indexing in the embedding store.
+
+        Embedding runs on the background EmbeddingWorker, off the mutation
+        path; call embeddings.flush_embeddings() to wait for it.  meta, the
+        item's frontmatter, supplies the status/tags/epic that searches
+        filter on.  Skips if embeddings are not available (numpy or
+        fastembed not installed).  Only indexes stories and tasks (epics
+        are not indexed).
         """
         if item_type not in ("story", "task"):
             return
+        txn = self._txn
+        if txn is not None:
+            txn.embeddings[item_id] = (title, item_type, body, meta)
+            return
+        try:
+            from .embeddings import get_embedding_worker, item_attrs
+        except ImportError:
+            return
         try:
-            from .embeddings import EmbeddingStore
+            attrs = item_attrs(meta) if meta is not None else None
+            get_embedding_worker().submit(
+                self.project_dir, item_id, title, item_type, body, attrs
+            )
+        except Exception:
+            logger.warning("embedding: failed to queue %s", item_id, exc_info=True)
 
-            emb_store = EmbeddingStore(self.project_dir)
-            emb_store.index_item(item_id, title, item_type, body)
-        except (ImportError, Exception):
-            pass
+    def _index_search(self, item_type: str, meta, body: str) -> None:
+        """Push a written epic, story or task into the keyword search index.
+
+        Deferred until flush inside a transaction, when the file exists.
+        """
+        txn = self._txn
+        if txn is not None:
+            txn.search_docs[(item_type, meta.id)] = (meta, body)
+            return
+        try:
+            from .search import get_search_index
+
+            get_search_index(self.project_dir).update(
+                _SEARCH_TYPES[item_type], meta.model_dump(mode="json"), body
+            )
+        except Exception:
+            logger.debug("search index: failed to update %s", meta.id)
 
     def get_run_log(
         self,
@@ -334,14 +798,13 @@ class Store:
             updated=today,
         )
 
-        post = frontmatter.Post(
-            content=description,
-            **meta.model_dump(mode="json"),
+        self._write_item(
+            self._story_path(story_id),
+            dump_post(meta.model_dump(mode="json"), description),
         )
-        self._story_path(story_id).write_text(frontmatter.dumps(post))
         self._cache_append("stories", meta, description)
         self._emit_log(EventType.create, story_id, ItemType.story)
-        self._index_embedding(story_id, title, "story", description)
+        self._index_embedding(story_id, title, "story", description, meta=meta)
 
         # Auto-create test tasks for each acceptance criterion
         test_tasks: list[TaskFrontmatter] = []
@@ -362,115 +825,565 @@ class Store:
         return meta, test_tasks
 
     def get_story(self, story_id: str) -> tuple[StoryFrontmatter, str]:
-        """Read a story, returning (frontmatter, body). Uses cache if populated and fresh."""
-        key = self._cache_key("stories")
-        if key in _cache and not self._is_cache_stale("stories"):
-            for meta, body in _cache[key]:
-                if meta.id == story_id:
-                    if _cache_debug:
-                        _cache_stats["hits"] += 1
-                    return meta, body
+        """Read a story, returning (frontmatter, body).
+
+        Uses the cache if populated, refreshing changed files first; the
+        body is loaded lazily and kept in a bounded LRU.
+        """
+        if self._cache_key("stories") in _cache:
+            meta = self._load_cache("stories").get(story_id)
+            if meta is not None:
+                return meta, self._cached_body("stories", story_id)
         path = self._story_path(story_id)
-        if not path.exists():
+        if not self._item_exists(path):
             raise FileNotFoundError(f"Story not found: {story_id}")
-        post = frontmatter.load(str(path))
-        meta = StoryFrontmatter(**post.metadata)
-        return meta, post.content
+        metadata, body = self._read_item(path)
+        return StoryFrontmatter(**metadata), body
 
     def _cache_key(self, item_type: str) -> tuple[str, str]:
         """Return the cache key for a given item type."""
         return (str(self.project_dir), item_type)
 
-    def _get_dir_mtime(self, dir_path: Path) -> tuple[float, int]:
-        """Return (mtime, file_count) of the most recently modified file in dir_path.
+    def _cache_spec(self, item_type: str) -> tuple[Optional[Path], type, Optional[str]]:
+        """Return (directory, frontmatter model, archived status) for an item type.
+
+        The archived status is None for item types that are never evicted.
+        Unknown item types return (None, None, None).
+        """
+        if item_type == "stories":
+            return self.stories_dir, StoryFrontmatter, StoryStatus.archived.value
+        if item_type == "tasks":
+            return self.tasks_dir, TaskFrontmatter, None
+        if item_type == "epics":
+            return self.epics_dir, EpicFrontmatter, EpicStatus.archived.value
+        return None, None, None
 
-        Returns (0.0, 0) if dir_path does not exist or is empty.
+    @staticmethod
+    def _scan_fingerprints(dir_path: Path) -> dict[str, tuple[int, int, int]]:
+        """Return {file name: (inode, size, mtime_ns)} for every *.md file in dir_path.
+
+        Costs one stat per file and no parsing.  Returns an empty dict if
+        dir_path does not exist.
         """
-        if not dir_path.exists():
-            return (0.0, 0)
-        files = list(dir_path.glob("*.md"))
-        if not files:
-            return (0.0, 0)
-        return (max(f.stat().st_mtime for f in files), len(files))
+        fingerprints: dict[str, tuple[int, int, int]] = {}
+        try:
+            with os.scandir(dir_path) as it:
+                for entry in it:
+                    name = entry.name
+                    if name.startswith(".") or not name.endswith(".md"):
+                        continue
+                    try:
+                        if not entry.is_file():
+                            continue
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    fingerprints[name] = (st.st_ino, st.st_size, st.st_mtime_ns)
+        except (FileNotFoundError, NotADirectoryError):
+            pass
+        return fingerprints
 
     def _is_cache_stale(self, item_type: str) -> bool:
         """Check if cached data for item_type is potentially stale.
 
-        Compares stored (mtime, file_count) against current to detect
-        external changes (e.g., git pull, direct edits, file deletions).
+        Compares the stored per-file fingerprints against the directory to
+        detect external changes (e.g., git pull, direct edits, file deletions).
         """
         key = self._cache_key(item_type)
-        if key not in _cache:
+        if key not in _cache or key not in _cache_fingerprints:
             return True
 
-        stored = _cache_mtimes.get(key, (0.0, 0))
-        if stored == (0.0, 0):
+        dir_path, _, _ = self._cache_spec(item_type)
+        if dir_path is None:
             return True
 
-        dir_map = {
-            "stories": self.stories_dir,
-            "tasks": self.tasks_dir,
-            "epics": self.epics_dir,
-        }
-        dir_path = dir_map.get(item_type)
-        if not dir_path:
+        stored = _cache_fingerprints[key]
+        current = self._scan_fingerprints(dir_path)
+        if current.keys() != stored.keys():
             return True
+        return any(stored[name][0] != fp for name, fp in current.items())
+
+    def _load_cache(self, item_type: str) -> _ItemCache:
+        """Populate or incrementally refresh the cache for item_type.
+
+        The first call restores the on-disk snapshot (if any) and parses
+        every file it does not cover.  Later calls stat the directory and
+        re-parse only the files whose fingerprint changed; deleted files are
+        dropped and all other entries are left untouched.  Inside a
+        transaction the cache loaded when it opened is used as is: staged
+        writes update it directly, and external edits are picked up by the
+        first call after the transaction (or by refresh_item()).
+        """
+        with self._cache_lock:
+            key = self._cache_key(item_type)
+            if self._txn is not None and key in _cache and key in _cache_fingerprints:
+                return _cache[key]
+            dir_path, model, _ = self._cache_spec(item_type)
+            current = self._scan_fingerprints(dir_path)
+
+            cold = key not in _cache or key not in _cache_fingerprints
+            if cold:
+                items = _ItemCache()
+                stored = self._restore_snapshot(item_type, model, items)
+            else:
+                items = _cache[key]
+                stored = _cache_fingerprints[key]
+            changed = sorted(
+                name
+                for name, fp in current.items()
+                if name not in stored or stored[name][0] != fp
+            )
+            removed = [name for name in stored if name not in current]
+            if not changed and not removed and not cold:
+                if _cache_debug:
+                    _cache_stats["hits"] += 1
+                return items
+            if _cache_debug:
+                _cache_stats["misses"] += 1
 
-        current_mtime, current_count = self._get_dir_mtime(dir_path)
-        stored_mtime, stored_count = stored
-        return current_mtime > stored_mtime or current_count != stored_count
+            self._apply_file_changes(item_type, items, stored, current, changed, removed)
+            _cache[key] = items
+            _cache_fingerprints[key] = stored
+            return items
+
+    def _apply_file_changes(
+        self,
+        item_type: str,
+        items: _ItemCache,
+        stored: dict[str, tuple[tuple[int, int, int], Optional[str]]],
+        current: dict[str, tuple[int, int, int]],
+        changed: list[str],
+        removed: list[str],
+    ) -> None:
+        """Re-parse the changed files and drop the removed ones from items and stored.
+
+        current holds the fingerprints of (at least) the changed files.  The
+        snapshot is updated to match.  Call with the cache lock held.
+        """
+        key = self._cache_key(item_type)
+        dir_path, model, archived = self._cache_spec(item_type)
+        for name in removed:
+            item_id = stored.pop(name)[1]
+            if item_id is not None:
+                items.remove(item_id)
+                _body_cache.discard(key + (item_id,))
+        for name in changed:
+            if name in stored and stored[name][1] is not None:
+                items.remove(stored[name][1])
+                _body_cache.discard(key + (stored[name][1],))
+
+        rows = {}
+        for name in changed:
+            item_id = None
+            row = (current[name], None, None)
+            try:
+                meta = model(**read_meta(dir_path / name))
+                if archived is None or meta.status.value != archived:
+                    items.put(meta, name)
+                    item_id = meta.id
+                    _body_cache.discard(key + (item_id,))
+                    row = (current[name], item_id, meta.model_dump_json())
+            except Exception:
+                pass
+            stored[name] = (current[name], item_id)
+            rows[name] = row
+
+        if self._snapshot is not None:
+            self._snapshot.save(item_type, rows, removed)
+
+    def refresh_item(self, item_type: str, item_id: str) -> None:
+        """Bring one cached item up to date with its file, even inside a transaction.
+
+        A transaction otherwise keeps the cache it opened with until it
+        ends; claim() uses this to re-check a task it has just leased
+        against the file another process may have changed meanwhile.  An
+        item staged in the open transaction keeps its staged content.
+        """
+        key = self._cache_key(item_type)
+        dir_path, _, _ = self._cache_spec(item_type)
+        name = f"{item_id}.md"
+        txn = self._txn
+        if txn is not None and dir_path / name in txn.files:
+            return
+        with self._cache_lock:
+            items = _cache.get(key)
+            stored = _cache_fingerprints.get(key)
+            if items is None or stored is None:
+                return  # get_*() reads the file itself
+            current = {}
+            try:
+                st = (dir_path / name).stat()
+                current[name] = (st.st_ino, st.st_size, st.st_mtime_ns)
+            except OSError:
+                pass
+            changed = [
+                n for n, fp in current.items() if n not in stored or stored[n][0] != fp
+            ]
+            removed = [name] if name in stored and name not in current else []
+            if changed or removed:
+                self._apply_file_changes(item_type, items, stored, current, changed, removed)
+
+    def _restore_snapshot(
+        self, item_type: str, model: type, items: _ItemCache
+    ) -> dict[str, tuple[tuple[int, int, int], Optional[str]]]:
+        """Fill *items* from the on-disk snapshot and return its fingerprints.
+
+        Rows that no longer validate against *model* are left out so the
+        caller re-parses their files.
+        """
+        stored: dict[str, tuple[tuple[int, int, int], Optional[str]]] = {}
+        if self._snapshot is None:
+            return stored
+        for name, (fp, item_id, meta_json) in self._snapshot.load(item_type).items():
+            if item_id is None:
+                stored[name] = (fp, None)
+                continue
+            try:
+                meta = model.model_validate_json(meta_json)
+            except Exception:
+                continue
+            items.put(meta, name)
+            stored[name] = (fp, meta.id)
+        return stored
+
+    def _index_items(self, item_type: str) -> list:
+        """Return frontmatter for every parseable file of item_type, in file-name order.
+
+        Unlike the list_* methods this includes archived items, as the index
+        always has.  Cached entries are refreshed through their fingerprints
+        like any other read; archived files are parsed once per fingerprint.
+        Malformed files are skipped.  Holds the cache lock, so a background
+        index writer waits for open transactions instead of indexing their
+        staged items.
+        """
+        with self._cache_lock:
+            key = self._cache_key(item_type)
+            dir_path, model, _ = self._cache_spec(item_type)
+            items = self._load_cache(item_type)
+            stored = _cache_fingerprints.get(key, {})
+            parsed = _uncached_meta.setdefault(key, {})
+            for name in list(parsed):
+                if name not in stored or stored[name][1] is not None:
+                    del parsed[name]
+
+            result = []
+            for name in sorted(stored):
+                fp, item_id = stored[name]
+                if item_id is not None:
+                    meta = items.get(item_id)
+                else:
+                    entry = parsed.get(name)
+                    if entry is None or entry[0] != fp:
+                        try:
+                            entry = (fp, model(**read_meta(dir_path / name)))
+                        except Exception:
+                            entry = (fp, None)
+                        parsed[name] = entry
+                    meta = entry[1]
+                if meta is not None:
+                    result.append(meta)
+            return result
+
+    def _snapshot_record(self, item_type: str, records: list[tuple[object, bool]]) -> None:
+        """Write Store-made changes, as (frontmatter, cached) pairs, to the snapshot."""
+        if self._snapshot is None:
+            return
+        stored = _cache_fingerprints.get(self._cache_key(item_type), {})
+        rows = {}
+        removed = []
+        for meta, cached in records:
+            name = f"{meta.id}.md"
+            entry = stored.get(name)
+            if entry is None:
+                removed.append(name)
+            elif cached:
+                rows[name] = (entry[0], meta.id, meta.model_dump_json())
+            else:
+                rows[name] = (entry[0], None, None)
+        self._snapshot.save(item_type, rows, removed)
+
+    def _cached_body(self, item_type: str, item_id: str, remember: bool = True) -> str:
+        """Return an item's body from the LRU, reading the file on a miss.
+
+        With remember=False a miss is not added to the LRU, so bulk readers
+        do not evict the bodies of recently used items.
+        """
+        with self._cache_lock:
+            body_key = self._cache_key(item_type) + (item_id,)
+            body = _body_cache.get(body_key)
+            if body is None:
+                dir_path, _, _ = self._cache_spec(item_type)
+                body = self._read_item(dir_path / f"{item_id}.md")[1]
+                if remember:
+                    _body_cache.put(body_key, body)
+            return body
+
+    def _cache_record_file(self, item_type: str, item_id: str, cached: bool) -> None:
+        """Record the fingerprint of a file the Store itself just wrote.
+
+        Keeps the next refresh from re-parsing a file whose new content is
+        already reflected in the cache.
+        """
+        key = self._cache_key(item_type)
+        stored = _cache_fingerprints.get(key)
+        dir_path, _, _ = self._cache_spec(item_type)
+        if stored is None or dir_path is None:
+            return
+        name = f"{item_id}.md"
+        try:
+            st = (dir_path / name).stat()
+        except OSError:
+            stored.pop(name, None)
+            return
+        stored[name] = (
+            (st.st_ino, st.st_size, st.st_mtime_ns),
+            item_id if cached else None,
+        )
+
+    def _cache_record_write(self, item_type: str, meta, cached: bool) -> None:
+        """Record a Store write in the fingerprints and the snapshot.
+
+        Deferred until flush inside a transaction, when the file exists.
+        """
+        txn = self._txn
+        if txn is not None:
+            txn.cache_records[(item_type, meta.id)] = (meta, cached)
+            return
+        self._cache_record_file(item_type, meta.id, cached)
+        self._snapshot_record(item_type, [(meta, cached)])
 
     def _invalidate_cache(self, item_type: str) -> None:
         """Remove cached entries for the given item type."""
-        if _cache.pop(self._cache_key(item_type), None) is not None and _cache_debug:
-            _cache_stats["invalidations"] += 1
+        key = self._cache_key(item_type)
+        with self._cache_lock:
+            _cache_fingerprints.pop(key, None)
+            _body_cache.discard_type(key)
+            if _cache.pop(key, None) is not None and _cache_debug:
+                _cache_stats["invalidations"] += 1
 
     def _cache_append(self, item_type: str, meta, body: str) -> None:
-        """Append a new entry to the cache.
+        """Append a new entry to the cache and the keyword search index.
 
-        If cache is not yet populated, this is a no-op — the next list_* call
-        will repopulate from disk which will include this item.
+        If cache is not yet populated, this is a no-op for the cache — the
+        next list_* call will repopulate from disk which will include this item.
         """
-        key = self._cache_key(item_type)
-        if key not in _cache:
-            return
-        _cache[key].append((meta, body))
+        with self._cache_lock:
+            self._index_search(item_type, meta, body)
+            key = self._cache_key(item_type)
+            if key not in _cache:
+                return
+            _cache[key].put(meta, f"{meta.id}.md")
+            _body_cache.put(key + (meta.id,), body)
+            self._cache_record_write(item_type, meta, cached=True)
 
     def _cache_update_entry(
         self, item_type: str, item_id: str, meta, body: str
     ) -> None:
         """Replace a single entry in the cache if it is populated.
 
+        The keyword search index is always updated.
+
         If the item has transitioned to archived status, evict it from the
         cache instead of updating — archived items are excluded from the
         cache to bound memory usage.
         """
-        key = self._cache_key(item_type)
-        if key in _cache:
-            # Check if item should be evicted (archived status)
-            should_evict = (
-                item_type == "stories"
-                and hasattr(meta, "status")
-                and meta.status == StoryStatus.archived
-            ) or (
-                item_type == "epics"
-                and hasattr(meta, "status")
-                and meta.status == EpicStatus.archived
+        with self._cache_lock:
+            self._index_search(item_type, meta, body)
+            key = self._cache_key(item_type)
+            if key in _cache:
+                # Check if item should be evicted (archived status)
+                should_evict = (
+                    item_type == "stories"
+                    and hasattr(meta, "status")
+                    and meta.status == StoryStatus.archived
+                ) or (
+                    item_type == "epics"
+                    and hasattr(meta, "status")
+                    and meta.status == EpicStatus.archived
+                )
+                self._cache_record_write(item_type, meta, cached=not should_evict)
+                if should_evict:
+                    if item_id in _cache[key] and _cache_debug:
+                        _cache_stats["invalidations"] += 1
+                    _cache[key].remove(item_id)
+                    _body_cache.discard(key + (item_id,))
+                else:
+                    # Also covers un-archived items, which were not cached before
+                    _cache[key].put(meta, f"{item_id}.md")
+                    _body_cache.put(key + (item_id,), body)
+
+    def read_bodies(self, item_type: str, item_ids: list[str]) -> dict[str, str]:
+        """Return {id: body} for items of item_type, without re-scanning the directory.
+
+        For callers that have just listed the items: get_task() and friends
+        refresh the cache on every call, which costs a directory scan per
+        item.  Bodies missing from the LRU are read without being added to
+        it; items whose files have gone are left out.
+        """
+        bodies = {}
+        for item_id in item_ids:
+            try:
+                bodies[item_id] = self._cached_body(item_type, item_id, remember=False)
+            except OSError:
+                continue
+        return bodies
+
+    def get_lease(self, task_id: str) -> Optional[Lease]:
+        """Return the lease on a task (see leases.py), expired or not, or None."""
+        return self._leases.get(task_id)
+
+    def acquire_lease(
+        self, task_id: str, assignee: str, seconds: Optional[float] = None
+    ) -> tuple[bool, Lease]:
+        """Lease a task to assignee unless someone else holds a live lease.
+
+        Returns (acquired, lease) as LeaseTable.acquire does.  A lease
+        taken inside a transaction is dropped again if the block fails.
+        """
+        prior = self._leases.get(task_id) if self._txn is not None else None
+        acquired, lease = self._leases.acquire(task_id, assignee, seconds)
+        if acquired and self._txn is not None and (prior is None or prior.assignee != assignee):
+            self._txn.leases.append(lease)
+        return acquired, lease
+
+    def release_lease(self, task_id: str, keep_for: Optional[str] = None) -> None:
+        """Drop a task's lease unless keep_for holds it."""
+        self._leases.release(task_id, keep_for)
+
+    def discard_lease(self, lease: Lease) -> bool:
+        """Drop lease if it is unchanged since it was read; return whether it was."""
+        return self._leases.discard(lease)
+
+    def expired_leases(self) -> list[Lease]:
+        """Return every lease past its expiry."""
+        return self._leases.expired()
+
+    def _sync_lease(self, meta: TaskFrontmatter) -> None:
+        """Release a task's lease once it is not in progress under its holder.
+
+        Inside a transaction the release waits for the flush.
+        """
+        keep_for = meta.assignee if meta.status == TaskStatus.in_progress else None
+        if self._txn is not None:
+            self._txn.lease_releases[meta.id] = keep_for
+        else:
+            self._leases.release(meta.id, keep_for)
+
+    def grab_batch(
+        self, n: int, assignees: Sequence[str]
+    ) -> list[tuple[TaskFrontmatter, Lease]]:
+        """Claim up to n ready tasks for agents working side by side.
+
+        Tasks are picked by ReadyQueue.batch: no dependency edges between
+        them, and different stories before two from the same one.
+        assignees names the agent for each task in order, or one agent for
+        all of them.  Every claim goes through leases.claim as in pm_grab;
+        a task whose claim fails is replaced by the next pick.  Tasks whose
+        lease expired are reclaimed first.  All claims are written in one
+        transaction with one auto-commit; the index is left to the caller.
+
+        Returns (task, lease) for each task claimed.
+        """
+        from .leases import claim, reclaim_expired
+        from .ready_queue import get_ready_queue
+
+        if n < 1:
+            raise ValueError("n must be at least 1")
+        if len(assignees) not in (1, n):
+            raise ValueError(f"expected 1 or {n} assignees, got {len(assignees)}")
+        reclaim_expired(self)
+        grabbed: list[tuple[TaskFrontmatter, Lease]] = []
+        skipped: set[str] = set()
+        with self.transaction():
+            while len(grabbed) < n:
+                candidates = get_ready_queue(self).batch(
+                    n - len(grabbed),
+                    self.dependency_graph(),
+                    taken=[task for task, _ in grabbed],
+                    skip=frozenset(skipped),
+                )
+                if not candidates:
+                    break
+                for task in candidates:
+                    assignee = assignees[len(grabbed) if len(assignees) > 1 else 0]
+                    readiness = claim(self, task.id, assignee)
+                    if not readiness["ready"]:
+                        skipped.add(task.id)
+                        continue
+                    meta = self.update(task.id, assignee=assignee, status="in-progress")
+                    grabbed.append((meta, readiness["lease"]))
+        return grabbed
+
+    def generation(self) -> tuple[int, int]:
+        """Return a token that changes whenever any story or task changes.
+
+        Covers Store writes and, since the caches are refreshed first as by
+        list_stories() and list_tasks(), external edits too.  Views derived
+        from every story and task (see board.py) can be memoized against it.
+        """
+        return tuple(
+            self._load_cache(item_type).generation if dir_path.exists() else 0
+            for item_type, dir_path in (
+                ("stories", self.stories_dir),
+                ("tasks", self.tasks_dir),
             )
-            for i, (m, _) in enumerate(_cache[key]):
-                if m.id == item_id:
-                    if should_evict:
-                        _cache[key].pop(i)
-                        if _cache_debug:
-                            _cache_stats["invalidations"] += 1
+        )
+
+    def changes_since(
+        self, item_type: str, generation: int
+    ) -> tuple[int, Optional[dict[str, object]]]:
+        """Return (generation, changes) for item_type since an earlier generation.
+
+        changes maps each ID added, changed or removed after generation to
+        its current frontmatter, or to None if it is gone.  It is None when
+        the cache cannot tell (generation 0, a cleared cache, or more
+        changes than CHANGE_LOG_SIZE); the caller should then start over
+        from the list_*() methods.  The cache is refreshed first, so
+        external edits are included.
+        """
+        dir_path, _, _ = self._cache_spec(item_type)
+        if dir_path is None or not dir_path.exists():
+            return 0, None if generation else {}
+        items = self._load_cache(item_type)
+        changed = items.changed_since(generation)
+        if changed is None:
+            return items.generation, None
+        return items.generation, {item_id: items.get(item_id) for item_id in changed}
+
+    def dependency_graph(self) -> DependencyGraph:
+        """Return the project-wide dependency graph of tasks and stories.
+
+        One graph is kept per project and brought up to date from the
+        caches' change logs (see changes_since), so after a few edits only
+        the changed items are re-linked.  It is rebuilt from list_stories()
+        and list_tasks() when the logs cannot tell.  Archived stories are
+        not in it.
+        """
+        key = str(self.project_dir)
+        with self._cache_lock, _graphs_lock:
+            graph, story_generation, task_generation = _graphs.get(key, (None, 0, 0))
+            story_generation, stories = self.changes_since("stories", story_generation)
+            task_generation, tasks = self.changes_since("tasks", task_generation)
+            if graph is None or stories is None or tasks is None:
+                graph = DependencyGraph()
+                stories = {story.id: story for story in self.list_stories()}
+                tasks = {task.id: task for task in self.list_tasks()}
+            for changes in (stories, tasks):
+                for item_id, meta in changes.items():
+                    if meta is None:
+                        graph.discard(item_id)
                     else:
-                        _cache[key][i] = (meta, body)
-                    return
+                        graph.set(item_id, meta.depends_on)
+            _graphs[key] = (graph, story_generation, task_generation)
+            return graph
 
     def clear_cache(self) -> None:
         """Clear all cached entries for this Store instance."""
-        for item_type in ("stories", "tasks", "epics"):
-            _cache.pop(self._cache_key(item_type), None)
+        with self._cache_lock:
+            for item_type in ("stories", "tasks", "epics"):
+                _cache.pop(self._cache_key(item_type), None)
+                _cache_fingerprints.pop(self._cache_key(item_type), None)
+                _body_cache.discard_type(self._cache_key(item_type))
 
     def _read_stories_from_disk(
         self, status_filter: Optional[str] = None
@@ -481,53 +1394,43 @@ class Store:
         entries = []
         for path in sorted(self.stories_dir.glob("*.md")):
             try:
-                post = frontmatter.load(str(path))
-                meta = StoryFrontmatter(**post.metadata)
+                metadata, body = read_post(path)
+                meta = StoryFrontmatter(**metadata)
                 if status_filter and meta.status.value != status_filter:
                     continue
-                entries.append((meta, post.content))
+                entries.append((meta, body))
             except Exception:
                 continue
         return entries
 
-    def list_stories(self, status: Optional[str] = None) -> list[StoryFrontmatter]:
-        """List all stories, optionally filtered by status. Skips malformed files.
+    def list_stories(
+        self,
+        status: Optional[str] = None,
+        epic_id: Optional[str] = None,
+        tag: Optional[str] = None,
+    ) -> list[StoryFrontmatter]:
+        """List stories, optionally filtered by status, epic and/or tag. Skips malformed files.
 
         Archived stories are excluded from the cache to bound memory usage.
         Requests for archived stories bypass the cache and read from disk.
 
-        Cache is automatically invalidated if external file changes are detected.
+        External file changes are picked up incrementally: only added or
+        changed files are re-parsed.
         """
         if not self.stories_dir.exists():
             return []
 
         if status == StoryStatus.archived.value:
             entries = self._read_stories_from_disk(status_filter=status)
-            return [m for m, _ in entries]
-
-        key = self._cache_key("stories")
-        if key not in _cache or self._is_cache_stale("stories"):
-            if _cache_debug:
-                _cache_stats["misses"] += 1
-            entries = []
-            for path in sorted(self.stories_dir.glob("*.md")):
-                try:
-                    post = frontmatter.load(str(path))
-                    meta = StoryFrontmatter(**post.metadata)
-                    if meta.status == StoryStatus.archived:
-                        continue
-                    entries.append((meta, post.content))
-                except Exception:
-                    continue
-            _cache[key] = entries
-            _cache_mtimes[key] = self._get_dir_mtime(self.stories_dir)
-        else:
-            if _cache_debug:
-                _cache_stats["hits"] += 1
-        all_entries = _cache[key]
-        if status is None:
-            return [m for m, _ in all_entries]
-        return [m for m, _ in all_entries if m.status.value == status]
+            return [
+                m for m, _ in entries
+                if (not epic_id or m.epic_id == epic_id)
+                and (not tag or tag in m.tags)
+            ]
+
+        return self._load_cache("stories").select(
+            status=status or None, epic_id=epic_id or None, tags=tag or None
+        )
 
     def create_epic(
         self,
@@ -553,11 +1456,10 @@ class Store:
             updated=today,
         )
 
-        post = frontmatter.Post(
-            content=description,
-            **meta.model_dump(mode="json"),
+        self._write_item(
+            self._epic_path(epic_id),
+            dump_post(meta.model_dump(mode="json"), description),
         )
-        self._epic_path(epic_id).write_text(frontmatter.dumps(post))
         self._cache_append("epics", meta, description)
         self._emit_log(EventType.create, epic_id, ItemType.epic)
 
@@ -569,20 +1471,20 @@ class Store:
         return meta
 
     def get_epic(self, epic_id: str) -> tuple[EpicFrontmatter, str]:
-        """Read an epic, returning (frontmatter, body). Uses cache if populated and fresh."""
-        key = self._cache_key("epics")
-        if key in _cache and not self._is_cache_stale("epics"):
-            for meta, body in _cache[key]:
-                if meta.id == epic_id:
-                    if _cache_debug:
-                        _cache_stats["hits"] += 1
-                    return meta, body
+        """Read an epic, returning (frontmatter, body).
+
+        Uses the cache if populated, refreshing changed files first; the
+        body is loaded lazily and kept in a bounded LRU.
+        """
+        if self._cache_key("epics") in _cache:
+            meta = self._load_cache("epics").get(epic_id)
+            if meta is not None:
+                return meta, self._cached_body("epics", epic_id)
         path = self._epic_path(epic_id)
-        if not path.exists():
+        if not self._item_exists(path):
             raise FileNotFoundError(f"Epic not found: {epic_id}")
-        post = frontmatter.load(str(path))
-        meta = EpicFrontmatter(**post.metadata)
-        return meta, post.content
+        metadata, body = self._read_item(path)
+        return EpicFrontmatter(**metadata), body
 
     def _read_epics_from_disk(
         self, status_filter: Optional[str] = None
@@ -593,53 +1495,38 @@ class Store:
         entries = []
         for path in sorted(self.epics_dir.glob("*.md")):
             try:
-                post = frontmatter.load(str(path))
-                meta = EpicFrontmatter(**post.metadata)
+                metadata, body = read_post(path)
+                meta = EpicFrontmatter(**metadata)
                 if status_filter and meta.status.value != status_filter:
                     continue
-                entries.append((meta, post.content))
+                entries.append((meta, body))
             except Exception:
                 continue
         return entries
 
-    def list_epics(self, status: Optional[str] = None) -> list[EpicFrontmatter]:
-        """List all epics, optionally filtered by status. Skips malformed files.
+    def list_epics(
+        self,
+        status: Optional[str] = None,
+        tag: Optional[str] = None,
+    ) -> list[EpicFrontmatter]:
+        """List epics, optionally filtered by status and/or tag. Skips malformed files.
 
         Archived epics are excluded from the cache to bound memory usage.
         Requests for archived epics bypass the cache and read from disk.
 
-        Cache is automatically invalidated if external file changes are detected.
+        External file changes are picked up incrementally: only added or
+        changed files are re-parsed.
         """
         if not self.epics_dir.exists():
             return []
 
         if status == EpicStatus.archived.value:
             entries = self._read_epics_from_disk(status_filter=status)
-            return [m for m, _ in entries]
+            return [m for m, _ in entries if not tag or tag in m.tags]
 
-        key = self._cache_key("epics")
-        if key not in _cache or self._is_cache_stale("epics"):
-            if _cache_debug:
-                _cache_stats["misses"] += 1
-            entries = []
-            for path in sorted(self.epics_dir.glob("*.md")):
-                try:
-                    post = frontmatter.load(str(path))
-                    meta = EpicFrontmatter(**post.metadata)
-                    if meta.status == EpicStatus.archived:
-                        continue
-                    entries.append((meta, post.content))
-                except Exception:
-                    continue
-            _cache[key] = entries
-            _cache_mtimes[key] = self._get_dir_mtime(self.epics_dir)
-        else:
-            if _cache_debug:
-                _cache_stats["hits"] += 1
-        all_entries = _cache[key]
-        if status is None:
-            return [m for m, _ in all_entries]
-        return [m for m, _ in all_entries if m.status.value == status]
+        return self._load_cache("epics").select(
+            status=status or None, tags=tag or None
+        )
 
     def _validate_task_depends_on(self, task_id: str, depends_on: list[str]) -> None:
         """Validate task depends_on entries: no self-ref, all must exist.
@@ -655,7 +1542,7 @@ class Store:
             # Check that the dependency exists (task or story)
             dep_task_path = self._task_path(dep)
             dep_story_path = self._story_path(dep)
-            if not dep_task_path.exists() and not dep_story_path.exists():
+            if not self._item_exists(dep_task_path) and not self._item_exists(dep_story_path):
                 raise ValueError(
                     f"Dependency {dep} does not exist (not a task or story)"
                 )
@@ -673,7 +1560,7 @@ class Store:
             # Check that the dependency exists (story or task)
             dep_story_path = self._story_path(dep)
             dep_task_path = self._task_path(dep)
-            if not dep_story_path.exists() and not dep_task_path.exists():
+            if not self._item_exists(dep_story_path) and not self._item_exists(dep_task_path):
                 raise ValueError(
                     f"Dependency {dep} does not exist (not a story or task)"
                 )
@@ -692,7 +1579,7 @@ class Store:
         """Create a new task under a story."""
         self.tasks_dir.mkdir(parents=True, exist_ok=True)
         # Verify story exists
-        if not self._story_path(story_id).exists():
+        if not self._item_exists(self._story_path(story_id)):
             raise FileNotFoundError(f"Story not found: {story_id}")
 
         task_id = self._next_task_id(story_id)
@@ -714,14 +1601,13 @@ class Store:
             updated=today,
         )
 
-        post = frontmatter.Post(
-            content=description,
-            **meta.model_dump(mode="json"),
+        self._write_item(
+            self._task_path(task_id),
+            dump_post(meta.model_dump(mode="json"), description),
         )
-        self._task_path(task_id).write_text(frontmatter.dumps(post))
         self._cache_append("tasks", meta, description)
         self._emit_log(EventType.create, task_id, ItemType.task)
-        self._index_embedding(task_id, title, "task", description)
+        self._index_embedding(task_id, title, "task", description, meta=meta)
 
         if not _batch:
             self._auto_commit([self._task_path(task_id)], f"pm: create {task_id}")
@@ -746,7 +1632,7 @@ class Store:
         batch is rolled back.
         """
         self.tasks_dir.mkdir(parents=True, exist_ok=True)
-        if not self._story_path(story_id).exists():
+        if not self._item_exists(self._story_path(story_id)):
             raise FileNotFoundError(f"Story not found: {story_id}")
 
         # Pre-compute IDs for the entire batch so we can allow
@@ -791,24 +1677,27 @@ class Store:
                 created=today,
                 updated=today,
             )
-            post = frontmatter.Post(
-                content=entry.get("description", ""),
-                **meta.model_dump(mode="json"),
+            self._write_item(
+                self._task_path(task_id),
+                dump_post(meta.model_dump(mode="json"), entry.get("description", "")),
             )
-            self._task_path(task_id).write_text(frontmatter.dumps(post))
             self._cache_append("tasks", meta, entry.get("description", ""))
             self._emit_log(EventType.create, task_id, ItemType.task)
             created.append(meta)
 
-        # Post-batch cycle check — rollback on failure.
+        # Post-batch cycle check — rollback on failure.  Inside a transaction
+        # the check is deferred to the end of the block.
         if created:
-            try:
-                self._check_dependency_cycles(story_id)
-            except ValueError:
-                for task in created:
-                    self._task_path(task.id).unlink(missing_ok=True)
-                self._invalidate_cache("tasks")
-                raise
+            if self._txn is not None:
+                self._txn.cycle_checks.update(t.id for t in created)
+            else:
+                try:
+                    self._check_dependency_cycles(t.id for t in created)
+                except ValueError:
+                    for task in created:
+                        self._task_path(task.id).unlink(missing_ok=True)
+                    self._invalidate_cache("tasks")
+                    raise
 
             files = [self._task_path(t.id) for t in created]
             self._auto_commit(
@@ -817,67 +1706,57 @@ class Store:
 
         return created
 
-    def _check_dependency_cycles(self, story_id: str) -> None:
-        """Detect dependency cycles among all tasks in a story via DFS."""
-        all_tasks = self.list_tasks(story_id=story_id)
-        graph: dict[str, list[str]] = {t.id: list(t.depends_on) for t in all_tasks}
+    def _check_dependency_cycles(self, item_ids: Iterable[str]) -> None:
+        """Raise ValueError if a dependency cycle is reachable from item_ids.
 
-        cycle = detect_cycle(graph)
+        Only the items whose depends_on just changed need to be given: the
+        search starts from them in the project-wide dependency graph and
+        follows task and story edges alike, rather than re-checking whole
+        stories.
+        """
+        cycle = self.dependency_graph().find_cycle(sorted(item_ids))
         if cycle is not None:
             path = " -> ".join(cycle)
             raise ValueError(f"Dependency cycle detected: {path}")
 
     def get_task(self, task_id: str) -> tuple[TaskFrontmatter, str]:
-        """Read a task, returning (frontmatter, body). Uses cache if populated and fresh."""
-        key = self._cache_key("tasks")
-        if key in _cache and not self._is_cache_stale("tasks"):
-            for meta, body in _cache[key]:
-                if meta.id == task_id:
-                    if _cache_debug:
-                        _cache_stats["hits"] += 1
-                    return meta, body
+        """Read a task, returning (frontmatter, body).
+
+        Uses the cache if populated, refreshing changed files first; the
+        body is loaded lazily and kept in a bounded LRU.
+        """
+        if self._cache_key("tasks") in _cache:
+            meta = self._load_cache("tasks").get(task_id)
+            if meta is not None:
+                return meta, self._cached_body("tasks", task_id)
         path = self._task_path(task_id)
-        if not path.exists():
+        if not self._item_exists(path):
             raise FileNotFoundError(f"Task not found: {task_id}")
-        post = frontmatter.load(str(path))
-        meta = TaskFrontmatter(**post.metadata)
-        return meta, post.content
+        metadata, body = self._read_item(path)
+        return TaskFrontmatter(**metadata), body
 
     def list_tasks(
         self,
         story_id: Optional[str] = None,
         status: Optional[str] = None,
+        assignee: Optional[str] = None,
+        tag: Optional[str] = None,
     ) -> list[TaskFrontmatter]:
-        """List tasks, optionally filtered by story and/or status. Skips malformed files.
+        """List tasks, optionally filtered by story, status, assignee and/or tag.
 
-        Cache is automatically invalidated if external file changes are detected.
+        Skips malformed files. Filters are answered from the cache's secondary
+        indexes, so the cost is proportional to the number of matches.
+        External file changes are picked up incrementally: only added or
+        changed files are re-parsed.
         """
         if not self.tasks_dir.exists():
             return []
-        key = self._cache_key("tasks")
-        if key not in _cache or self._is_cache_stale("tasks"):
-            if _cache_debug:
-                _cache_stats["misses"] += 1
-            entries = []
-            for path in sorted(self.tasks_dir.glob("*.md")):
-                try:
-                    post = frontmatter.load(str(path))
-                    meta = TaskFrontmatter(**post.metadata)
-                    entries.append((meta, post.content))
-                except Exception:
-                    continue
-            _cache[key] = entries
-            _cache_mtimes[key] = self._get_dir_mtime(self.tasks_dir)
-        else:
-            if _cache_debug:
-                _cache_stats["hits"] += 1
-        all_entries = _cache[key]
-        result = all_entries
-        if story_id:
-            result = [(m, b) for m, b in result if m.story_id == story_id]
-        if status:
-            result = [(m, b) for m, b in result if m.status.value == status]
-        return [m for m, _ in result]
+        return self._load_cache("tasks").select(
+            story_id=story_id or None,
+            status=status or None,
+            assignee=assignee or None,
+            tags=tag or None,
+        )
 
     def list_all(
         self,
@@ -903,11 +1782,13 @@ class Store:
             )
 
         key = self._cache_key(item_type)
-        entries = _cache.get(key, [])
         results = []
-        for meta, body in entries:
+        for meta in _cache.get(key, ()):
             item = meta.model_dump(mode="json")
-            item["body"] = body
+            try:
+                item["body"] = self._cached_body(item_type, meta.id, remember=False)
+            except OSError:
+                continue  # deleted since the cache refresh
             results.append(item)
         return results
 
@@ -925,13 +1806,13 @@ class Store:
         entries = []
         for path in sorted(self.tasks_dir.glob("*.md")):
             try:
-                post = frontmatter.load(str(path))
-                meta = TaskFrontmatter(**post.metadata)
+                metadata, body = read_post(path)
+                meta = TaskFrontmatter(**metadata)
                 if story_id and meta.story_id != story_id:
                     continue
                 if status_filter and meta.status.value != status_filter:
                     continue
-                entries.append((meta, post.content))
+                entries.append((meta, body))
             except Exception:
                 continue
         return entries
@@ -955,14 +1836,14 @@ class Store:
         else:
             path = self._story_path(item_id)
 
-        if not path.exists():
+        if not self._item_exists(path):
             raise FileNotFoundError(f"Item not found: {item_id}")
 
-        post = frontmatter.load(str(path))
+        metadata, body = self._read_item(path)
 
         # Capture before-state for activity log diffs
-        old_body = post.content
-        old_meta = dict(post.metadata)
+        old_body = body
+        old_meta = dict(metadata)
 
         # Empty-string assignee means "unassign" (MCP optional params can't
         # express None-as-a-value); applied to metadata directly below.
@@ -990,7 +1871,7 @@ class Store:
         # Handle body separately — it replaces markdown content, not metadata
         new_body = kwargs.pop("body", None)
         if new_body is not None:
-            post.content = new_body
+            body = new_body
 
         # Validate depends_on before applying to task or story
         new_depends_on = kwargs.get("depends_on")
@@ -1002,41 +1883,49 @@ class Store:
 
         for key, value in kwargs.items():
             if value is not None:
-                post.metadata[key] = value
+                metadata[key] = value
         if unassign:
-            post.metadata["assignee"] = None
-        post.metadata["updated"] = date.today().isoformat()
+            metadata["assignee"] = None
+        metadata["updated"] = date.today().isoformat()
 
         if is_epic:
-            meta = EpicFrontmatter(**post.metadata)
+            meta = EpicFrontmatter(**metadata)
         elif is_task:
-            meta = TaskFrontmatter(**post.metadata)
+            meta = TaskFrontmatter(**metadata)
         else:
-            meta = StoryFrontmatter(**post.metadata)
+            meta = StoryFrontmatter(**metadata)
 
-        path.write_text(frontmatter.dumps(post))
+        self._write_item(path, dump_post(metadata, body))
 
         # Surgically update relevant cache entry
         if is_epic:
-            self._cache_update_entry("epics", item_id, meta, post.content)
+            self._cache_update_entry("epics", item_id, meta, body)
         elif is_task:
-            self._cache_update_entry("tasks", item_id, meta, post.content)
+            self._cache_update_entry("tasks", item_id, meta, body)
         else:
-            self._cache_update_entry("stories", item_id, meta, post.content)
+            self._cache_update_entry("stories", item_id, meta, body)
 
-        # Check for dependency cycles after writing the update
-        if new_depends_on is not None and is_task:
-            story_id = post.metadata.get("story_id", "")
+        # Check for dependency cycles after writing the update (once, at the
+        # end, inside a transaction — which discards everything on a cycle)
+        if new_depends_on is not None and not is_epic and self._txn is not None:
+            self._txn.cycle_checks.add(meta.id)
+        elif new_depends_on is not None and not is_epic:
             try:
-                self._check_dependency_cycles(story_id)
+                self._check_dependency_cycles([meta.id])
             except ValueError:
-                # Roll back: restore the original file
-                post.metadata = {**old_meta, "updated": date.today().isoformat()}
-                post.content = old_body
-                path.write_text(frontmatter.dumps(post))
-                self._invalidate_cache("tasks")
+                # Roll back: restore the original file and its search entry
+                cache_type = "tasks" if is_task else "stories"
+                metadata = {**old_meta, "updated": date.today().isoformat()}
+                path.write_text(dump_post(metadata, old_body))
+                self._invalidate_cache(cache_type)
+                old = (TaskFrontmatter if is_task else StoryFrontmatter)(**metadata)
+                self._index_search(cache_type, old, old_body)
                 raise
 
+        # Only once the update stands: a lease released here cannot be undone
+        if is_task:
+            self._sync_lease(meta)
+
         # Build before/after field diffs for activity log
         changes: dict[str, dict] = {}
         if unassign and old_meta.get("assignee") is not None:
@@ -1073,9 +1962,9 @@ class Store:
         self._auto_commit([path], msg)
 
         if is_task:
-            self._index_embedding(item_id, meta.title, "task", post.content)
+            self._index_embedding(item_id, meta.title, "task", body, meta=meta)
         elif is_story:
-            self._index_embedding(item_id, meta.title, "story", post.content)
+            self._index_embedding(item_id, meta.title, "story", body, meta=meta)
 
         return meta
 
@@ -1139,11 +2028,9 @@ class Store:
             updated=today,
         )
 
-        post = frontmatter.Post(
-            content=description,
-            **meta.model_dump(mode="json"),
+        self._changeset_path(changeset_id).write_text(
+            dump_post(meta.model_dump(mode="json"), description)
         )
-        self._changeset_path(changeset_id).write_text(frontmatter.dumps(post))
         self._emit_log(EventType.create, changeset_id, ItemType.changeset)
         return meta
 
@@ -1152,9 +2039,8 @@ class Store:
         path = self._changeset_path(changeset_id)
         if not path.exists():
             raise FileNotFoundError(f"Changeset not found: {changeset_id}")
-        post = frontmatter.load(str(path))
-        meta = ChangesetFrontmatter(**post.metadata)
-        return meta, post.content
+        metadata, body = read_post(path)
+        return ChangesetFrontmatter(**metadata), body
 
     def list_changesets(
         self, status: Optional[str] = None
@@ -1165,8 +2051,7 @@ class Store:
         changesets = []
         for path in sorted(self.changesets_dir.glob("*.md")):
             try:
-                post = frontmatter.load(str(path))
-                meta = ChangesetFrontmatter(**post.metadata)
+                meta = ChangesetFrontmatter(**read_meta(path))
                 if status is None or meta.status.value == status:
                     changesets.append(meta)
             except Exception:
@@ -1181,11 +2066,9 @@ class Store:
         meta.entries.append(ChangesetEntry(project=project, ref=ref))
         meta.updated = date.today()
 
-        post = frontmatter.Post(
-            content=body,
-            **meta.model_dump(mode="json"),
+        self._changeset_path(changeset_id).write_text(
+            dump_post(meta.model_dump(mode="json"), body)
         )
-        self._changeset_path(changeset_id).write_text(frontmatter.dumps(post))
         return meta
 
     # ─── Sprints ─────────────────────────────────────────────────
@@ -1242,11 +2125,9 @@ class Store:
             updated=today,
         )
 
-        post = frontmatter.Post(
-            content=goal,
-            **meta.model_dump(mode="json"),
+        self._sprint_path(sprint_id).write_text(
+            dump_post(meta.model_dump(mode="json"), goal)
         )
-        self._sprint_path(sprint_id).write_text(frontmatter.dumps(post))
         self._emit_log(EventType.create, sprint_id, ItemType.sprint)
         return meta
 
@@ -1255,9 +2136,8 @@ class Store:
         path = self._sprint_path(sprint_id)
         if not path.exists():
             raise FileNotFoundError(f"Sprint not found: {sprint_id}")
-        post = frontmatter.load(str(path))
-        meta = SprintFrontmatter(**post.metadata)
-        return meta, post.content
+        metadata, body = read_post(path)
+        return SprintFrontmatter(**metadata), body
 
     def list_sprints(self, status: Optional[str] = None) -> list[SprintFrontmatter]:
         """List all sprints, optionally filtered by status."""
@@ -1266,8 +2146,7 @@ class Store:
         sprints = []
         for path in sorted(self.sprints_dir.glob("*.md")):
             try:
-                post = frontmatter.load(str(path))
-                meta = SprintFrontmatter(**post.metadata)
+                meta = SprintFrontmatter(**read_meta(path))
                 if status is None or meta.status.value == status:
                     sprints.append(meta)
             except Exception:
@@ -1319,11 +2198,9 @@ class Store:
 
         meta.updated = date.today()
 
-        post = frontmatter.Post(
-            content=body,
-            **meta.model_dump(mode="json"),
+        self._sprint_path(sprint_id).write_text(
+            dump_post(meta.model_dump(mode="json"), body)
         )
-        self._sprint_path(sprint_id).write_text(frontmatter.dumps(post))
         self._emit_log(EventType.update, sprint_id, ItemType.sprint, changes=changes)
         return meta
 
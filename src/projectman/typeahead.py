@@ -0,0 +1,106 @@
+"""Prefix index over item IDs and titles for search-box suggestions.
+
+Suggestions must come back on every keystroke, so they are served from
+sorted arrays searched with bisect rather than from the search index or
+the embedding model.  Keys are lowercased with whitespace collapsed: one
+per item ID, and one per word of each title, running from that word to
+the end of the title (cut to KEY_CHARS), so "log" suggests both
+"Login page" and "Audit log export".
+
+The index for a project is rebuilt from the keyword index (search.py)
+when that index's generation changes.
+"""
+
+import threading
+from bisect import bisect_left
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+from .search import get_search_index
+
+# Title keys are cut to this many characters; prefixes are matched on at
+# most this many characters too.
+KEY_CHARS = 48
+
+
+@dataclass
+class Suggestion:
+    id: str
+    title: str
+    type: str
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+class PrefixIndex:
+    """Sorted ID and title-word keys for a set of items."""
+
+    def __init__(self, items: Iterable[tuple[str, str, str]]) -> None:
+        self._items = [
+            Suggestion(item_id, title or "", item_type) for item_id, title, item_type in items
+        ]
+        ids = sorted((item.id.lower(), i) for i, item in enumerate(self._items))
+        words = []
+        for i, item in enumerate(self._items):
+            title = _normalize(item.title)
+            start = 0
+            while start < len(title):
+                words.append((title[start:start + KEY_CHARS], i))
+                space = title.find(" ", start)
+                if space < 0:
+                    break
+                start = space + 1
+        words.sort()
+        self._id_keys = [key for key, _ in ids]
+        self._id_rows = [i for _, i in ids]
+        self._word_keys = [key for key, _ in words]
+        self._word_rows = [i for _, i in words]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def complete(self, prefix: str, limit: int = 10) -> list[Suggestion]:
+        """Return up to limit items whose ID or a title word starts with prefix.
+
+        ID matches come first, then title matches, each in key order.
+        """
+        prefix = _normalize(prefix)[:KEY_CHARS]
+        if not prefix or limit <= 0:
+            return []
+        found: dict[int, None] = {}
+        for keys, rows in ((self._id_keys, self._id_rows), (self._word_keys, self._word_rows)):
+            pos = bisect_left(keys, prefix)
+            while pos < len(keys) and keys[pos].startswith(prefix):
+                found.setdefault(rows[pos])
+                if len(found) >= limit:
+                    return [self._items[i] for i in found]
+                pos += 1
+        return [self._items[i] for i in found]
+
+
+_indexes: dict[str, tuple[int, PrefixIndex]] = {}
+_indexes_lock = threading.Lock()
+
+
+def suggest(project_dir: Path, prefix: str, limit: int = 10) -> list[Suggestion]:
+    """Return typeahead suggestions for prefix from project_dir's items.
+
+    The keyword index is re-scanned in the background (see
+    SearchIndex.refresh_in_background), so external edits show up on a
+    later keystroke rather than slowing this one.
+    """
+    search_index = get_search_index(project_dir)
+    key = str(project_dir)
+    with _indexes_lock:
+        cached = _indexes.get(key)
+    if cached is None or cached[0] != search_index.generation:
+        generation, items = search_index.titles()
+        cached = (generation, PrefixIndex(items))
+        with _indexes_lock:
+            _indexes[key] = cached
+    else:
+        search_index.refresh_in_background()
+    return cached[1].complete(prefix, limit)
@@ -144,7 +144,7 @@ def get_epic(epic_id: str, store: Store = Depends(get_store)) -> dict:
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail=f"Epic not found: {epic_id}")
 
-    linked_stories = [s for s in store.list_stories() if s.epic_id == epic_id]
+    linked_stories = store.list_stories(epic_id=epic_id)
     story_data = []
     total_points = 0
     completed_points = 0
@@ -347,15 +347,14 @@ def grab_task(
     body: GrabTaskRequest = GrabTaskRequest(),
     store: Store = Depends(get_store),
 ) -> dict:
-    """Claim a task — validates readiness, assigns, sets in-progress."""
-    from projectman.readiness import check_readiness
+    """Claim a task — validates readiness, takes its lease, assigns, sets in-progress."""
+    from projectman.leases import claim
 
     try:
-        task_meta, task_body = store.get_task(task_id)
+        readiness = claim(store, task_id, body.assignee)
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail=f"Task not found: {task_id}")
 
-    readiness = check_readiness(task_meta, task_body, store)
     if not readiness["ready"]:
         raise HTTPException(
             status_code=409,
@@ -381,6 +380,7 @@ def grab_task(
         "task": task_meta.model_dump(mode="json"),
         "body": task_body,
         "story_context": story_context,
+        "lease": readiness["lease"].to_dict(),
     }
 
 
@@ -404,55 +404,24 @@ def api_board(
     store: Store = Depends(get_store),
 ) -> dict:
     """Task board grouped by status columns with readiness indicators."""
-    from projectman.readiness import check_readiness, compute_hints
-
-    all_tasks = store.list_tasks()
-    story_cache = {s.id: s for s in store.list_stories()}
-
-    available = []
-    not_ready = []
-    in_progress = []
-    in_review = []
-    blocked = []
-
-    for task in all_tasks:
-        _, task_body = store.get_task(task.id)
-        story = story_cache.get(task.story_id)
-        story_label = f"{story.id} — {story.title}" if story else task.story_id
-
-        if assignee and task.assignee != assignee:
-            continue
-
-        entry = {
-            "id": task.id,
-            "title": task.title,
-            "points": task.points,
-            "assignee": task.assignee,
-            "story": story_label,
+    from projectman.board import get_board
+
+    columns = get_board(store).filtered(assignee=assignee)
+
+    def entry(item) -> dict:
+        return {
+            "id": item.task.id,
+            "title": item.task.title,
+            "points": item.task.points,
+            "assignee": item.task.assignee,
+            "story": item.story_label,
         }
 
-        if task.status.value == "in-progress":
-            in_progress.append(entry)
-        elif task.status.value == "review":
-            in_review.append(entry)
-        elif task.status.value == "blocked":
-            blocked.append(entry)
-        elif task.status.value == "todo" and not assignee:
-            readiness = check_readiness(task, task_body, store)
-            if readiness["ready"]:
-                priority_order = {"must": 0, "should": 1, "could": 2, "wont": 3}
-                sort_key = (
-                    priority_order.get(story.priority.value if story else "should", 1),
-                    task.story_id,
-                    task.id,
-                )
-                available.append({**entry, "_sort": sort_key})
-            else:
-                not_ready.append({**entry, "blockers": readiness["blockers"]})
-
-    available.sort(key=lambda t: t["_sort"])
-    for t in available:
-        del t["_sort"]
+    available = [entry(item) for item in columns["available"]]
+    not_ready = [{**entry(item), "blockers": item.blockers} for item in columns["not_ready"]]
+    in_progress = [entry(item) for item in columns["in_progress"]]
+    in_review = [entry(item) for item in columns["in_review"]]
+    blocked = [entry(item) for item in columns["blocked"]]
 
     return {
         "board": {
@@ -472,6 +441,40 @@ def api_board(
     }
 
 
+@router.get("/ready")
+def api_ready(
+    limit: int = Query(10, ge=1, le=100),
+    store: Store = Depends(get_store),
+) -> list[dict]:
+    """Ready, unassigned tasks in the order pm_done_next picks them."""
+    from projectman.ready_queue import get_ready_queue
+
+    return [t.model_dump(mode="json") for t in get_ready_queue(store).peek(limit)]
+
+
+@router.get("/schedule")
+def api_schedule(
+    agents: int = Query(4, ge=1, le=1000),
+    compare: bool = Query(False),
+    store: Store = Depends(get_store),
+) -> dict:
+    """Critical path, earliest starts and a list schedule of the remaining tasks."""
+    from projectman.deps import CycleError
+    from projectman.schedule import plan_schedule
+
+    try:
+        plan = plan_schedule(
+            store.list_tasks(), store.list_stories(), agents, compare=compare
+        )
+    except CycleError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return {
+        **vars(plan),
+        "parallelism": round(plan.parallelism, 2),
+        "tasks": [vars(task) for task in plan.tasks],
+    }
+
+
 @router.get("/burndown")
 def api_burndown(store: Store = Depends(get_store)) -> dict:
     """Burndown data: total vs completed points."""
@@ -504,30 +507,28 @@ def api_audit(root: Path = Depends(get_root)) -> dict:
 @router.get("/search")
 def api_search(
     q: str = Query(..., min_length=1),
+    tag: Optional[str] = None,
+    status: Optional[str] = None,
+    type: Optional[str] = None,
+    epic_id: Optional[str] = None,
     proj_dir: Path = Depends(get_project_dir),
 ) -> list[dict]:
-    """Search stories and tasks by keyword."""
+    """Search stories and tasks, optionally filtered by tag, status, type or epic.
+
+    Keyword and semantic rankings are fused; an item ID returns that item.
+    """
+    from projectman.hybrid import hybrid_search
+
+    filters = {"tag": tag, "status": status, "item_type": type, "epic_id": epic_id}
+    query_vec = None
     try:
-        from projectman.embeddings import EmbeddingStore
-
-        emb_store = EmbeddingStore(proj_dir)
-        results = emb_store.search(q, top_k=10)
-        if results:
-            return [
-                {
-                    "id": r.id,
-                    "title": r.title,
-                    "type": r.type,
-                    "score": round(r.score, 3),
-                }
-                for r in results
-            ]
+        from projectman.embeddings import embed_query
+
+        query_vec = embed_query(q)
     except (ImportError, Exception):
         pass
 
-    from projectman.search import keyword_search
-
-    results = keyword_search(q, proj_dir)
+    results = hybrid_search(q, proj_dir, top_k=10, query_vec=query_vec, **filters)
     return [
         {
             "id": r.id,
@@ -540,6 +541,25 @@ def api_search(
     ]
 
 
+@router.get("/search/suggest")
+def api_search_suggest(
+    q: str = Query("", max_length=200),
+    limit: int = Query(10, ge=1, le=50),
+    proj_dir: Path = Depends(get_project_dir),
+) -> list[dict]:
+    """Typeahead: items whose ID or a title word starts with q.
+
+    Served from an in-memory prefix index, without running the embedding
+    model, so it can be called on every keystroke.
+    """
+    from projectman.typeahead import suggest
+
+    return [
+        {"id": s.id, "title": s.title, "type": s.type}
+        for s in suggest(proj_dir, q, limit=limit)
+    ]
+
+
 # ─── Documentation ───────────────────────────────────────────────
 
 _DOC_MAP = {
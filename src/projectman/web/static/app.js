@@ -107,3 +107,38 @@ document.addEventListener("htmx:responseError", function (evt) {
     })
     .catch(function() { /* non-critical */ });
 })();
+
+// Search box typeahead: suggestions come from /api/search/suggest (a prefix
+// index, no embedding); the full search runs only when the form is submitted.
+(function() {
+  var input = document.querySelector('nav input[name="q"]');
+  var list = document.getElementById("search-suggestions");
+  if (!input || !list) return;
+  var timer = null;
+  var latest = "";
+  input.addEventListener("input", function() {
+    clearTimeout(timer);
+    var q = input.value.trim();
+    if (!q) { list.innerHTML = ""; return; }
+    timer = setTimeout(function() {
+      latest = q;
+      var url = new URL("/api/search/suggest", window.location.origin);
+      url.searchParams.set("q", q);
+      var project = new URLSearchParams(window.location.search).get("project");
+      if (project) url.searchParams.set("project", project);
+      fetch(url)
+        .then(function(r) { return r.json(); })
+        .then(function(items) {
+          if (q !== latest) return;  // a newer keystroke is in flight
+          list.innerHTML = "";
+          items.forEach(function(item) {
+            var opt = document.createElement("option");
+            opt.value = item.id;
+            opt.label = item.title;
+            list.appendChild(opt);
+          });
+        })
+        .catch(function() { /* non-critical */ });
+    }, 80);
+  });
+})();
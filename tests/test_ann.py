@@ -0,0 +1,64 @@
+"""Tests for the NumPy IVF index."""
+
+import numpy as np
+
+from projectman import ann
+
+
+def _blobs(n_clusters=8, per_cluster=50, dim=16, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((n_clusters, dim)) * 5
+    labels = np.repeat(np.arange(n_clusters), per_cluster)
+    vectors = (centers[labels] + rng.standard_normal((len(labels), dim))).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True), labels
+
+
+def test_list_count():
+    assert ann.list_count(0) == 1
+    assert ann.list_count(10000) == 100
+
+
+def _mean_similarity(vectors, centroids):
+    return float(np.mean(np.max(vectors @ centroids.T, axis=1)))
+
+
+def test_kmeans_improves_on_its_initial_centroids():
+    vectors, _ = _blobs()
+    initial = ann.train_centroids(vectors, 8, iterations=0)
+    centroids = ann.train_centroids(vectors, 8)
+
+    assert centroids.shape == (8, 16)
+    np.testing.assert_allclose(np.linalg.norm(centroids, axis=1), 1.0, rtol=1e-5)
+    assert _mean_similarity(vectors, centroids) > _mean_similarity(vectors, initial)
+    assert _mean_similarity(vectors, centroids) > 0.9
+
+
+def test_nearest_centroids_ignores_int8_scale():
+    vectors, _ = _blobs()
+    centroids = ann.train_centroids(vectors, 8)
+    quantized = np.rint(vectors * 127).astype(np.int8)
+    scales = np.random.default_rng(1).uniform(0.001, 0.01, size=(len(vectors), 1))
+
+    np.testing.assert_array_equal(
+        ann.nearest_centroids(quantized, centroids),
+        ann.nearest_centroids(quantized * scales.astype(np.float32), centroids),
+    )
+
+
+def test_candidates_cover_probed_clusters():
+    vectors, _ = _blobs()
+    centroids = ann.train_centroids(vectors, 8)
+    assigned = ann.nearest_centroids(vectors, centroids)
+    lists = ann.InvertedLists(centroids, assigned)
+
+    rows = lists.candidates(vectors[0], nprobe=1)
+    assert sorted(rows.tolist()) == np.flatnonzero(assigned == assigned[0]).tolist()
+    assert len(lists.candidates(vectors[0], nprobe=100)) == len(vectors)
+
+
+def test_needs_training():
+    centroids = np.ones((10, 4), dtype=np.float32)
+    assert ann.needs_training(None, 100, 4)
+    assert ann.needs_training(centroids, 100, 8)
+    assert not ann.needs_training(centroids, 300, 4)
+    assert ann.needs_training(centroids, 400, 4)
@@ -0,0 +1,108 @@
+"""Tests for the shared task board engine."""
+
+from projectman.board import get_board
+from projectman.readiness import check_readiness
+
+GOOD_BODY = """\
+## Implementation
+
+Add the login endpoint to the API router and validate the credentials.
+
+## Testing
+
+Run pytest tests/test_auth.py.
+
+- [ ] Endpoint works
+"""
+
+
+def _ids(entries):
+    return [entry.task.id for entry in entries]
+
+
+def _active_story(store, title="Story", **kwargs):
+    story, _ = store.create_story(title, "Description", **kwargs)
+    store.update(story.id, status="active")
+    return story
+
+
+class TestBoard:
+    def test_board_is_reused_until_a_change(self, store):
+        story = _active_story(store)
+        store.create_task(story.id, "Task", GOOD_BODY, points=3)
+
+        board = get_board(store)
+        assert get_board(store) is board
+        assert _ids(board.columns["available"]) == ["US-TST-1-1"]
+
+        store.update("US-TST-1-1", status="in-progress", assignee="alice")
+        board = get_board(store)
+        assert _ids(board.columns["in_progress"]) == ["US-TST-1-1"]
+        assert board.columns["available"] == []
+
+    def test_external_edit_rebuilds(self, store):
+        story = _active_story(store)
+        store.create_task(story.id, "Task", GOOD_BODY, points=3)
+        get_board(store)
+
+        path = store.tasks_dir / "US-TST-1-1.md"
+        path.write_text(path.read_text().replace("status: todo", "status: blocked"))
+        assert _ids(get_board(store).columns["blocked"]) == ["US-TST-1-1"]
+
+    def test_lists_items_once_per_build(self, store, monkeypatch):
+        story = _active_story(store)
+        for i in range(4):
+            store.create_task(story.id, f"Task {i}", GOOD_BODY, points=3)
+        for i in range(2, 5):
+            store.update(f"US-TST-1-{i}", depends_on=[f"US-TST-1-{i - 1}"])
+
+        calls = []
+        original = store.list_tasks
+        monkeypatch.setattr(store, "list_tasks", lambda **kw: calls.append(kw) or original(**kw))
+        board = get_board(store)
+
+        assert len(calls) == 1
+        assert _ids(board.columns["available"]) == ["US-TST-1-1"]
+        assert _ids(board.columns["not_ready"]) == ["US-TST-1-2", "US-TST-1-3", "US-TST-1-4"]
+
+    def test_available_in_priority_then_dependency_order(self, store):
+        low = _active_story(store, "Low", priority="could")
+        high = _active_story(store, "High", priority="must")
+        store.create_task(low.id, "Low task", GOOD_BODY, points=1)
+        store.create_task(high.id, "Second", GOOD_BODY, points=1)
+        store.create_task(high.id, "First", GOOD_BODY, points=5)
+        store.update("US-TST-2-1", depends_on=["US-TST-2-2"])
+        store.update("US-TST-2-2", status="done")
+
+        assert _ids(get_board(store).columns["available"]) == ["US-TST-2-1", "US-TST-1-1"]
+
+    def test_filters(self, store):
+        story = _active_story(store, tags=["api"])
+        store.create_task(story.id, "Mine", GOOD_BODY, points=3)
+        store.create_task(story.id, "Free", GOOD_BODY, points=3)
+        store.update("US-TST-1-1", status="in-progress", assignee="alice")
+
+        board = get_board(store)
+        assert _ids(board.filtered(tag="api")["available"]) == ["US-TST-1-2"]
+        assert board.filtered(tag="web")["available"] == []
+        mine = board.filtered(assignee="alice")
+        assert _ids(mine["in_progress"]) == ["US-TST-1-1"]
+        assert mine["available"] == []
+
+
+def test_readiness_with_status_map_matches_without(store):
+    from projectman.deps import build_status_map
+
+    story = _active_story(store)
+    store.create_task(story.id, "Dep", GOOD_BODY, points=3)
+    store.create_task(story.id, "Task", GOOD_BODY, points=3, depends_on=["US-TST-1-1"])
+    other, _ = store.create_story("Archived", "Description")
+    store.create_task(other.id, "Orphan", GOOD_BODY, points=3)
+    store.update(other.id, status="archived")
+
+    status_map = build_status_map(store.list_tasks(), store.list_stories())
+    for task_id in ("US-TST-1-1", "US-TST-1-2", "US-TST-2-1"):
+        meta, body = store.get_task(task_id)
+        assert check_readiness(meta, body, store, status_map=status_map) == check_readiness(
+            meta, body, store
+        )
@@ -1,17 +1,20 @@
 """Tests for dependency graph utilities."""
 
+import sys
 from datetime import date
 
 import pytest
 
 from projectman.deps import (
     CycleError,
+    DependencyGraph,
     build_combined_dep_graph,
     build_dep_graph,
     detect_cycle,
     incomplete_dependencies,
     incomplete_story_dependencies,
     incomplete_task_dependencies,
+    topological_order,
     topological_sort,
 )
 from projectman.models import StoryFrontmatter, TaskFrontmatter
@@ -148,6 +151,60 @@ class TestDetectCycle:
         assert len(cycle) == 4  # e.g. [A, B, C, A]
         assert set(cycle[:-1]) == {"PRJ-1-1", "PRJ-1-2", "PRJ-1-3"}
 
+    def test_chain_longer_than_recursion_limit(self):
+        n = sys.getrecursionlimit() * 2
+        graph = {f"PRJ-1-{i}": [f"PRJ-1-{i + 1}"] for i in range(n)}
+        graph[f"PRJ-1-{n}"] = []
+        assert detect_cycle(graph) is None
+        graph[f"PRJ-1-{n}"] = ["PRJ-1-0"]
+        assert len(detect_cycle(graph)) == n + 2
+
+
+# ── DependencyGraph ──────────────────────────────────────────────────
+
+
+class TestDependencyGraph:
+    def test_forward_and_reverse_edges(self):
+        graph = DependencyGraph()
+        graph.set("PRJ-1-2", ["PRJ-1-1", "PRJ-1"])
+        graph.set("PRJ-1-3", ["PRJ-1-1"])
+        assert graph.dependencies("PRJ-1-2") == ["PRJ-1-1", "PRJ-1"]
+        assert graph.dependents("PRJ-1-1") == {"PRJ-1-2", "PRJ-1-3"}
+
+        graph.set("PRJ-1-2", [])
+        graph.discard("PRJ-1-3")
+        assert graph.dependents("PRJ-1-1") == set()
+        assert "PRJ-1-3" not in graph
+
+    def test_unknown_ids_are_kept_but_not_followed(self):
+        graph = DependencyGraph()
+        graph.set("PRJ-1-1", ["PRJ-1-2"])
+        assert graph.as_dict() == {"PRJ-1-1": []}
+        assert graph.find_cycle() is None
+        graph.set("PRJ-1-2", ["PRJ-1-1"])
+        assert graph.find_cycle() == ["PRJ-1-1", "PRJ-1-2", "PRJ-1-1"]
+
+    def test_find_cycle_from_start_ignores_unreachable_cycles(self):
+        graph = DependencyGraph()
+        graph.set("PRJ-1-1", ["PRJ-1-2"])
+        graph.set("PRJ-1-2", ["PRJ-1-1"])
+        graph.set("PRJ-1-3", [])
+        graph.set("PRJ-1-4", ["PRJ-1-3"])
+        assert graph.find_cycle(["PRJ-1-4"]) is None
+        graph.set("PRJ-1-3", ["PRJ-1-1"])
+        assert graph.find_cycle(["PRJ-1-4"]) == ["PRJ-1-1", "PRJ-1-2", "PRJ-1-1"]
+
+    def test_find_cycle_matches_detect_cycle(self):
+        edges = {
+            "PRJ-1-1": ["PRJ-1-3"],
+            "PRJ-1-2": ["PRJ-1-1"],
+            "PRJ-1-3": ["PRJ-1-2", "PRJ-9"],
+        }
+        graph = DependencyGraph()
+        for item_id, deps in edges.items():
+            graph.set(item_id, deps)
+        assert graph.find_cycle() == detect_cycle(edges)
+
 
 # ── CycleError ───────────────────────────────────────────────────────
 
@@ -257,6 +314,22 @@ class TestTopologicalSort:
 # ── incomplete_dependencies ──────────────────────────────────────────
 
 
+class TestTopologicalOrder:
+    def test_combined_graph_orders_stories_and_tasks(self):
+        graph = {
+            "PRJ-2": ["PRJ-1"],
+            "PRJ-1": [],
+            "PRJ-2-1": ["PRJ-2", "PRJ-9"],
+            "PRJ-1-1": [],
+        }
+        assert topological_order(graph) == ["PRJ-1", "PRJ-1-1", "PRJ-2", "PRJ-2-1"]
+
+    def test_cycle_raises_with_path(self):
+        with pytest.raises(CycleError) as exc_info:
+            topological_order({"A": ["B"], "B": ["A"], "C": []})
+        assert exc_info.value.cycle == ["A", "B", "A"]
+
+
 class TestIncompleteDependencies:
     def test_all_done(self):
         siblings = [
@@ -1,6 +1,7 @@
 """Tests for embedding store -- skipped if fastembed not available."""
 
 import sqlite3
+import threading
 
 import pytest
 
@@ -251,3 +252,703 @@ class TestVectorRoundtrip:
         blob = emb._encode_vector(original)
         decoded = emb._decode_vector(blob)
         np.testing.assert_allclose(decoded, original, rtol=1e-6)
+
+
+class _HashingModel:
+    """Stand-in for the fastembed model: normalized bag-of-words hashing."""
+
+    dim = 32
+
+    def __init__(self):
+        self.calls = []
+
+    def embed(self, texts, batch_size=256):
+        import numpy as np
+
+        self.calls.append(len(texts))
+        for text in texts:
+            vec = np.zeros(self.dim, dtype=np.float32)
+            for word in text.lower().split():
+                vec[sum(map(ord, word)) % self.dim] += 1.0
+            norm = np.linalg.norm(vec)
+            yield vec / norm if norm else vec
+
+
+@pytest.fixture
+def hashing_emb(tmp_project):
+    from projectman.embeddings import EmbeddingStore
+
+    emb = EmbeddingStore(tmp_project / ".project")
+    emb._model = _HashingModel()
+    return emb
+
+
+class TestVectorizedSearch:
+    def test_matches_per_row_dot_product(self, hashing_emb):
+        import numpy as np
+
+        model = hashing_emb.model
+        texts = {f"US-TST-{i}": f"story number {i} about topic{i % 3}" for i in range(1, 30)}
+        for item_id, text in texts.items():
+            hashing_emb.index_item(item_id, text, "story", "")
+
+        query = next(model.embed(["story about topic1"]))
+        brute = sorted(
+            ((float(np.dot(query, next(model.embed([text])))), item_id)
+             for item_id, text in texts.items()),
+            key=lambda pair: -pair[0],
+        )[:5]
+
+        results = hashing_emb.search("story about topic1", top_k=5)
+        assert [r.score for r in results] == pytest.approx([score for score, _ in brute])
+        assert all(r.title == texts[r.id] and r.type == "story" for r in results)
+
+    def test_matrix_loaded_once_and_patched_on_write(self, hashing_emb, monkeypatch):
+        from projectman.embeddings import EmbeddingStore
+
+        reloads = []
+        original = EmbeddingStore._reload_matrix
+
+        def counting_reload(self, fingerprint):
+            reloads.append(fingerprint)
+            return original(self, fingerprint)
+
+        monkeypatch.setattr(EmbeddingStore, "_reload_matrix", counting_reload)
+        hashing_emb.index_item("US-TST-1", "alpha", "story", "")
+        hashing_emb.search("alpha")
+        hashing_emb.search("beta")
+        assert len(reloads) == 1
+
+        # Our own writes update the loaded matrix instead of reloading it.
+        hashing_emb.index_item("US-TST-2", "beta", "story", "")
+        assert [r.id for r in hashing_emb.search("beta", top_k=1)] == ["US-TST-2"]
+        hashing_emb.index_item("US-TST-1", "gamma", "task", "")
+        result = hashing_emb.search("gamma", top_k=1)[0]
+        assert (result.id, result.title, result.type) == ("US-TST-1", "gamma", "task")
+        assert result.score == pytest.approx(1.0)
+        assert len(reloads) == 1
+
+    def test_sees_rows_written_by_another_instance(self, hashing_emb, tmp_project):
+        from projectman.embeddings import EmbeddingStore
+
+        hashing_emb.index_item("US-TST-1", "alpha", "story", "")
+        assert len(hashing_emb.search("alpha")) == 1
+
+        other = EmbeddingStore(tmp_project / ".project")
+        other._model = _HashingModel()
+        other.index_item("US-TST-2", "beta gamma delta", "task", "")
+
+        results = hashing_emb.search("beta gamma delta")
+        assert [(r.id, r.type) for r in results][0] == ("US-TST-2", "task")
+        assert len(results) == 2
+
+    def test_empty_index_and_zero_top_k(self, hashing_emb):
+        assert hashing_emb.search("anything") == []
+        hashing_emb.index_item("US-TST-1", "alpha", "story", "")
+        assert hashing_emb.search("alpha", top_k=0) == []
+
+
+class TestSharedInstances:
+    def test_registry_returns_one_store_per_project(self, tmp_project, tmp_path):
+        from projectman.embeddings import get_embedding_store
+
+        proj_dir = tmp_project / ".project"
+        assert get_embedding_store(proj_dir) is get_embedding_store(proj_dir)
+
+        other = tmp_path / "other"
+        other.mkdir()
+        assert get_embedding_store(other) is not get_embedding_store(proj_dir)
+
+    def test_registry_reopens_after_db_removed(self, tmp_project):
+        from projectman.embeddings import get_embedding_store
+
+        proj_dir = tmp_project / ".project"
+        first = get_embedding_store(proj_dir)
+        (proj_dir / "embeddings.db").unlink()
+
+        second = get_embedding_store(proj_dir)
+        assert second is not first
+        assert (proj_dir / "embeddings.db").exists()
+
+    def test_stores_share_the_process_model(self, tmp_project, tmp_path, monkeypatch):
+        import projectman.embeddings as embeddings
+        from projectman.embeddings import EmbeddingStore
+
+        model = _HashingModel()
+        monkeypatch.setattr(embeddings, "_model", model)
+        other = tmp_path / "other"
+        other.mkdir()
+
+        assert EmbeddingStore(tmp_project / ".project").model is model
+        assert EmbeddingStore(other).model is model
+
+    def test_preload_warms_model_in_background(self, monkeypatch):
+        import projectman.embeddings as embeddings
+
+        loaded = []
+        monkeypatch.setattr(embeddings, "get_model", lambda: loaded.append(1))
+        embeddings.preload_model().join(timeout=5)
+        assert loaded == [1]
+
+    def test_preload_swallows_missing_fastembed(self, monkeypatch):
+        import projectman.embeddings as embeddings
+
+        def missing():
+            raise ImportError("no fastembed")
+
+        monkeypatch.setattr(embeddings, "get_model", missing)
+        thread = embeddings.preload_model()
+        thread.join(timeout=5)
+        assert not thread.is_alive()
+
+
+class TestQueryCache:
+    def test_equivalent_queries_embed_once(self, monkeypatch):
+        import projectman.embeddings as embeddings
+
+        model = _HashingModel()
+        monkeypatch.setattr(embeddings, "_model", model)
+        first = embeddings.embed_query("Login  Page")
+        second = embeddings.embed_query(" login page")
+
+        assert model.calls == [1]
+        assert second is first
+        assert not first.flags.writeable
+
+    def test_new_model_is_not_served_stale_vectors(self, monkeypatch):
+        import projectman.embeddings as embeddings
+
+        monkeypatch.setattr(embeddings, "_model", _HashingModel())
+        embeddings.embed_query("login")
+        model = _HashingModel()
+        monkeypatch.setattr(embeddings, "_model", model)
+        embeddings.embed_query("login")
+        assert model.calls == [1]
+
+    def test_least_recently_used_query_is_evicted(self, monkeypatch):
+        import projectman.embeddings as embeddings
+
+        model = _HashingModel()
+        monkeypatch.setattr(embeddings, "_model", model)
+        monkeypatch.setattr(embeddings, "QUERY_CACHE_SIZE", 2)
+        for query in ("a", "b", "a", "c", "a", "b"):
+            embeddings.embed_query(query)
+        assert model.calls == [1, 1, 1, 1]  # a, b, c, then b again
+
+
+class TestBatchedReindex:
+    def _store_with_items(self, tmp_project, n):
+        store = Store(tmp_project)
+        store.create_story("Story", "Body", tags=["api"])
+        for i in range(n - 1):
+            store.create_task("US-TST-1", f"Task {i}", f"Body {i}")
+        return store
+
+    def test_embeds_in_batches_and_reports_progress(self, tmp_project, hashing_emb):
+        store = self._store_with_items(tmp_project, 7)
+        progress = []
+
+        updated = hashing_emb.reindex_all(
+            store, batch_size=3, progress=lambda done, total: progress.append((done, total))
+        )
+
+        assert updated == 7
+        assert hashing_emb.model.calls == [3, 3, 1]
+        assert progress == [(3, 7), (6, 7), (7, 7)]
+        assert len(hashing_emb.search("task", top_k=10)) == 7
+
+    def test_only_changed_items_are_embedded(self, tmp_project, hashing_emb):
+        store = self._store_with_items(tmp_project, 4)
+        hashing_emb.reindex_all(store)
+        hashing_emb.model.calls.clear()
+
+        assert hashing_emb.reindex_all(store) == 0
+        assert hashing_emb.model.calls == []
+
+        store.update("US-TST-1-2", body="Changed")
+        assert hashing_emb.reindex_all(store) == 1
+        assert hashing_emb.model.calls == [1]
+
+    def test_failure_writes_nothing(self, tmp_project, hashing_emb):
+        store = self._store_with_items(tmp_project, 5)
+        model = hashing_emb.model
+        original = model.embed
+
+        def failing_embed(texts, batch_size=256):
+            if model.calls:
+                raise RuntimeError("model crashed")
+            return original(texts, batch_size)
+
+        model.embed = failing_embed
+        with pytest.raises(RuntimeError):
+            hashing_emb.reindex_all(store, batch_size=2)
+
+        conn = sqlite3.connect(str(hashing_emb.db_path))
+        count = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        conn.close()
+        assert count == 0
+
+    def test_concurrent_call_waits_for_failing_one(self, tmp_project, hashing_emb):
+        import threading
+
+        store = self._store_with_items(tmp_project, 5)
+        model = hashing_emb.model
+        original = model.embed
+        blocked, release = threading.Event(), threading.Event()
+
+        def embed(texts, batch_size=256):
+            if threading.current_thread().name == "failing" and model.calls:
+                blocked.set()
+                release.wait(5)
+                raise RuntimeError("model crashed")
+            return original(texts, batch_size)
+
+        def failing():
+            with pytest.raises(RuntimeError):
+                hashing_emb.reindex_all(store, batch_size=2)
+
+        model.embed = embed
+        first = threading.Thread(target=failing, name="failing")
+        first.start()
+        assert blocked.wait(5)
+        second = threading.Thread(
+            target=hashing_emb.index_item, args=("EXTRA", "Extra", "task", "Body")
+        )
+        second.start()
+        second.join(0.2)
+        assert second.is_alive()
+        release.set()
+        first.join(5)
+        second.join(5)
+
+        conn = sqlite3.connect(str(hashing_emb.db_path))
+        ids = [row[0] for row in conn.execute("SELECT id FROM embeddings")]
+        conn.close()
+        assert ids == ["EXTRA"]
+
+
+class _TableModel:
+    """Stand-in model returning fixed random unit vectors for "v<i>" / "q<i>" texts."""
+
+    def __init__(self, n_items, n_queries, dim=64, seed=0):
+        import numpy as np
+
+        rng = np.random.default_rng(seed)
+        self.items = rng.standard_normal((n_items, dim)).astype(np.float32)
+        self.items /= np.linalg.norm(self.items, axis=1, keepdims=True)
+        self.queries = rng.standard_normal((n_queries, dim)).astype(np.float32)
+        self.queries /= np.linalg.norm(self.queries, axis=1, keepdims=True)
+
+    def embed(self, texts, batch_size=256):
+        for text in texts:
+            table = self.queries if text.startswith("q") else self.items
+            yield table[int(text.split()[0][1:])]
+
+
+class TestQuantizedStorage:
+    @pytest.mark.parametrize("encoding, size", [("float32", 20), ("float16", 10), ("int8", 9)])
+    def test_encode_decode_roundtrip(self, encoding, size):
+        import numpy as np
+
+        from projectman.embeddings import decode_vector, encode_vector
+
+        original = [0.1, 0.2, 0.3, -0.5, 0.99]
+        blob = encode_vector(original, encoding)
+        assert len(blob) == size
+        np.testing.assert_allclose(decode_vector(blob, encoding), original, atol=5e-3)
+
+    def test_unknown_encoding_rejected(self, tmp_project):
+        from projectman.embeddings import EmbeddingStore
+
+        with pytest.raises(ValueError, match="bfloat16"):
+            EmbeddingStore(tmp_project / ".project", encoding="bfloat16")
+
+    @pytest.mark.parametrize("encoding", ["float16", "int8"])
+    def test_search_matches_float32(self, tmp_project, tmp_path, encoding):
+        from projectman.embeddings import EmbeddingStore
+
+        quantized = EmbeddingStore(tmp_project / ".project", encoding=encoding)
+        (tmp_path / "full").mkdir()
+        full = EmbeddingStore(tmp_path / "full")
+        for emb in (quantized, full):
+            emb._model = _HashingModel()
+            for i in range(1, 20):
+                emb.index_item(f"US-TST-{i}", f"story {i} about topic{i % 4}", "story", "")
+
+        got = quantized.search("story about topic2", top_k=3)
+        want = full.search("story about topic2", top_k=3)
+        assert {r.id for r in got} == {r.id for r in want}
+        assert [r.score for r in got] == pytest.approx([r.score for r in want], abs=2e-2)
+        assert quantized._matrix.dtype.name == encoding
+
+    def test_migrates_version_0_database(self, tmp_project):
+        import struct
+
+        from projectman.embeddings import SCHEMA_VERSION, EmbeddingStore
+
+        proj_dir = tmp_project / ".project"
+        vector = next(_HashingModel().embed(["alpha"]))
+        conn = sqlite3.connect(str(proj_dir / "embeddings.db"))
+        conn.execute(
+            "CREATE TABLE embeddings (id TEXT PRIMARY KEY, title TEXT, type TEXT,"
+            " vector BLOB, content_hash TEXT)"
+        )
+        conn.execute(
+            "INSERT INTO embeddings VALUES (?, ?, ?, ?, ?)",
+            ("US-TST-1", "alpha", "story", struct.pack(f"{len(vector)}f", *vector), "x"),
+        )
+        conn.commit()
+        conn.close()
+
+        emb = EmbeddingStore(proj_dir, encoding="int8")
+        emb._model = _HashingModel()
+        assert [r.id for r in emb.search("alpha")] == ["US-TST-1"]
+        assert emb.search("alpha")[0].score == pytest.approx(1.0, abs=1e-2)
+
+        conn = sqlite3.connect(str(emb.db_path))
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+        encoding, blob = conn.execute("SELECT encoding, vector FROM embeddings").fetchone()
+        assert (encoding, len(blob)) == ("int8", 4 + len(vector))
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(embeddings)")}
+        conn.close()
+        assert "cluster" in columns
+
+    def test_rows_in_another_encoding_are_rescored(self, hashing_emb, tmp_project):
+        from projectman.embeddings import EmbeddingStore
+
+        hashing_emb.index_item("US-TST-1", "alpha", "story", "")
+        other = EmbeddingStore(tmp_project / ".project", encoding="float16")
+        other._model = _HashingModel()
+        other.index_item("US-TST-2", "beta", "story", "")
+
+        assert [r.id for r in hashing_emb.search("beta", top_k=1)] == ["US-TST-2"]
+        assert hashing_emb._matrix.dtype.name == "float32"
+
+    @pytest.mark.parametrize("encoding, min_recall", [("float16", 0.99), ("int8", 0.95)])
+    def test_recall_against_float32(self, tmp_project, tmp_path, monkeypatch, encoding, min_recall):
+        """Benchmark: recall@10 of quantized search, with float32 results as ground truth."""
+        import projectman.embeddings as embeddings
+        from projectman.embeddings import EmbeddingStore
+
+        monkeypatch.setattr(embeddings, "_SCORE_CHUNK_ROWS", 128)
+        model = _TableModel(n_items=1000, n_queries=20)
+        items = [(f"US-TST-{i}", f"v{i}", "story", "") for i in range(len(model.items))]
+        (tmp_path / "full").mkdir()
+        full = EmbeddingStore(tmp_path / "full")
+        quantized = EmbeddingStore(tmp_project / ".project", encoding=encoding)
+        for emb in (full, quantized):
+            emb._model = model
+            emb.index_items(items)
+
+        hits = 0
+        for q in range(len(model.queries)):
+            want = {r.id for r in full.search(f"q{q}", top_k=10)}
+            hits += len(want & {r.id for r in quantized.search(f"q{q}", top_k=10)})
+        assert hits / (10 * len(model.queries)) >= min_recall
+
+        full_size = full._matrix.nbytes
+        assert quantized._matrix.nbytes + (
+            quantized._scales.nbytes if quantized._scales is not None else 0
+        ) < full_size * (0.6 if encoding == "float16" else 0.35)
+
+
+class TestApproximateSearch:
+    def _stores(self, tmp_project, tmp_path, n=400, **kwargs):
+        from projectman.embeddings import EmbeddingStore
+
+        model = _TableModel(n_items=n, n_queries=10)
+        (tmp_path / "exact").mkdir()
+        exact = EmbeddingStore(tmp_path / "exact")
+        approx = EmbeddingStore(tmp_project / ".project", ann_threshold=200, **kwargs)
+        items = [(f"US-TST-{i}", f"v{i}", "story", "") for i in range(n)]
+        for emb in (exact, approx):
+            emb._model = model
+            emb.index_items(items)
+        return exact, approx
+
+    def test_exact_below_threshold(self, tmp_project, tmp_path):
+        exact, approx = self._stores(tmp_project, tmp_path, n=100)
+
+        assert [r.id for r in approx.search("q0")] == [r.id for r in exact.search("q0")]
+        assert approx._ivf is None
+        conn = sqlite3.connect(str(approx.db_path))
+        assert conn.execute("SELECT COUNT(*) FROM ivf_centroids").fetchone()[0] == 0
+        conn.close()
+
+    def test_probing_every_cluster_matches_exact(self, tmp_project, tmp_path):
+        exact, approx = self._stores(tmp_project, tmp_path, nprobe=1000)
+
+        for q in range(5):
+            got, want = approx.search(f"q{q}"), exact.search(f"q{q}")
+            assert [r.id for r in got] == [r.id for r in want]
+            assert [r.score for r in got] == pytest.approx([r.score for r in want])
+        assert approx._ivf is not None
+
+    def test_scores_only_probed_clusters(self, tmp_project, tmp_path):
+        _, approx = self._stores(tmp_project, tmp_path, nprobe=2)
+
+        results = approx.search("q0", top_k=5)
+        query = approx.model.queries[0]
+        candidates = approx._ivf.candidates(query, 2)
+        assert len(results) == 5
+        assert len(candidates) < 400
+        assert {r.id for r in results} <= {f"US-TST-{i}" for i in candidates}
+
+    def test_index_persists_and_new_items_are_assigned(self, tmp_project, tmp_path, monkeypatch):
+        import projectman.ann as ann_module
+        from projectman.embeddings import EmbeddingStore
+
+        _, approx = self._stores(tmp_project, tmp_path, nprobe=1000)
+        approx.search("q0")
+
+        def no_training(*args, **kwargs):
+            raise AssertionError("centroids should be reused")
+
+        monkeypatch.setattr(ann_module, "train_centroids", no_training)
+        reopened = EmbeddingStore(tmp_project / ".project", ann_threshold=200, nprobe=1000)
+        reopened._model = approx.model
+        reopened.index_item("US-TST-0", "q3", "story", "")  # now identical to query 3
+
+        conn = sqlite3.connect(str(reopened.db_path))
+        unassigned = conn.execute(
+            "SELECT COUNT(*) FROM embeddings WHERE cluster IS NULL"
+        ).fetchone()[0]
+        conn.close()
+        assert unassigned == 0
+        assert reopened.search("q3", top_k=1)[0].id == "US-TST-0"
+
+    @pytest.mark.parametrize("encoding", ["float32", "int8"])
+    def test_writes_patch_the_loaded_index(self, tmp_project, tmp_path, monkeypatch, encoding):
+        from projectman.embeddings import EmbeddingStore
+
+        _, approx = self._stores(tmp_project, tmp_path, nprobe=4, encoding=encoding)
+        approx.search("q0")
+        reloads = []
+        original = EmbeddingStore._reload_matrix
+
+        def counting_reload(self, fingerprint):
+            reloads.append(self)
+            return original(self, fingerprint)
+
+        monkeypatch.setattr(EmbeddingStore, "_reload_matrix", counting_reload)
+
+        # One re-embedded item and one new one
+        approx.index_items([("US-TST-0", "q3", "story", ""), ("US-TST-NEW", "q4", "task", "")])
+        assert approx.search("q3", top_k=1)[0].id == "US-TST-0"
+        assert [(r.id, r.type) for r in approx.search("q4", top_k=1)] == [("US-TST-NEW", "task")]
+        assert reloads == []
+
+        fresh = EmbeddingStore(
+            tmp_project / ".project", ann_threshold=200, nprobe=4, encoding=encoding
+        )
+        fresh._model = approx.model
+        for q in range(5):
+            got, want = approx.search(f"q{q}"), fresh.search(f"q{q}")
+            assert [r.id for r in got] == [r.id for r in want]
+            assert [r.score for r in got] == pytest.approx([r.score for r in want])
+        assert reloads == [fresh]
+
+
+class TestFilteredSearch:
+    def test_filtered_search_returns_full_page(self, hashing_emb):
+        for i in range(30):
+            attrs = {"status": "todo", "tags": ["api"] if i % 3 == 0 else [], "epic_id": None}
+            hashing_emb.index_item(f"US-TST-{i}", f"widget {i}", "story", "", attrs)
+
+        results = hashing_emb.search("widget", top_k=5, tag="api")
+        assert len(results) == 5
+        assert all(int(r.id.rsplit("-", 1)[1]) % 3 == 0 for r in results)
+        assert hashing_emb.search("widget", tag="missing") == []
+        assert len(hashing_emb.search("widget", top_k=50, status="todo")) == 30
+
+    def test_epic_filter_follows_story(self, hashing_emb):
+        index = hashing_emb.index_item
+        index("US-TST-1", "login", "story", "", {"status": "active", "epic_id": "EPIC-TST-1"})
+        index("US-TST-1-1", "login task", "task", "", {"status": "todo", "story_id": "US-TST-1"})
+        index("US-TST-2", "login page", "story", "", {"status": "active", "epic_id": "EPIC-TST-2"})
+
+        ids = {r.id for r in hashing_emb.search("login", epic_id="EPIC-TST-1")}
+        assert ids == {"US-TST-1", "US-TST-1-1"}
+        assert [r.id for r in hashing_emb.search("login", epic_id="EPIC-TST-1", item_type="task")] == [
+            "US-TST-1-1"
+        ]
+
+        index("US-TST-1", "login", "story", "", {"status": "active", "epic_id": "EPIC-TST-2"})
+        ids = {r.id for r in hashing_emb.search("login", epic_id="EPIC-TST-2")}
+        assert ids == {"US-TST-1", "US-TST-1-1", "US-TST-2"}
+
+    def test_attribute_change_does_not_reembed(self, hashing_emb):
+        hashing_emb.index_item("US-TST-1", "alpha", "story", "", {"status": "todo"})
+        hashing_emb.model.calls.clear()
+
+        hashing_emb.index_item("US-TST-1", "alpha", "story", "", {"status": "done"})
+        assert hashing_emb.model.calls == []
+        assert [r.id for r in hashing_emb.search("alpha", status="done")] == ["US-TST-1"]
+
+        hashing_emb.index_item("US-TST-1", "alpha", "story", "")  # no attrs: keep them
+        assert [r.id for r in hashing_emb.search("alpha", status="done")] == ["US-TST-1"]
+
+    def test_retag_updates_loaded_filters(self, hashing_emb, monkeypatch):
+        from projectman.embeddings import EmbeddingStore
+
+        index = hashing_emb.index_item
+        index("US-TST-1", "alpha", "story", "", {"status": "todo", "tags": ["api"]})
+        index("US-TST-2", "alpha beta", "story", "", {"status": "todo", "tags": ["api"]})
+        assert len(hashing_emb.search("alpha", tag="api")) == 2
+        monkeypatch.setattr(EmbeddingStore, "_reload_matrix", None)  # must not reload
+
+        index("US-TST-1", "alpha", "story", "", {
+            "status": "done", "tags": ["ui"], "epic_id": "EPIC-TST-1",
+        })
+        assert [r.id for r in hashing_emb.search("alpha", tag="api")] == ["US-TST-2"]
+        assert [r.id for r in hashing_emb.search("alpha", tag="ui")] == ["US-TST-1"]
+        assert [r.id for r in hashing_emb.search("alpha", status="done")] == ["US-TST-1"]
+        assert [r.id for r in hashing_emb.search("alpha", epic_id="EPIC-TST-1")] == ["US-TST-1"]
+
+    def test_filter_falls_back_past_probed_clusters(self, tmp_project):
+        from projectman.embeddings import EmbeddingStore
+
+        model = _TableModel(n_items=300, n_queries=1)
+        emb = EmbeddingStore(tmp_project / ".project", ann_threshold=100, nprobe=1)
+        emb._model = model
+        emb.index_items([
+            (f"US-TST-{i}", f"v{i}", "story", "", {"tags": ["rare"] if i < 12 else []})
+            for i in range(300)
+        ])
+
+        results = emb.search("q0", top_k=10, tag="rare")
+        assert emb._ivf is not None
+        assert len(results) == 10
+
+    def test_store_writes_carry_attributes(self, tmp_project, monkeypatch):
+        import projectman.embeddings as embeddings
+
+        monkeypatch.setattr(embeddings, "_model", _HashingModel())
+        store = Store(tmp_project)
+        epic = store.create_epic("Accounts", "Desc")
+        story, _ = store.create_story("Login form", "Desc", tags=["web"])
+        store.update(story.id, epic_id=epic.id, status="active")
+        store.create_task(story.id, "Login endpoint", "Desc")
+        store.create_story("Login audit", "Desc")
+        assert embeddings.flush_embeddings(10)
+
+        emb = embeddings.get_embedding_store(store.project_dir)
+        assert [r.id for r in emb.search("login", tag="web")] == [story.id]
+        assert [r.id for r in emb.search("login", status="active")] == [story.id]
+        assert {r.id for r in emb.search("login", epic_id=epic.id)} == {story.id, "US-TST-1-1"}
+
+
+class _GatedModel(_HashingModel):
+    """Hashing model whose first embed call blocks until released."""
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+        self.entered = threading.Event()
+
+    def embed(self, texts, batch_size=256):
+        if not self.calls:
+            self.entered.set()
+            self.release.wait(5)
+        return super().embed(texts, batch_size)
+
+
+def _stored_titles(proj_dir):
+    conn = sqlite3.connect(str(proj_dir / "embeddings.db"))
+    rows = dict(conn.execute("SELECT id, title FROM embeddings"))
+    conn.close()
+    return rows
+
+
+class TestEmbeddingWorker:
+    @pytest.fixture
+    def model(self, monkeypatch):
+        import projectman.embeddings as embeddings
+
+        model = _GatedModel()
+        monkeypatch.setattr(embeddings, "_model", model)
+        return model
+
+    def test_coalesces_and_batches_queued_items(self, tmp_project, model):
+        from projectman.embeddings import EmbeddingWorker
+
+        proj_dir = tmp_project / ".project"
+        worker = EmbeddingWorker(batch_size=10)
+        try:
+            worker.submit(proj_dir, "US-TST-1", "first", "story", "")
+            assert model.entered.wait(5)
+            worker.submit(proj_dir, "US-TST-2", "old title", "story", "")
+            worker.submit(proj_dir, "US-TST-3", "third", "task", "")
+            worker.submit(proj_dir, "US-TST-2", "new title", "story", "")
+            assert worker.stats()["queue_depth"] == 2
+
+            model.release.set()
+            assert worker.flush(timeout=5)
+        finally:
+            worker.stop(timeout=5)
+
+        stats = worker.stats()
+        assert (stats["submitted"], stats["coalesced"], stats["indexed"]) == (4, 1, 3)
+        assert stats["queue_depth"] == 0 and stats["in_flight"] == 0
+        # Items queued while the first batch ran went through in one call.
+        assert model.calls == [1, 2]
+        assert _stored_titles(proj_dir) == {
+            "US-TST-1": "first",
+            "US-TST-2": "new title",
+            "US-TST-3": "third",
+        }
+
+    def test_submit_blocks_when_queue_is_full(self, tmp_project, model):
+        from projectman.embeddings import EmbeddingWorker
+
+        proj_dir = tmp_project / ".project"
+        worker = EmbeddingWorker(max_pending=1)
+        try:
+            worker.submit(proj_dir, "US-TST-1", "a", "story", "")
+            assert model.entered.wait(5)
+            worker.submit(proj_dir, "US-TST-2", "b", "story", "")
+
+            blocked = threading.Thread(
+                target=worker.submit, args=(proj_dir, "US-TST-3", "c", "story", "")
+            )
+            blocked.start()
+            blocked.join(0.2)
+            assert blocked.is_alive()
+
+            model.release.set()
+            blocked.join(5)
+            assert not blocked.is_alive()
+            assert worker.flush(timeout=5)
+        finally:
+            worker.stop(timeout=5)
+        assert set(_stored_titles(proj_dir)) == {"US-TST-1", "US-TST-2", "US-TST-3"}
+
+    def test_store_mutations_are_indexed_in_background(self, tmp_project, model):
+        from projectman.embeddings import flush_embeddings
+
+        model.release.set()
+        store = Store(tmp_project)
+        store.create_story("Auth", "Login")
+        store.update("US-TST-1", title="Authentication")
+
+        assert flush_embeddings(timeout=5)
+        assert _stored_titles(tmp_project / ".project")["US-TST-1"] == "Authentication"
+
+    def test_missing_fastembed_counts_failures_without_creating_db(self, tmp_project, monkeypatch):
+        import projectman.embeddings as embeddings
+        from projectman.embeddings import EmbeddingWorker
+
+        def missing():
+            raise ImportError("no fastembed")
+
+        monkeypatch.setattr(embeddings, "get_model", missing)
+        proj_dir = tmp_project / ".project"
+        worker = EmbeddingWorker()
+        try:
+            worker.submit(proj_dir, "US-TST-1", "a", "story", "")
+            assert worker.flush(timeout=5)
+        finally:
+            worker.stop(timeout=5)
+
+        assert worker.stats()["failed"] == 1
+        assert not (proj_dir / "embeddings.db").exists()
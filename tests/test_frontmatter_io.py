@@ -0,0 +1,58 @@
+"""Tests for the fast frontmatter reader/emitter against python-frontmatter."""
+
+import frontmatter
+import pytest
+
+from projectman.frontmatter_io import dump_post, read_meta, read_post
+
+METADATA = [
+    {
+        "id": "US-TST-1",
+        "title": "Ünïcode: title",
+        "tags": ["a", "b"],
+        "points": None,
+        "depends_on": [],
+        "created": "2024-01-01",
+    },
+    {"id": "X", "title": "multi\nline", "acceptance_criteria": ["x: y", "- z"]},
+]
+BODIES = ["", "Body text", "Body\n\n---\nafter a rule", "  indented\n\n"]
+
+
+@pytest.mark.parametrize("metadata", METADATA)
+@pytest.mark.parametrize("body", BODIES)
+def test_round_trip_matches_python_frontmatter(tmp_path, metadata, body):
+    expected = frontmatter.dumps(frontmatter.Post(content=body, **metadata))
+    assert dump_post(metadata, body) == expected
+
+    path = tmp_path / "item.md"
+    path.write_text(expected)
+    post = frontmatter.load(str(path))
+    assert read_post(path) == (post.metadata, post.content)
+    assert read_meta(path) == post.metadata
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "no header at all",
+        "\n\n---\na: 1\n---\nleading blank lines",
+        "---\na: 1\nnever closed",
+        "---\n---\nempty header",
+        "--- \na: 2\n----\nlonger closing rule",
+        "---\n- just\n- a list\n---\nnon-dict header",
+    ],
+)
+def test_unusual_layouts_match_python_frontmatter(tmp_path, text):
+    path = tmp_path / "item.md"
+    path.write_text(text)
+    post = frontmatter.load(str(path))
+    assert read_post(path) == (post.metadata, post.content)
+    assert read_meta(path) == post.metadata
+
+
+def test_read_meta_stops_at_closing_delimiter(tmp_path):
+    path = tmp_path / "item.md"
+    # An invalid YAML body would fail if read_meta parsed past the header.
+    path.write_text("---\nid: A\n---\n\n: : not yaml : [\n")
+    assert read_meta(path) == {"id": "A"}
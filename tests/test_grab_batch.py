@@ -0,0 +1,94 @@
+"""Tests for pm_grab_batch / Store.grab_batch — claiming several tasks in one call."""
+
+import pytest
+import yaml
+
+from projectman.leases import LeaseTable
+
+
+@pytest.fixture(autouse=True)
+def chdir_to_project(tmp_project, monkeypatch):
+    """Change to the project directory so server tools can find it."""
+    monkeypatch.chdir(tmp_project)
+    from projectman.server import _store_cache
+    _store_cache.clear()
+
+
+READY_TASK_BODY = """## Implementation
+Do the thing.
+
+## Testing
+Verify the thing.
+"""
+
+
+def _stories(*task_counts):
+    from projectman.server import pm_create_story, pm_create_tasks, pm_update
+    for n, count in enumerate(task_counts, start=1):
+        pm_create_story(f"Story {n}", "Story body text")
+        pm_update(f"US-TST-{n}", status="active")
+        pm_create_tasks(f"US-TST-{n}", [
+            {"title": f"Task {i}", "description": READY_TASK_BODY, "points": 1}
+            for i in range(1, count + 1)
+        ])
+
+
+def _store():
+    from projectman.server import _store
+    return _store(None)
+
+
+def test_batch_prefers_different_stories(tmp_project):
+    from projectman.server import pm_grab_batch
+    _stories(3, 1, 1)
+    result = yaml.safe_load(pm_grab_batch(3, assignees="a1,a2,a3"))
+    grabbed = result["grabbed"]
+    assert [t["id"] for t in grabbed] == ["US-TST-1-1", "US-TST-2-1", "US-TST-3-1"]
+    assert [t["assignee"] for t in grabbed] == ["a1", "a2", "a3"]
+    assert grabbed[0]["lease"]["assignee"] == "a1"
+    assert "## Implementation" in grabbed[0]["body"]
+    assert result["stories"]["US-TST-2"] == "Story 2"
+    assert "note" not in result
+
+
+def test_batch_skips_dependent_tasks(tmp_project):
+    from projectman.server import pm_grab_batch, pm_update
+    _stories(3)
+    pm_update("US-TST-1-2", depends_on="US-TST-1-1")
+    result = yaml.safe_load(pm_grab_batch(3))
+    assert [t["id"] for t in result["grabbed"]] == ["US-TST-1-1", "US-TST-1-3"]
+    assert {t["assignee"] for t in result["grabbed"]} == {"claude"}
+    assert result["note"] == "only 2 of 3 tasks were ready to grab"
+
+
+def test_batch_is_one_transaction_and_one_index_write(tmp_project, monkeypatch):
+    import projectman.server as server
+    _stories(2, 2)
+    store = _store()
+    flushes = []
+    original = store._flush_transaction
+    monkeypatch.setattr(store, "_flush_transaction", lambda *a: flushes.append(1) or original(*a))
+    writes = []
+    original_write_index = server.write_index
+    monkeypatch.setattr(server, "write_index", lambda s: writes.append(1) or original_write_index(s))
+
+    result = yaml.safe_load(server.pm_grab_batch(4))
+    assert len(result["grabbed"]) == 4
+    assert flushes == [1] and writes == [1]
+    assert all(t.status.value == "in-progress" for t in store.list_tasks())
+
+
+def test_batch_replaces_task_leased_elsewhere(tmp_project):
+    _stories(1, 1, 1)
+    LeaseTable(tmp_project / ".project").acquire("US-TST-1-1", "other-process")
+    grabbed = _store().grab_batch(2, ["a1", "a2"])
+    assert [(t.id, t.assignee) for t, _ in grabbed] == [
+        ("US-TST-2-1", "a1"), ("US-TST-3-1", "a2"),
+    ]
+
+
+def test_batch_rejects_mismatched_assignees(tmp_project):
+    from projectman.server import pm_grab_batch
+    _stories(3)
+    assert pm_grab_batch(3, assignees="a1,a2").startswith("error: expected 1 or 3 assignees")
+    assert all(t.assignee is None for t in _store().list_tasks())
@@ -2,7 +2,12 @@
 
 import pytest
 
-from projectman.indexer import build_index, write_index
+from projectman.indexer import (
+    build_index,
+    start_index_flusher,
+    stop_index_flusher,
+    write_index,
+)
 from projectman.store import Store
 
 
@@ -305,3 +310,144 @@ def test_task_depends_on_column_in_markdown(store):
 def test_non_hub_does_not_write_root_readme(store):
     write_index(store)
     assert not (store.root / "README.md").exists()
+
+
+def test_write_index_skips_unchanged_files(store, monkeypatch):
+    store.create_story("Story", "Desc", points=3)
+    store.create_task("US-TST-1", "Task", "Desc")
+    write_index(store)
+
+    written = []
+    original = type(store.project_dir).write_text
+
+    def counting_write(self, *args, **kwargs):
+        written.append(self.name)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(type(store.project_dir), "write_text", counting_write)
+    write_index(store)
+    assert written == []
+
+    store.update("US-TST-1-1", status="in-progress")
+    written.clear()
+    write_index(store)
+    # Task status shows in index.yaml and INDEX-TASKS.md only.
+    assert sorted(written) == ["INDEX-TASKS.md", "index.yaml"]
+
+
+def test_write_index_yaml_matches_full_dump(store):
+    import yaml
+
+    store.create_epic("Epic", "Desc")
+    store.create_story("Story: with colon", "Desc", points=3)
+    store.update("US-TST-1", epic_id="EPIC-TST-1")
+    store.create_task("US-TST-1", "Task " + "long " * 30, "Desc", points=2)
+    write_index(store)
+    store.update("US-TST-1-1", status="done")
+    write_index(store)
+
+    expected = yaml.dump(
+        build_index(store).model_dump(mode="json"),
+        default_flow_style=False,
+        sort_keys=False,
+    )
+    assert (store.project_dir / "index.yaml").read_text() == expected
+
+
+def test_write_index_rewrites_externally_modified_index(store):
+    store.create_story("Story", "Desc")
+    write_index(store)
+    expected = (store.project_dir / "INDEX-STORIES.md").read_text()
+
+    (store.project_dir / "INDEX-STORIES.md").write_text("clobbered")
+    write_index(store)
+    assert (store.project_dir / "INDEX-STORIES.md").read_text() == expected
+
+
+def test_write_index_includes_archived_items(store):
+    store.create_story("Keep", "Desc")
+    store.create_story("Old", "Desc")
+    store.archive("US-TST-2")
+    write_index(store)
+
+    content = (store.project_dir / "INDEX-STORIES.md").read_text()
+    assert "US-TST-2" in content
+    assert "archived" in content
+
+
+class TestIndexFlusher:
+    @pytest.fixture(autouse=True)
+    def _stop_flusher(self):
+        yield
+        stop_index_flusher()
+
+    def test_write_index_is_deferred_while_flusher_runs(self, store):
+        flusher = start_index_flusher(3600)
+        store.create_story("Story", "Desc")
+        write_index(store)
+        write_index(store)
+
+        assert not (store.project_dir / "index.yaml").exists()
+        assert flusher.pending == 1
+
+        flusher.flush()
+        assert "US-TST-1" in (store.project_dir / "index.yaml").read_text()
+        assert flusher.pending == 0
+
+    def test_stop_forces_final_flush(self, store):
+        start_index_flusher(3600)
+        store.create_story("Story", "Desc")
+        write_index(store)
+
+        stop_index_flusher()
+        assert "US-TST-1" in (store.project_dir / "INDEX-STORIES.md").read_text()
+
+        # Without a flusher, write_index is inline again.
+        store.create_story("Second", "Desc")
+        write_index(store)
+        assert "US-TST-2" in (store.project_dir / "INDEX-STORIES.md").read_text()
+
+    def test_immediate_bypasses_flusher(self, store):
+        start_index_flusher(3600)
+        store.create_story("Story", "Desc")
+        write_index(store, immediate=True)
+        assert (store.project_dir / "index.yaml").exists()
+
+    def test_background_tick_writes_index(self, store):
+        import time
+
+        start_index_flusher(0.05)
+        store.create_story("Story", "Desc")
+        write_index(store)
+
+        path = store.project_dir / "index.yaml"
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            if path.exists() and "US-TST-1" in path.read_text():
+                break
+            time.sleep(0.01)
+        assert "US-TST-1" in path.read_text()
+
+    def test_flush_waits_for_open_transaction(self, store):
+        import threading
+
+        flusher = start_index_flusher(3600)
+        store.create_story("Story", "Desc")
+        write_index(store)
+        path = store.project_dir / "index.yaml"
+
+        with store.transaction():
+            store.create_task("US-TST-1", "Staged", "Body")
+            thread = threading.Thread(target=flusher.flush)
+            thread.start()
+            thread.join(0.2)
+            assert thread.is_alive()
+            assert not path.exists()
+
+        thread.join(5)
+        assert "US-TST-1-1" in path.read_text()
+        assert "US-TST-1-1" in (store.project_dir / "INDEX-TASKS.md").read_text()
+
+    def test_interval_must_be_positive(self):
+        with pytest.raises(ValueError):
+            start_index_flusher(0)
@@ -0,0 +1,246 @@
+"""Tests for task leases: compare-and-swap claims, heartbeats and reclaim."""
+
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+import yaml
+
+from projectman.leases import LeaseTable, claim, reclaim_expired
+
+
+@pytest.fixture(autouse=True)
+def chdir_to_project(tmp_project, monkeypatch):
+    """Change to the project directory so server tools can find it."""
+    monkeypatch.chdir(tmp_project)
+    from projectman.server import _store_cache
+    _store_cache.clear()
+
+
+READY_TASK_BODY = """## Implementation
+Do the thing.
+
+## Testing
+Verify the thing.
+"""
+
+
+def _story_with_tasks(n=2):
+    from projectman.server import pm_create_story, pm_create_tasks, pm_update
+    pm_create_story("Story", "Story body text")
+    pm_update("US-TST-1", status="active")
+    pm_create_tasks("US-TST-1", [
+        {"title": f"Task {i}", "description": READY_TASK_BODY, "points": 1}
+        for i in range(1, n + 1)
+    ])
+
+
+def _expire(project_dir, task_id):
+    table = LeaseTable(project_dir / ".project")
+    conn = table._connect()
+    try:
+        conn.execute("UPDATE leases SET expires = ? WHERE task_id = ?", (time.time() - 1, task_id))
+    finally:
+        conn.close()
+
+
+def _store():
+    from projectman.server import _store
+    return _store(None)
+
+
+# ─── LeaseTable ──────────────────────────────────────────────────
+
+
+class TestLeaseTable:
+    def test_acquire_is_exclusive_until_expiry(self, tmp_project):
+        table = LeaseTable(tmp_project / ".project")
+        acquired, lease = table.acquire("T-1", "alice")
+        assert acquired and lease.assignee == "alice"
+
+        acquired, held = table.acquire("T-1", "bob")
+        assert not acquired
+        assert held.assignee == "alice"
+
+        _expire(tmp_project, "T-1")
+        acquired, lease = table.acquire("T-1", "bob")
+        assert acquired and table.get("T-1").assignee == "bob"
+
+    def test_reacquire_extends_own_lease(self, tmp_project):
+        table = LeaseTable(tmp_project / ".project")
+        _, first = table.acquire("T-1", "alice", seconds=10)
+        acquired, second = table.acquire("T-1", "alice", seconds=100)
+        assert acquired
+        assert second.expires > first.expires
+        assert table.get("T-1").expires == second.expires
+
+    def test_release_keeps_lease_of_keep_for(self, tmp_project):
+        table = LeaseTable(tmp_project / ".project")
+        table.acquire("T-1", "alice")
+        table.release("T-1", keep_for="alice")
+        assert table.get("T-1") is not None
+        table.release("T-1")
+        assert table.get("T-1") is None
+
+    def test_discard_fails_after_heartbeat(self, tmp_project):
+        table = LeaseTable(tmp_project / ".project")
+        _, lease = table.acquire("T-1", "alice", seconds=10)
+        table.acquire("T-1", "alice", seconds=20)
+        assert not table.discard(lease)
+        assert table.discard(table.get("T-1"))
+
+    def test_no_database_until_first_claim(self, tmp_project):
+        table = LeaseTable(tmp_project / ".project")
+        assert table.get("T-1") is None
+        assert table.expired() == []
+        table.release("T-1")
+        assert not table.db_path.exists()
+
+
+def _acquire_in_process(args):
+    project_dir, assignee = args
+    acquired, _ = LeaseTable(project_dir).acquire("T-1", assignee)
+    return acquired
+
+
+def test_only_one_process_acquires(tmp_project):
+    project_dir = tmp_project / ".project"
+    LeaseTable(project_dir).expired()  # nothing to do before the race
+    ctx = multiprocessing.get_context("fork")
+    with ProcessPoolExecutor(max_workers=8, mp_context=ctx) as pool:
+        results = list(pool.map(
+            _acquire_in_process, [(project_dir, f"agent-{i}") for i in range(16)]
+        ))
+    assert results.count(True) == 1
+
+
+# ─── Claiming through the store ──────────────────────────────────
+
+
+def test_grab_takes_lease(tmp_project):
+    from projectman.server import pm_grab
+    _story_with_tasks(1)
+    result = yaml.safe_load(pm_grab("US-TST-1-1"))
+    assert result["grabbed"]["lease"]["assignee"] == "claude"
+    assert _store().get_lease("US-TST-1-1").assignee == "claude"
+
+
+def test_grab_blocked_by_live_lease_before_assignment(tmp_project):
+    """Another process leased the task but has not written the assignee yet."""
+    from projectman.server import pm_grab
+    _story_with_tasks(1)
+    LeaseTable(tmp_project / ".project").acquire("US-TST-1-1", "bob")
+    result = yaml.safe_load(pm_grab("US-TST-1-1"))
+    assert result["error"] == "task is not ready to grab"
+    assert result["blockers"][0].startswith("claimed by 'bob'")
+
+
+def test_expired_claim_can_be_taken_over(tmp_project):
+    from projectman.server import pm_grab
+    _story_with_tasks(1)
+    pm_grab("US-TST-1-1", assignee="bob")
+    _expire(tmp_project, "US-TST-1-1")
+    result = yaml.safe_load(pm_grab("US-TST-1-1"))
+    assert result["grabbed"]["task"]["assignee"] == "claude"
+    assert _store().get_lease("US-TST-1-1").assignee == "claude"
+
+
+def test_done_releases_lease(tmp_project):
+    from projectman.server import pm_grab, pm_update
+    _story_with_tasks(1)
+    pm_grab("US-TST-1-1")
+    pm_update("US-TST-1-1", status="done")
+    assert _store().get_lease("US-TST-1-1") is None
+
+
+def test_done_next_moves_lease_to_next_task(tmp_project):
+    from projectman.server import pm_done_next, pm_grab
+    _story_with_tasks(2)
+    pm_grab("US-TST-1-1")
+    done = yaml.safe_load(pm_done_next("US-TST-1-1"))
+    assert done["next"]["task"]["id"] == "US-TST-1-2"
+    store = _store()
+    assert store.get_lease("US-TST-1-1") is None
+    assert store.get_lease("US-TST-1-2").assignee == "claude"
+
+
+def test_failed_transaction_drops_new_lease(tmp_project):
+    _story_with_tasks(1)
+    store = _store()
+    with pytest.raises(RuntimeError):
+        with store.transaction():
+            assert claim(store, "US-TST-1-1", "claude")["ready"]
+            store.update("US-TST-1-1", assignee="claude", status="in-progress")
+            raise RuntimeError("boom")
+    assert store.get_lease("US-TST-1-1") is None
+    assert store.get_task("US-TST-1-1")[0].assignee is None
+
+
+def test_claim_in_transaction_sees_task_finished_meanwhile(tmp_project):
+    """Another process finished the task after the transaction opened."""
+    import os
+
+    _story_with_tasks(1)
+    store = _store()
+    path = store.tasks_dir / "US-TST-1-1.md"
+    with store.transaction():
+        store.get_task("US-TST-1-1")
+        path.write_text(path.read_text().replace("status: todo", "status: done"))
+        st = path.stat()
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        readiness = claim(store, "US-TST-1-1", "claude")
+        assert not readiness["ready"]
+    assert store.get_lease("US-TST-1-1") is None
+    assert store.get_task("US-TST-1-1")[0].status.value == "done"
+
+
+# ─── Heartbeat and reclaim ───────────────────────────────────────
+
+
+def test_heartbeat_renews_lease(tmp_project):
+    from projectman.server import pm_grab, pm_heartbeat
+    _story_with_tasks(1)
+    pm_grab("US-TST-1-1")
+    before = _store().get_lease("US-TST-1-1").expires
+    time.sleep(0.01)
+    result = yaml.safe_load(pm_heartbeat("US-TST-1-1"))
+    assert result["lease"]["assignee"] == "claude"
+    assert _store().get_lease("US-TST-1-1").expires > before
+
+
+def test_heartbeat_rejects_other_assignee(tmp_project):
+    from projectman.server import pm_grab, pm_heartbeat
+    _story_with_tasks(1)
+    pm_grab("US-TST-1-1")
+    assert pm_heartbeat("US-TST-1-1", assignee="bob").startswith("error:")
+
+
+def test_reclaim_expired_resets_task(tmp_project):
+    from projectman.server import pm_grab
+    _story_with_tasks(2)
+    pm_grab("US-TST-1-1", assignee="bob")
+    pm_grab("US-TST-1-2", assignee="carol")
+    _expire(tmp_project, "US-TST-1-1")
+
+    store = _store()
+    assert reclaim_expired(store) == ["US-TST-1-1"]
+    meta, _ = store.get_task("US-TST-1-1")
+    assert meta.status.value == "todo" and meta.assignee is None
+    assert store.get_lease("US-TST-1-1") is None
+    assert store.get_task("US-TST-1-2")[0].assignee == "carol"
+    assert reclaim_expired(store) == []
+
+
+def test_reclaim_skips_task_that_moved_on(tmp_project):
+    from projectman.server import pm_grab, pm_update
+    _story_with_tasks(1)
+    pm_grab("US-TST-1-1", assignee="bob")
+    pm_update("US-TST-1-1", status="review")
+    # A stale lease left behind, e.g. by a process that died mid-release
+    LeaseTable(tmp_project / ".project").acquire("US-TST-1-1", "bob", seconds=-1)
+
+    store = _store()
+    assert reclaim_expired(store) == []
+    assert store.get_task("US-TST-1-1")[0].status.value == "review"
+    assert store.get_lease("US-TST-1-1") is None
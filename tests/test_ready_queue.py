@@ -0,0 +1,172 @@
+"""Tests for the incrementally maintained ready queue."""
+
+import random
+
+from projectman.board import get_board
+from projectman.deps import DependencyGraph
+from projectman.ready_queue import ReadyQueue, get_ready_queue
+
+GOOD_BODY = """\
+## Implementation
+
+Add the login endpoint to the API router and validate the credentials.
+
+## Testing
+
+Run pytest tests/test_auth.py.
+
+- [ ] Endpoint works
+"""
+
+
+def _ids(tasks):
+    return [t.id for t in tasks]
+
+
+def _active_story(store, title="Story", **kwargs):
+    story, _ = store.create_story(title, "Description", **kwargs)
+    store.update(story.id, status="active")
+    return story
+
+
+def _queue(store):
+    queue = ReadyQueue()
+    queue.sync(store)
+    return queue
+
+
+class TestReadyQueue:
+    def test_pick_order_prefers_the_given_story(self, store):
+        low = _active_story(store, "Low", priority="could")
+        high = _active_story(store, "High", priority="must")
+        store.create_task(low.id, "Low task", GOOD_BODY, points=1)
+        store.create_task(high.id, "Second", GOOD_BODY, points=1)
+        store.create_task(high.id, "First", GOOD_BODY, points=5)
+        store.update("US-TST-2-1", depends_on=["US-TST-2-2"])
+
+        queue = _queue(store)
+        assert _ids(queue.peek(10)) == ["US-TST-2-2", "US-TST-1-1"]
+        assert queue.next().id == "US-TST-2-2"
+        assert queue.next("US-TST-1").id == "US-TST-1-1"
+        assert queue.next("US-TST-1", skip={"US-TST-1-1"}).id == "US-TST-2-2"
+        assert queue.next("US-TST-1", same_story_only=True, skip={"US-TST-1-1"}) is None
+
+    def test_follows_store_changes(self, store):
+        story = _active_story(store)
+        store.create_task(story.id, "Dep", GOOD_BODY, points=3)
+        store.create_task(story.id, "Task", GOOD_BODY, points=3, depends_on=["US-TST-1-1"])
+        store.create_task(story.id, "Thin", "Too short", points=3)
+        queue = _queue(store)
+        assert _ids(queue.peek(10)) == ["US-TST-1-1"]
+
+        store.update("US-TST-1-1", status="done")
+        queue.sync(store)
+        assert _ids(queue.peek(10)) == ["US-TST-1-2"]
+
+        store.update("US-TST-1-3", body=GOOD_BODY)
+        store.update("US-TST-1-2", assignee="alice")
+        queue.sync(store)
+        assert _ids(queue.peek(10)) == ["US-TST-1-3"]
+
+        store.update(story.id, status="backlog")
+        queue.sync(store)
+        assert queue.peek(10) == []
+
+    def test_external_edit_is_picked_up(self, store):
+        story = _active_story(store)
+        store.create_task(story.id, "Task", GOOD_BODY, points=3)
+        queue = get_ready_queue(store)
+        assert len(queue) == 1
+
+        path = store.tasks_dir / "US-TST-1-1.md"
+        path.write_text(path.read_text().replace("status: todo", "status: blocked"))
+        assert len(get_ready_queue(store)) == 0
+
+    def test_sync_reads_only_changed_bodies(self, store, monkeypatch):
+        story = _active_story(store)
+        for i in range(5):
+            store.create_task(story.id, f"Task {i}", GOOD_BODY, points=3)
+        queue = _queue(store)
+
+        reads = []
+        original = store.read_bodies
+        monkeypatch.setattr(
+            store, "read_bodies", lambda t, ids: reads.extend(ids) or original(t, ids)
+        )
+        store.update("US-TST-1-2", points=5)
+        queue.sync(store)
+        assert reads == ["US-TST-1-2"]
+        queue.sync(store)
+        assert reads == ["US-TST-1-2"]
+
+    def test_batch_spreads_over_stories(self, store):
+        first = _active_story(store, "First", priority="must")
+        second = _active_story(store, "Second")
+        for story in (first, first, first, second):
+            store.create_task(story.id, "Task", GOOD_BODY, points=1)
+        graph = store.dependency_graph()
+
+        queue = _queue(store)
+        assert _ids(queue.batch(2, graph)) == ["US-TST-1-1", "US-TST-2-1"]
+        assert _ids(queue.batch(3, graph)) == ["US-TST-1-1", "US-TST-2-1", "US-TST-1-2"]
+        taken = [store.get_task("US-TST-2-1")[0]]
+        assert _ids(queue.batch(2, graph, taken=taken, skip={"US-TST-1-1"})) == [
+            "US-TST-1-2", "US-TST-1-3",
+        ]
+
+    def test_batch_leaves_out_tasks_linked_to_taken(self, store):
+        story = _active_story(store)
+        store.create_task(story.id, "Held", GOOD_BODY, points=1)
+        store.create_task(story.id, "Linked", GOOD_BODY, points=1)
+        store.create_task(story.id, "Free", GOOD_BODY, points=1)
+        held, _ = store.get_task("US-TST-1-1")
+        graph = DependencyGraph()
+        graph.set("US-TST-1-2", ["US-TST-1-1"])
+
+        batch = _queue(store).batch(3, graph, taken=[held], skip={"US-TST-1-1"})
+        assert _ids(batch) == ["US-TST-1-3"]
+
+    def test_cleared_cache_reloads(self, store):
+        story = _active_story(store)
+        store.create_task(story.id, "Task", GOOD_BODY, points=3)
+        queue = _queue(store)
+        store.clear_cache()
+        store.create_task(story.id, "Task", GOOD_BODY, points=3)
+        queue.sync(store)
+        assert _ids(queue.peek(10)) == ["US-TST-1-1", "US-TST-1-2"]
+
+    def test_matches_board_after_random_changes(self, store):
+        rng = random.Random(7)
+        stories = [
+            _active_story(store, f"Story {i}", priority=rng.choice(["must", "should", "could"]))
+            for i in range(3)
+        ]
+        for i in range(12):
+            store.create_task(rng.choice(stories).id, f"Task {i}", GOOD_BODY, points=3)
+        task_ids = _ids(store.list_tasks())
+        queue = _queue(store)
+
+        for _ in range(40):
+            op = rng.randrange(4)
+            if op == 0:
+                store.update(rng.choice(task_ids), status=rng.choice(["todo", "done", "blocked"]))
+            elif op == 1:
+                task_id = rng.choice(task_ids)
+                story_id = store.list_tasks()[task_ids.index(task_id)].story_id
+                siblings = [t.id for t in store.list_tasks(story_id=story_id) if t.id != task_id]
+                deps = rng.sample(siblings, min(len(siblings), rng.randrange(2)))
+                try:
+                    store.update(task_id, depends_on=deps)
+                except Exception:
+                    pass  # would form a cycle
+            elif op == 2:
+                store.update(rng.choice(task_ids), assignee=rng.choice(["", "alice"]))
+            else:
+                store.update(
+                    rng.choice(stories).id,
+                    status=rng.choice(["active", "backlog"]),
+                    priority=rng.choice(["must", "could"]),
+                )
+            queue.sync(store)
+            expected = [e.task.id for e in get_board(store).columns["available"]]
+            assert _ids(queue.peek(100)) == expected
@@ -0,0 +1,200 @@
+"""Tests for the multi-agent schedule planner."""
+
+from datetime import date
+
+import pytest
+import yaml
+
+from projectman.deps import CycleError
+from projectman.models import StoryFrontmatter, TaskFrontmatter
+from projectman.schedule import DEFAULT_POINTS, plan_schedule
+
+TODAY = date(2026, 1, 1)
+
+
+def _story(story_id, depends_on=(), status="active"):
+    return StoryFrontmatter(
+        id=story_id, title=story_id, status=status, depends_on=list(depends_on),
+        created=TODAY, updated=TODAY,
+    )
+
+
+def _task(task_id, points=1, depends_on=(), status="todo"):
+    return TaskFrontmatter(
+        id=task_id, story_id=task_id.rsplit("-", 1)[0], title=task_id, status=status,
+        points=points, depends_on=list(depends_on), created=TODAY, updated=TODAY,
+    )
+
+
+def _by_id(plan):
+    return {task.id: task for task in plan.tasks}
+
+
+class TestPlanSchedule:
+    def test_critical_path_and_earliest_starts(self):
+        # a(3) -> c(5) and b(1) -> c; d(2) is independent.
+        tasks = [
+            _task("US-X-1-1", 3),
+            _task("US-X-1-2", 1),
+            _task("US-X-1-3", 5, depends_on=["US-X-1-1", "US-X-1-2"]),
+            _task("US-X-1-4", 2),
+        ]
+        plan = plan_schedule(tasks, [_story("US-X-1")], agents=2)
+        tasks = _by_id(plan)
+
+        assert plan.critical_path == ["US-X-1-1", "US-X-1-3"]
+        assert plan.critical_path_points == 8
+        assert plan.total_points == 11
+        assert tasks["US-X-1-3"].earliest_start == 3
+        assert tasks["US-X-1-2"].slack == 2
+        assert tasks["US-X-1-4"].slack == 6
+        assert tasks["US-X-1-1"].slack == 0
+
+    def test_list_schedule_respects_dependencies_and_fleet(self):
+        tasks = [_task(f"US-X-1-{i}", 2) for i in range(1, 5)]
+        tasks.append(_task("US-X-1-5", 1, depends_on=[t.id for t in tasks]))
+        plan = plan_schedule(tasks, [_story("US-X-1")], agents=2)
+        tasks = _by_id(plan)
+
+        assert plan.makespan == 5
+        assert tasks["US-X-1-5"].start == 4
+        for task in plan.tasks:
+            assert 0 <= task.agent < 2
+        busy = {}
+        for task in plan.tasks:
+            for t in range(task.start, task.finish):
+                assert (task.agent, t) not in busy
+                busy[(task.agent, t)] = task.id
+        assert plan.scaling == [
+            {"agents": 1, "makespan": 9, "speedup": 1.0, "efficiency": 1.0},
+            {"agents": 2, "makespan": 5, "speedup": 1.8, "efficiency": 0.9},
+        ]
+
+    def test_compare_adds_half_fleet_row(self):
+        tasks = [_task(f"US-X-1-{i}", 2) for i in range(1, 9)]
+        plan = plan_schedule(tasks, [_story("US-X-1")], agents=4)
+        assert [row["agents"] for row in plan.scaling] == [1, 4]
+        plan = plan_schedule(tasks, [_story("US-X-1")], agents=4, compare=True)
+        assert [(row["agents"], row["makespan"]) for row in plan.scaling] == [
+            (1, 16), (2, 8), (4, 4),
+        ]
+
+    def test_longest_chain_is_started_first(self):
+        tasks = [
+            _task("US-X-1-1", 1),
+            _task("US-X-1-2", 1),
+            _task("US-X-1-3", 8, depends_on=["US-X-1-2"]),
+        ]
+        plan = plan_schedule(tasks, [_story("US-X-1")], agents=1)
+        assert [t.id for t in plan.tasks] == ["US-X-1-2", "US-X-1-3", "US-X-1-1"]
+        assert plan.makespan == 10
+
+    def test_story_dependencies_gate_tasks(self):
+        stories = [_story("US-X-1"), _story("US-X-2", depends_on=["US-X-1"])]
+        tasks = [
+            _task("US-X-1-1", 3),
+            _task("US-X-1-2", 5),
+            _task("US-X-2-1", 2),
+            _task("US-X-3-1", 1, depends_on=["US-X-2"]),
+        ]
+        plan = plan_schedule(tasks, stories + [_story("US-X-3")], agents=4)
+        tasks = _by_id(plan)
+
+        assert tasks["US-X-2-1"].earliest_start == 5
+        assert tasks["US-X-3-1"].earliest_start == 7
+        assert plan.critical_path == ["US-X-1-2", "US-X-2-1", "US-X-3-1"]
+
+    def test_done_work_is_finished_and_unestimated_gets_default(self):
+        stories = [_story("US-X-1", status="done"), _story("US-X-2", depends_on=["US-X-1"])]
+        tasks = [
+            _task("US-X-1-1", 8, status="done"),
+            _task("US-X-2-1", None, depends_on=["US-X-1-1"]),
+        ]
+        plan = plan_schedule(tasks, stories)
+        assert [t.id for t in plan.tasks] == ["US-X-2-1"]
+        assert plan.tasks[0].earliest_start == 0
+        assert plan.total_points == DEFAULT_POINTS
+        assert plan.unestimated == ["US-X-2-1"]
+
+    def test_cycle_and_bad_fleet_raise(self):
+        tasks = [
+            _task("US-X-1-1", depends_on=["US-X-1-2"]),
+            _task("US-X-1-2", depends_on=["US-X-1-1"]),
+        ]
+        with pytest.raises(CycleError):
+            plan_schedule(tasks, [_story("US-X-1")])
+        # Only a cycle through a story: US-X-1-1 inherits US-X-1's wait
+        # for US-X-2, which waits for its task, which waits for US-X-1-1.
+        stories = [_story("US-X-1", depends_on=["US-X-2"]), _story("US-X-2")]
+        tasks = [_task("US-X-1-1"), _task("US-X-2-1", depends_on=["US-X-1-1"])]
+        with pytest.raises(CycleError) as exc:
+            plan_schedule(tasks, stories)
+        assert set(exc.value.cycle) == {"US-X-1-1", "US-X-2", "US-X-2-1"}
+        with pytest.raises(ValueError):
+            plan_schedule([], [], agents=0)
+
+    def test_empty_project(self):
+        plan = plan_schedule([], [], agents=3)
+        assert plan.tasks == [] and plan.makespan == 0 and plan.parallelism == 0.0
+
+    def test_wide_graph_matches_bounds(self):
+        stories = [_story(f"US-X-{s}") for s in range(1, 201)]
+        tasks = [
+            _task(f"US-X-{s}-{i}", 2, depends_on=[f"US-X-{s}-{i - 1}"] if i > 1 else [])
+            for s in range(1, 201)
+            for i in range(1, 11)
+        ]
+        plan = plan_schedule(tasks, stories, agents=8)
+        assert plan.critical_path_points == 20
+        assert plan.total_points == 4000
+        assert plan.makespan >= max(plan.critical_path_points, plan.total_points / 8)
+        assert plan.makespan == 500
+        assert plan.parallelism == 200
+
+
+def test_pm_schedule_tool(tmp_project, monkeypatch):
+    monkeypatch.chdir(tmp_project)
+    from projectman.server import (
+        _store_cache, pm_create_story, pm_create_tasks, pm_schedule, pm_update,
+    )
+    _store_cache.clear()
+    pm_create_story("Story", "Story body text")
+    pm_create_tasks("US-TST-1", [
+        {"title": "First", "description": "d", "points": 3},
+        {"title": "Second", "description": "d", "points": 5, "depends_on": ["US-TST-1-1"]},
+        {"title": "Side", "description": "d"},
+    ])
+    pm_update("US-TST-1-3", points=2)
+
+    result = yaml.safe_load(pm_schedule(agents=2, limit=2))
+    assert result["summary"]["critical_path_points"] == 8
+    assert result["summary"]["makespan"] == 8
+    assert [step["id"] for step in result["critical_path"]] == ["US-TST-1-1", "US-TST-1-2"]
+    assert len(result["schedule"]) == 2
+    assert "unestimated" not in result
+
+
+def test_plan_schedule_scales_to_50k_tasks():
+    import random
+    import time
+
+    rng = random.Random(1)
+    stories = [_story(f"US-X-{s}") for s in range(1, 1001)]
+    tasks = []
+    for s in range(1, 1001):
+        for i in range(1, 51):
+            deps = [f"US-X-{s}-{rng.randint(1, i - 1)}"] if i > 1 else []
+            if s > 1 and rng.random() < 0.05:
+                deps.append(f"US-X-{rng.randint(1, s - 1)}-{rng.randint(1, 50)}")
+            tasks.append(_task(f"US-X-{s}-{i}", rng.choice([1, 2, 3, 5, 8]), deps))
+
+    elapsed = []
+    for _ in range(3):
+        start = time.perf_counter()
+        plan = plan_schedule(tasks, stories, agents=16)
+        elapsed.append(time.perf_counter() - start)
+
+    assert len(plan.tasks) == 50_000
+    assert plan.makespan >= max(plan.critical_path_points, plan.total_points / 16)
+    # Well under a second on a laptop; allow for slow CI machines
+    assert min(elapsed) < 1.0, f"Took {min(elapsed):.2f}s to plan 50k tasks"
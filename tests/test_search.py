@@ -0,0 +1,450 @@
+"""Tests for the keyword search index."""
+
+import pytest
+import yaml
+
+from projectman import search as search_module
+from projectman.search import SearchIndex, keyword_search, tokenize
+from projectman.store import Store
+
+
+def _count_parses(monkeypatch):
+    """Patch the index's file reader to record the file names it parses."""
+    parsed = []
+    original = search_module.read_post
+
+    def counting_read_post(path):
+        parsed.append(path.name)
+        return original(path)
+
+    monkeypatch.setattr(search_module, "read_post", counting_read_post)
+    return parsed
+
+
+def _ids(results):
+    return [r.id for r in results]
+
+
+def test_tokenize():
+    assert tokenize("Fix OAuth2 log-in, quickly!") == ["fix", "oauth2", "log", "in", "quickly"]
+
+
+class TestRanking:
+    def test_title_match_outranks_body_match(self, store):
+        store.create_story("Payment flow", "Handles checkout")
+        store.create_story("Checkout page", "Renders the payment summary")
+
+        results = keyword_search("payment", store.project_dir)
+        assert _ids(results) == ["US-TST-1", "US-TST-2"]
+        assert results[0].score > results[1].score
+
+    def test_rare_term_outweighs_common_term(self, store):
+        for i in range(5):
+            store.create_story(f"Service {i}", "service work")
+        store.create_story("Service cache", "Add a service cache")
+
+        results = keyword_search("service cache", store.project_dir)
+        assert results[0].id == "US-TST-6"
+
+    def test_prefix_matches_longer_terms(self, store):
+        store.create_story("Authentication system", "Login and signup flow")
+
+        results = keyword_search("auth", store.project_dir)
+        assert _ids(results) == ["US-TST-1"]
+        assert "authentication" in results[0].snippet
+
+    def test_tags_are_searchable(self, store):
+        store.create_story("Story", "Desc", tags=["frontend"])
+        assert _ids(keyword_search("frontend", store.project_dir)) == ["US-TST-1"]
+
+    def test_no_match_and_empty_query(self, store):
+        store.create_story("Story", "Desc")
+        assert keyword_search("zebra", store.project_dir) == []
+        assert keyword_search("  !! ", store.project_dir) == []
+
+    def test_cancelled_search_is_interrupted(self, store, monkeypatch):
+        import sqlite3
+        import threading
+
+        monkeypatch.setattr(search_module, "_CANCEL_CHECK_STEPS", 1)
+        store.create_story("Widget", "Desc")
+        cancel = threading.Event()
+        cancel.set()
+        with pytest.raises(sqlite3.OperationalError):
+            SearchIndex(store.project_dir).search("widget", cancel=cancel)
+
+    def test_top_k(self, store):
+        for i in range(5):
+            store.create_story(f"Widget {i}", "Desc")
+        assert len(keyword_search("widget", store.project_dir, top_k=3)) == 3
+
+
+class TestFilters:
+    def test_type_status_and_tag_filters(self, store):
+        store.create_epic("Search epic", "Desc")
+        store.create_story("Search story", "Desc", tags=["api"])
+        store.create_task("US-TST-1", "Search task", "Desc", tags=["api"])
+        store.update("US-TST-1-1", status="in-progress")
+        pdir = store.project_dir
+
+        assert _ids(keyword_search("search", pdir, item_type="epic")) == ["EPIC-TST-1"]
+        assert _ids(keyword_search("search", pdir, status="in-progress")) == ["US-TST-1-1"]
+        assert sorted(_ids(keyword_search("search", pdir, tag="api"))) == [
+            "US-TST-1",
+            "US-TST-1-1",
+        ]
+        assert keyword_search("search", pdir, tag="api", item_type="epic") == []
+
+    def test_epic_filter_includes_tasks_of_its_stories(self, store):
+        epic = store.create_epic("Accounts", "Desc")
+        story, _ = store.create_story("Login form", "Desc")
+        store.create_story("Login audit", "Desc")
+        store.update(story.id, epic_id=epic.id)
+        store.create_task(story.id, "Login endpoint", "Desc")
+
+        results = keyword_search("login", store.project_dir, epic_id=epic.id)
+        assert sorted(_ids(results)) == [story.id, "US-TST-1-1"]
+
+
+class TestIncrementalUpdates:
+    def test_store_writes_update_index_without_reparsing(self, store, monkeypatch):
+        store.create_story("Alpha", "Desc")
+        keyword_search("alpha", store.project_dir)  # build the index
+
+        parsed = _count_parses(monkeypatch)
+        store.update("US-TST-1", title="Beta")
+        store.create_story("Gamma", "Desc")
+
+        assert keyword_search("alpha", store.project_dir) == []
+        assert _ids(keyword_search("beta", store.project_dir)) == ["US-TST-1"]
+        assert _ids(keyword_search("gamma", store.project_dir)) == ["US-TST-2"]
+        assert parsed == []
+
+    def test_transaction_updates_index_on_flush(self, store):
+        store.create_story("Alpha", "Desc")
+        keyword_search("alpha", store.project_dir)
+
+        with store.transaction():
+            store.update("US-TST-1", title="Beta")
+        assert _ids(keyword_search("beta", store.project_dir)) == ["US-TST-1"]
+
+    def test_external_edit_and_delete_are_picked_up(self, store, monkeypatch):
+        store.create_story("Alpha", "Desc")
+        store.create_story("Other", "Desc")
+        keyword_search("alpha", store.project_dir)
+
+        path = store.stories_dir / "US-TST-1.md"
+        path.write_text(path.read_text().replace("title: Alpha", "title: Omega"))
+        (store.stories_dir / "US-TST-2.md").unlink()
+
+        parsed = _count_parses(monkeypatch)
+        assert _ids(keyword_search("omega", store.project_dir)) == ["US-TST-1"]
+        assert keyword_search("other", store.project_dir) == []
+        assert parsed == ["US-TST-1.md"]
+
+    def test_index_persists_across_instances(self, store, monkeypatch):
+        store.create_story("Alpha", "Desc")
+        SearchIndex(store.project_dir).search("alpha")
+
+        parsed = _count_parses(monkeypatch)
+        assert _ids(SearchIndex(store.project_dir).search("alpha")) == ["US-TST-1"]
+        assert parsed == []
+        assert (store.project_dir / ".cache" / ".gitignore").read_text() == "*\n"
+
+    def test_background_refresh_picks_up_edits(self, store, monkeypatch):
+        monkeypatch.setattr(search_module, "REFRESH_INTERVAL", 0)
+        store.create_story("Alpha", "Desc")
+        index = SearchIndex(store.project_dir)
+        index.search("alpha", background_refresh=True)  # first query refreshes inline
+
+        path = store.stories_dir / "US-TST-1.md"
+        path.write_text(path.read_text().replace("title: Alpha", "title: Omega"))
+        index.search("omega", background_refresh=True)  # may miss the edit
+        index._refresher.join(5)
+        assert _ids(index.search("omega", background_refresh=True)) == ["US-TST-1"]
+
+    def test_malformed_file_is_skipped(self, store):
+        store.create_story("Alpha", "Desc")
+        (store.stories_dir / "US-TST-9.md").write_text("---\ntitle: [unclosed\n---\nalpha\n")
+
+        assert _ids(keyword_search("alpha", store.project_dir)) == ["US-TST-1"]
+
+    def test_falls_back_to_memory_when_cache_dir_unusable(self, store):
+        store.create_story("Alpha", "Desc")
+        (store.project_dir / ".cache").write_text("not a directory")
+
+        assert _ids(SearchIndex(store.project_dir).search("alpha")) == ["US-TST-1"]
+
+
+class TestSubstringSearch:
+    @pytest.fixture
+    def items(self, store):
+        store.create_story("Fix src/auth/views.py crash", "Raised KeyError: 'user_id' on login")
+        store.create_story("Logging", "Stack trace points at src/auth/views.py line 40")
+        store.create_story("Views", "Unrelated auth views work")
+        return store
+
+    def test_exact_substring_semantics(self, items):
+        from projectman.search import substring_search
+
+        results = substring_search("SRC/auth/views.py", items.project_dir)
+        assert [(r.id, r.score) for r in results] == [("US-TST-1", 1.0), ("US-TST-2", 0.5)]
+        assert results[1].snippet == "logging stack trace points at src/auth/views.py line 40"
+        assert _ids(substring_search("keyerror: 'user_id'", items.project_dir)) == ["US-TST-1"]
+        assert substring_search("views auth", items.project_dir) == []
+
+    def test_short_query_and_filters(self, items):
+        from projectman.search import substring_search
+
+        assert _ids(substring_search("40", items.project_dir)) == ["US-TST-2"]
+        assert substring_search("views.py", items.project_dir, item_type="task") == []
+
+    def test_index_follows_writes_without_reparsing(self, items, monkeypatch):
+        from projectman.search import substring_search
+
+        substring_search("views.py", items.project_dir)
+        parsed = _count_parses(monkeypatch)
+        items.update("US-TST-2", title="Logging (src/web/app.py)")
+        (items.stories_dir / "US-TST-1.md").unlink()
+
+        assert _ids(substring_search("views.py", items.project_dir)) == ["US-TST-2"]
+        assert _ids(substring_search("web/app", items.project_dir)) == ["US-TST-2"]
+        assert parsed == []
+
+    def test_scan_without_trigram_index_gives_same_results(self, items, monkeypatch):
+        from projectman.search import substring_search
+
+        expected = substring_search("auth/views", items.project_dir)
+        monkeypatch.setattr(search_module, "_has_grams", lambda conn: False)
+        assert substring_search("auth/views", items.project_dir) == expected
+
+    def test_pm_search_substring_mode(self, items, monkeypatch):
+        from projectman.server import _store_cache, pm_search
+
+        monkeypatch.chdir(items.root)
+        _store_cache.clear()
+
+        data = yaml.safe_load(pm_search("auth/views.py", mode="substring"))
+        assert [hit["id"] for hit in data] == ["US-TST-1", "US-TST-2"]
+
+
+@pytest.mark.parametrize("query", ["auth", "AUTH flow"])
+def test_pm_search_uses_index(tmp_project, monkeypatch, query):
+    from projectman.server import _store_cache, pm_create_story, pm_search
+
+    monkeypatch.chdir(tmp_project)
+    _store_cache.clear()
+
+    pm_create_story("Authentication system", "Login and signup flow")
+    data = yaml.safe_load(pm_search(query))
+    assert [item["id"] for item in data] == ["US-TST-1"]
+
+
+def _add_hub_project(hub_root, name, prefix):
+    pm_dir = hub_root / ".project" / "projects" / name
+    for sub in ("stories", "tasks", "epics"):
+        (pm_dir / sub).mkdir(parents=True)
+    config = {"name": name, "prefix": prefix, "hub": False, "projects": []}
+    (pm_dir / "config.yaml").write_text(yaml.dump(config))
+
+    from projectman.config import load_config, save_config
+
+    hub_config = load_config(hub_root)
+    hub_config.projects.append(name)
+    save_config(hub_config, hub_root)
+    return Store(hub_root, project_dir=pm_dir)
+
+
+class _WordModel:
+    """Fake embedding model: one dimension per known word."""
+
+    words = ["auth", "login", "billing", "invoice", "deploy"]
+
+    def __init__(self):
+        self.calls = 0
+
+    def embed(self, texts, batch_size=256):
+        import numpy as np
+
+        for text in texts:
+            self.calls += 1
+            tokens = tokenize(text)
+            vec = np.array([tokens.count(w) for w in self.words], dtype=np.float32) + 0.01
+            yield vec / np.linalg.norm(vec)
+
+
+class TestHubSearch:
+    @pytest.fixture
+    def hub(self, tmp_hub, monkeypatch):
+        from projectman.embeddings import flush_embeddings
+        from projectman.server import _store_cache
+
+        monkeypatch.chdir(tmp_hub)
+        _store_cache.clear()
+        api = _add_hub_project(tmp_hub, "api", "API")
+        web = _add_hub_project(tmp_hub, "web", "WEB")
+        api.create_story("Auth tokens", "Issue login tokens")
+        api.create_story("Billing export", "Invoice csv")
+        web.create_story("Login page", "Auth form")
+        flush_embeddings(10)
+        return {"api": api, "web": web}
+
+    def test_keyword_results_merged_with_project(self, hub):
+        from projectman.server import pm_search
+
+        data = yaml.safe_load(pm_search("auth"))
+        assert sorted((hit["project"], hit["id"]) for hit in data) == [
+            ("api", "US-API-1"),
+            ("web", "US-WEB-1"),
+        ]
+        assert data[0]["score"] >= data[1]["score"]
+
+    def test_project_argument_searches_one_project(self, hub):
+        from projectman.server import pm_search
+
+        data = yaml.safe_load(pm_search("auth", project="web"))
+        assert [hit["id"] for hit in data] == ["US-WEB-1"]
+        assert "project" not in data[0]
+
+    def test_semantic_fan_out_embeds_query_once(self, hub, monkeypatch):
+        import projectman.embeddings as embeddings
+        from projectman.server import pm_search
+
+        model = _WordModel()
+        monkeypatch.setattr(embeddings, "_model", model)
+        for store in hub.values():
+            emb = embeddings.get_embedding_store(store.project_dir)
+            for story in store.list_stories():
+                emb.index_item(story.id, story.title, "story", store.get_story(story.id)[1])
+        model.calls = 0
+
+        data = yaml.safe_load(pm_search("billing invoice"))
+        assert model.calls == 1
+        assert (data[0]["project"], data[0]["id"]) == ("api", "US-API-2")
+        assert len(data) == 3
+        assert [hit["score"] for hit in data] == sorted(
+            (hit["score"] for hit in data), reverse=True
+        )
+
+
+def test_rrf_rewards_agreement():
+    from projectman.hybrid import RRF_K, rrf
+
+    scores = rrf([["a", "b", "c"], ["b", "d"]])
+    assert list(scores) == ["a", "b", "c", "d"]
+    assert scores["b"] == pytest.approx(1 / (RRF_K + 2) + 1 / (RRF_K + 1))
+    assert max(scores, key=scores.get) == "b"
+
+
+class TestHybridSearch:
+    @pytest.fixture
+    def indexed(self, store, monkeypatch):
+        import projectman.embeddings as embeddings
+
+        monkeypatch.setattr(embeddings, "_model", _WordModel())
+        store.create_story("Login tokens", "Issue auth tokens on login")
+        store.create_story("Reclaim stale grabs", "Run grab_reclaim when a lease expires")
+        store.create_story("Auth audit", "Log every login attempt")
+        emb = embeddings.get_embedding_store(store.project_dir)
+        for story in store.list_stories():
+            emb.index_item(story.id, story.title, "story", store.get_story(story.id)[1])
+        return store
+
+    def test_identifier_query_found_by_keywords(self, indexed):
+        from projectman.embeddings import embed_query
+        from projectman.hybrid import hybrid_search
+
+        results = hybrid_search(
+            "grab_reclaim", indexed.project_dir, query_vec=embed_query("grab_reclaim")
+        )
+        assert results[0].id == "US-TST-2"
+        assert "grab_reclaim" in results[0].snippet
+        assert len(results) == 3  # the vector side still ranks the rest
+
+    def test_exact_id_returns_only_that_item(self, indexed):
+        from projectman.hybrid import hybrid_search
+
+        results = hybrid_search("us-tst-3", indexed.project_dir)
+        assert [(r.id, r.score) for r in results] == [("US-TST-3", 1.0)]
+        # An ID excluded by the filters falls through to ranked search.
+        assert hybrid_search("US-TST-3", indexed.project_dir, item_type="task") == []
+
+    def test_exact_id_matches_lowercase_stored_id(self, indexed):
+        from projectman.hybrid import exact_match
+
+        source = (indexed.stories_dir / "US-TST-1.md").read_text()
+        (indexed.stories_dir / "us-web-1.md").write_text(
+            source.replace("id: US-TST-1", "id: us-web-1").replace("Login tokens", "Web")
+        )
+        for query in ("us-web-1", "US-WEB-1"):
+            hit = exact_match(query, indexed.project_dir)
+            assert (hit.id, hit.title) == ("us-web-1", "Web")
+        assert exact_match("us-tst-1", indexed.project_dir).id == "US-TST-1"
+
+    def test_slow_keyword_side_is_dropped_after_budget(self, indexed, monkeypatch):
+        import time
+
+        from projectman.embeddings import embed_query
+        from projectman.hybrid import hybrid_search
+
+        def slow_search(self, *args, **kwargs):
+            time.sleep(0.5)
+            return []
+
+        monkeypatch.setattr(SearchIndex, "search", slow_search)
+        start = time.perf_counter()
+        results = hybrid_search(
+            "login", indexed.project_dir, query_vec=embed_query("login"), budget=0.01
+        )
+        assert time.perf_counter() - start < 0.4
+        assert {r.id for r in results} == {"US-TST-1", "US-TST-2", "US-TST-3"}
+        assert all(r.snippet == "" for r in results)
+
+    def test_no_budget_by_default(self, indexed, monkeypatch):
+        import time
+
+        from projectman.embeddings import embed_query
+        from projectman.hybrid import hybrid_search
+
+        real_search = SearchIndex.search
+
+        def slow_search(self, *args, **kwargs):
+            time.sleep(0.1)
+            return real_search(self, *args, **kwargs)
+
+        monkeypatch.setattr(SearchIndex, "search", slow_search)
+        results = hybrid_search("login", indexed.project_dir, query_vec=embed_query("login"))
+        assert any(r.snippet for r in results)
+
+    def test_identifier_query_waits_for_keyword_side(self, indexed, monkeypatch):
+        import time
+
+        from projectman.embeddings import embed_query
+        from projectman.hybrid import hybrid_search
+
+        real_search = SearchIndex.search
+
+        def slow_search(self, *args, **kwargs):
+            time.sleep(0.1)
+            return real_search(self, *args, **kwargs)
+
+        monkeypatch.setattr(SearchIndex, "search", slow_search)
+        results = hybrid_search(
+            "grab_reclaim", indexed.project_dir,
+            query_vec=embed_query("grab_reclaim"), budget=0.01,
+        )
+        assert results[0].id == "US-TST-2"
+        assert "grab_reclaim" in results[0].snippet
+
+    def test_pm_search_modes(self, indexed, monkeypatch):
+        from projectman.server import _store_cache, pm_search
+
+        monkeypatch.chdir(indexed.root)
+        _store_cache.clear()
+
+        hybrid = yaml.safe_load(pm_search("grab_reclaim"))
+        assert hybrid[0]["id"] == "US-TST-2"
+        keyword = yaml.safe_load(pm_search("grab_reclaim", mode="keyword"))
+        assert [hit["id"] for hit in keyword] == ["US-TST-2"]
+        assert len(yaml.safe_load(pm_search("grab_reclaim", mode="semantic"))) == 3
+        assert pm_search("x", mode="fuzzy").startswith("error: unknown mode")
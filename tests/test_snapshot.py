@@ -0,0 +1,129 @@
+"""Tests for the persistent parsed-item snapshot used on cold start."""
+
+import frontmatter as fm
+
+from projectman import store as store_module
+from projectman.snapshot import Snapshot
+from projectman.store import Store, clear_all_caches
+
+
+def _count_loads(monkeypatch):
+    """Patch the Store's frontmatter reader to record the file names it parses."""
+    loaded = []
+    original = store_module.read_meta
+
+    def counting_read_meta(path):
+        loaded.append(path.name)
+        return original(path)
+
+    monkeypatch.setattr(store_module, "read_meta", counting_read_meta)
+    return loaded
+
+
+def _cold_store(tmp_project):
+    """Simulate a new server process: drop in-memory caches, new Store."""
+    clear_all_caches()
+    return Store(tmp_project)
+
+
+class TestSnapshotColdStart:
+    def test_cold_start_restores_without_parsing(self, store, tmp_project, monkeypatch):
+        store.create_story("Story", "Story body")
+        store.create_task("US-TST-1", "Task", "Task body")
+        store.list_stories()
+        store.list_tasks()
+
+        fresh = _cold_store(tmp_project)
+        loaded = _count_loads(monkeypatch)
+
+        stories = fresh.list_stories()
+        tasks = fresh.list_tasks(story_id="US-TST-1")
+        assert [s.id for s in stories] == ["US-TST-1"]
+        assert [t.id for t in tasks] == ["US-TST-1-1"]
+        _, body = fresh.get_task("US-TST-1-1")
+        assert body == "Task body"
+        assert loaded == []
+
+    def test_external_edit_reparses_only_changed_file(self, store, tmp_project, monkeypatch):
+        store.create_story("Story 1", "Desc")
+        store.create_story("Story 2", "Desc")
+        store.list_stories()
+
+        path = store.stories_dir / "US-TST-2.md"
+        post = fm.load(str(path))
+        post["title"] = "Renamed externally"
+        path.write_text(fm.dumps(post))
+
+        fresh = _cold_store(tmp_project)
+        loaded = _count_loads(monkeypatch)
+        stories = {s.id: s for s in fresh.list_stories()}
+
+        assert stories["US-TST-2"].title == "Renamed externally"
+        assert loaded == ["US-TST-2.md"]
+
+    def test_deleted_file_not_restored(self, store, tmp_project):
+        store.create_story("Story 1", "Desc")
+        store.create_story("Story 2", "Desc")
+        store.list_stories()
+        (store.stories_dir / "US-TST-1.md").unlink()
+
+        fresh = _cold_store(tmp_project)
+        assert [s.id for s in fresh.list_stories()] == ["US-TST-2"]
+
+    def test_store_writes_are_written_through(self, store, tmp_project, monkeypatch):
+        store.create_story("Story", "Desc")
+        store.list_stories()
+        store.update("US-TST-1", title="Updated", body="New body")
+        store.create_story("Second", "Desc")
+
+        fresh = _cold_store(tmp_project)
+        loaded = _count_loads(monkeypatch)
+        assert [s.id for s in fresh.list_stories()] == ["US-TST-1", "US-TST-2"]
+        meta, body = fresh.get_story("US-TST-1")
+
+        assert meta.title == "Updated"
+        assert body == "New body"
+        assert loaded == []
+
+    def test_archived_story_stays_out_of_cache(self, store, tmp_project):
+        store.create_story("Story", "Desc")
+        store.list_stories()
+        store.archive("US-TST-1")
+
+        fresh = _cold_store(tmp_project)
+        assert fresh.list_stories() == []
+        assert [s.id for s in fresh.list_stories(status="archived")] == ["US-TST-1"]
+
+
+class TestSnapshotFile:
+    def test_cache_dir_is_git_ignored(self, store):
+        store.create_story("Story", "Desc")
+        store.list_stories()
+
+        cache_dir = store.project_dir / ".cache"
+        assert (cache_dir / "snapshot.db").exists()
+        assert (cache_dir / ".gitignore").read_text() == "*\n"
+
+    def test_corrupt_snapshot_falls_back_to_parsing(self, store, tmp_project):
+        store.create_story("Story", "Desc")
+        store.list_stories()
+        (store.project_dir / ".cache" / "snapshot.db").write_bytes(b"not a database")
+
+        fresh = _cold_store(tmp_project)
+        assert [s.id for s in fresh.list_stories()] == ["US-TST-1"]
+
+    def test_disabled_snapshot_writes_nothing(self, tmp_project, monkeypatch):
+        monkeypatch.setattr(store_module, "_snapshot_enabled", False)
+        clear_all_caches()
+        store = Store(tmp_project)
+        store.create_story("Story", "Desc")
+        store.list_stories()
+
+        assert not (store.project_dir / ".cache").exists()
+
+    def test_missing_project_dir_is_not_created(self, tmp_path):
+        snapshot = Snapshot(tmp_path / "missing")
+        snapshot.save("stories", {"A.md": ((1, 2, 3), None, None)})
+
+        assert snapshot.load("stories") == {}
+        assert not (tmp_path / "missing").exists()
@@ -2,7 +2,7 @@
 
 import pytest
 
-from projectman.store import Store, clear_all_caches, get_cache_stats, _cache, _cache_stats, _cache_debug
+from projectman.store import Store, clear_all_caches, get_cache_stats, _body_cache, _cache, _cache_stats, _cache_debug
 import projectman.store as store_module
 
 
@@ -689,6 +689,25 @@ class TestDependsOnEdgeCases:
         assert meta.title == "Task A"
         assert meta.depends_on == []
 
+    def test_update_cycle_rollback_keeps_lease_and_search_entry(self, store):
+        """Cycle rollback in update leaves the lease and keyword index untouched."""
+        from projectman.leases import LeaseTable
+        from projectman.search import get_search_index
+
+        store.create_story("Story", "Desc")
+        store.create_task("US-TST-1", "Task A", "Desc")
+        store.create_task("US-TST-1", "Task B", "Desc", depends_on=["US-TST-1-1"])
+        LeaseTable(store.project_dir).acquire("US-TST-1-1", "alice")
+        store.update("US-TST-1-1", assignee="alice", status="in-progress")
+
+        with pytest.raises(ValueError, match="cycle"):
+            store.update(
+                "US-TST-1-1", status="review", title="Renamed", depends_on=["US-TST-1-2"]
+            )
+        assert store.get_lease("US-TST-1-1").assignee == "alice"
+        assert get_search_index(store.project_dir).get("US-TST-1-1").title == "Task A"
+        assert not get_search_index(store.project_dir).search("Renamed")
+
     def test_diamond_dependency_valid(self, store):
         """Diamond pattern (B→A, C→A, D→B+C) is valid — no cycle."""
         store.create_story("Story", "Desc")
@@ -738,36 +757,56 @@ class TestDependsOnEdgeCases:
             ])
 
 
-class TestCheckDependencyCyclesUsesDetectCycle:
-    """Verify store._check_dependency_cycles delegates to deps.detect_cycle."""
-
-    def test_delegates_to_deps_detect_cycle(self, store):
-        """_check_dependency_cycles calls deps.detect_cycle with the task graph."""
-        from unittest.mock import patch
+class TestDependencyGraph:
+    """Store.dependency_graph() and the cycle checks built on it."""
 
+    def test_graph_follows_store_changes(self, store):
         store.create_story("Story", "Desc")
-        store.create_task("US-TST-1", "Task A", "Desc")
-        store.create_task("US-TST-1", "Task B", "Desc")
+        store.create_task("US-TST-1", "A", "Desc")
+        store.create_task("US-TST-1", "B", "Desc", depends_on=["US-TST-1-1"])
+        graph = store.dependency_graph()
+        assert graph.dependents("US-TST-1-1") == {"US-TST-1-2"}
+
+        store.update("US-TST-1", depends_on=["US-TST-1-1"])
+        store.update("US-TST-1-2", depends_on=[])
+        assert store.dependency_graph() is graph
+        assert graph.dependents("US-TST-1-1") == {"US-TST-1"}
+        assert graph.dependencies("US-TST-1") == ["US-TST-1-1"]
 
-        with patch("projectman.store.detect_cycle", return_value=None) as mock_dc:
-            store._check_dependency_cycles("US-TST-1")
-            mock_dc.assert_called_once()
-            graph_arg = mock_dc.call_args[0][0]
-            assert "US-TST-1-1" in graph_arg
-            assert "US-TST-1-2" in graph_arg
+        (store.tasks_dir / "US-TST-1-2.md").unlink()
+        assert "US-TST-1-2" not in store.dependency_graph()
 
-    def test_raises_when_detect_cycle_finds_cycle(self, store):
-        """_check_dependency_cycles raises ValueError when detect_cycle returns a cycle."""
-        from unittest.mock import patch
+    def test_cycle_check_starts_from_the_changed_item(self, store):
+        import frontmatter as fm
 
         store.create_story("Story", "Desc")
-        store.create_task("US-TST-1", "Task A", "Desc")
-        store.create_task("US-TST-1", "Task B", "Desc")
+        for title in "ABCD":
+            store.create_task("US-TST-1", title, "Desc")
+        # A cycle written behind the Store's back does not block unrelated updates.
+        for name, dep in (("US-TST-1-1", "US-TST-1-2"), ("US-TST-1-2", "US-TST-1-1")):
+            path = store.tasks_dir / f"{name}.md"
+            post = fm.load(path)
+            post.metadata["depends_on"] = [dep]
+            path.write_text(fm.dumps(post))
+
+        store.update("US-TST-1-4", depends_on=["US-TST-1-3"])
+        with pytest.raises(ValueError, match="US-TST-1-1 -> US-TST-1-2 -> US-TST-1-1"):
+            store.update("US-TST-1-3", depends_on=["US-TST-1-1"])
+        assert store.get_task("US-TST-1-3")[0].depends_on == []
+
+    def test_cycle_through_a_story_is_rejected(self, store):
+        store.create_story("Story 1", "Desc")
+        store.create_story("Story 2", "Desc")
+        store.create_task("US-TST-1", "A", "Desc")
+        store.update("US-TST-2", depends_on=["US-TST-1-1"])
 
-        fake_cycle = ["US-TST-1-1", "US-TST-1-2", "US-TST-1-1"]
-        with patch("projectman.store.detect_cycle", return_value=fake_cycle):
-            with pytest.raises(ValueError, match="US-TST-1-1 -> US-TST-1-2 -> US-TST-1-1"):
-                store._check_dependency_cycles("US-TST-1")
+        with pytest.raises(ValueError, match="cycle"):
+            store.update("US-TST-1-1", depends_on=["US-TST-2"])
+        with pytest.raises(ValueError, match="cycle"):
+            store.update("US-TST-1", depends_on=["US-TST-2"])
+            store.update("US-TST-2", depends_on=["US-TST-1"])
+        assert store.get_task("US-TST-1-1")[0].depends_on == []
+        assert store.get_story("US-TST-2")[0].depends_on == ["US-TST-1-1"]
 
 
 class TestStoreCustomProjectDir:
@@ -935,6 +974,15 @@ class TestClearCache:
         assert len(stories) == 1
 
 
+def _fail_on_disk_read(monkeypatch):
+    """Make every Store frontmatter read raise."""
+    def fail(*args, **kwargs):
+        raise AssertionError("Unexpected disk read")
+
+    monkeypatch.setattr(store_module, "read_meta", fail)
+    monkeypatch.setattr(store_module, "read_post", fail)
+
+
 class TestCacheHoldsInMemory:
     """Verify that after the first list call, subsequent calls return from cache not disk."""
 
@@ -963,21 +1011,21 @@ class TestCacheHoldsInMemory:
         assert tasks_key in _cache
         assert epics_key in _cache
 
-        # Each entry is a (frontmatter_obj, body_str) tuple
+        # Each entry is a frontmatter object; bodies are loaded lazily
         assert len(_cache[stories_key]) == 1
-        meta, body = _cache[stories_key][0]
+        meta = _cache[stories_key].get("US-TST-1")
         assert meta.id == "US-TST-1"
         assert meta.title == "Story"
-        assert isinstance(body, str)
 
         assert len(_cache[tasks_key]) == 1
-        task_meta, task_body = _cache[tasks_key][0]
+        task_meta = _cache[tasks_key].get("US-TST-1-1")
         assert task_meta.id == "US-TST-1-1"
         assert task_meta.story_id == "US-TST-1"
 
         assert len(_cache[epics_key]) == 1
-        epic_meta, _ = _cache[epics_key][0]
+        epic_meta = _cache[epics_key].get("EPIC-TST-1")
         assert epic_meta.title == "Epic 1"
+        assert len(_body_cache) == 0
 
     def test_list_tasks_no_disk_read_on_second_call(self, store, monkeypatch):
         """After list_tasks populates cache, second call does not read from disk."""
@@ -989,12 +1037,8 @@ class TestCacheHoldsInMemory:
         tasks1 = store.list_tasks(story_id="US-TST-1")
         assert len(tasks1) == 1
 
-        # Patch frontmatter.load so any disk read raises
-        import frontmatter as fm
-        original_load = fm.load
-        def fail_on_load(*args, **kwargs):
-            raise AssertionError("Unexpected disk read via frontmatter.load")
-        monkeypatch.setattr(fm, "load", fail_on_load)
+        # Patch the frontmatter readers so any disk read raises
+        _fail_on_disk_read(monkeypatch)
 
         # Second call — must come from cache, no disk I/O
         tasks2 = store.list_tasks(story_id="US-TST-1")
@@ -1011,10 +1055,8 @@ class TestCacheHoldsInMemory:
         stories1 = store.list_stories()
         assert len(stories1) == 2
 
-        # Patch frontmatter.load
-        import frontmatter as fm
-        monkeypatch.setattr(fm, "load", lambda *a, **kw: (_ for _ in ()).throw(
-            AssertionError("Unexpected disk read via frontmatter.load")))
+        # Patch the frontmatter readers
+        _fail_on_disk_read(monkeypatch)
 
         # Second call — from cache
         stories2 = store.list_stories()
@@ -1029,17 +1071,15 @@ class TestCacheHoldsInMemory:
         epics1 = store.list_epics()
         assert len(epics1) == 1
 
-        # Patch frontmatter.load
-        import frontmatter as fm
-        monkeypatch.setattr(fm, "load", lambda *a, **kw: (_ for _ in ()).throw(
-            AssertionError("Unexpected disk read via frontmatter.load")))
+        # Patch the frontmatter readers
+        _fail_on_disk_read(monkeypatch)
 
         # Second call — from cache
         epics2 = store.list_epics()
         assert len(epics2) == 1
 
     def test_get_task_uses_cache_after_list(self, store, monkeypatch):
-        """get_task returns from cache if list_tasks has been called."""
+        """get_task takes frontmatter from the cache and loads the body lazily."""
         store.create_story("Story", "Desc")
         store.create_task("US-TST-1", "Task 1", "Body text")
         store.clear_cache()
@@ -1047,15 +1087,18 @@ class TestCacheHoldsInMemory:
         # Populate cache via list
         store.list_tasks()
 
-        # Patch disk I/O
-        import frontmatter as fm
-        monkeypatch.setattr(fm, "load", lambda *a, **kw: (_ for _ in ()).throw(
-            AssertionError("Unexpected disk read via frontmatter.load")))
+        # Frontmatter must come from the cache
+        monkeypatch.setattr(store_module, "read_meta", lambda *a, **kw: (_ for _ in ()).throw(
+            AssertionError("Unexpected frontmatter parse")))
 
-        # get_task should use cached data
         meta, body = store.get_task("US-TST-1-1")
         assert meta.id == "US-TST-1-1"
         assert meta.title == "Task 1"
+        assert body == "Body text"
+
+        # The body is now held in the LRU
+        _fail_on_disk_read(monkeypatch)
+        assert store.get_task("US-TST-1-1")[1] == "Body text"
 
     def test_get_story_uses_cache_after_list(self, store, monkeypatch):
         """get_story returns from cache if list_stories has been called."""
@@ -1064,16 +1107,137 @@ class TestCacheHoldsInMemory:
 
         # Populate cache via list
         store.list_stories()
+        store.get_story("US-TST-1")
 
         # Patch disk I/O
-        import frontmatter as fm
-        monkeypatch.setattr(fm, "load", lambda *a, **kw: (_ for _ in ()).throw(
-            AssertionError("Unexpected disk read via frontmatter.load")))
+        _fail_on_disk_read(monkeypatch)
 
         # get_story should use cached data
         meta, body = store.get_story("US-TST-1")
         assert meta.id == "US-TST-1"
         assert meta.title == "My Story"
+        assert body == "Story body"
+
+    def test_body_cache_is_bounded(self, store, monkeypatch):
+        """Lazily loaded bodies are evicted least-recently-used first."""
+        monkeypatch.setattr(_body_cache, "maxsize", 2)
+        store.create_story("Story", "Desc")
+        for i in range(3):
+            store.create_task("US-TST-1", f"Task {i}", f"Body {i}")
+        store.clear_cache()
+        store.list_tasks()
+
+        for task_id in ("US-TST-1-1", "US-TST-1-2", "US-TST-1-3"):
+            store.get_task(task_id)
+        assert len(_body_cache) == 2
+        assert _body_cache.get(store._cache_key("tasks") + ("US-TST-1-1",)) is None
+
+    def test_read_bodies_skips_missing_and_leaves_lru_alone(self, store):
+        store.create_story("Story", "Desc")
+        store.create_task("US-TST-1", "Task A", "Body A")
+        store.create_task("US-TST-1", "Task B", "Body B")
+        store.clear_cache()
+        store.list_tasks()
+        (store.tasks_dir / "US-TST-1-2.md").unlink()
+        _body_cache.clear()
+
+        bodies = store.read_bodies("tasks", ["US-TST-1-1", "US-TST-1-2"])
+        assert bodies == {"US-TST-1-1": "Body A"}
+        assert len(_body_cache) == 0
+
+
+class TestCacheChangeLog:
+    def test_changes_since_reports_changed_and_removed_items(self, store):
+        store.create_story("Story", "Desc")
+        store.create_task("US-TST-1", "Task A", "Body")
+        store.create_task("US-TST-1", "Task B", "Body")
+        generation, _ = store.changes_since("tasks", 0)
+
+        store.update("US-TST-1-1", status="in-progress")
+        (store.tasks_dir / "US-TST-1-2.md").unlink()
+        later, changes = store.changes_since("tasks", generation)
+        assert later > generation
+        assert changes["US-TST-1-1"].status.value == "in-progress"
+        assert changes["US-TST-1-2"] is None
+        assert set(changes) == {"US-TST-1-1", "US-TST-1-2"}
+        assert store.changes_since("tasks", later) == (later, {})
+
+    def test_changes_since_gives_up_past_the_log(self, store, monkeypatch):
+        monkeypatch.setattr(store_module, "CHANGE_LOG_SIZE", 4)
+        store.create_story("Story", "Desc")
+        generation, _ = store.changes_since("stories", 0)
+        assert store.changes_since("stories", 0)[1] is None
+
+        for title in "abcdef":
+            store.update("US-TST-1", title=title)
+        assert store.changes_since("stories", generation)[1] is None
+        store.clear_cache()
+        assert store.changes_since("stories", generation)[1] is None
+
+
+class TestCacheSecondaryIndexes:
+    """Filtered list calls are answered from the cache's secondary indexes."""
+
+    def test_list_tasks_filters_by_story_status_assignee_and_tag(self, store):
+        store.create_story("Story 1", "Desc")
+        store.create_story("Story 2", "Desc")
+        store.create_task("US-TST-1", "Task A", "Body", tags=["api"])
+        store.create_task("US-TST-1", "Task B", "Body")
+        store.create_task("US-TST-2", "Task C", "Body", tags=["api"])
+        store.update("US-TST-1-2", status="in-progress", assignee="alice")
+
+        assert [t.id for t in store.list_tasks(story_id="US-TST-1")] == [
+            "US-TST-1-1", "US-TST-1-2",
+        ]
+        assert [t.id for t in store.list_tasks(status="in-progress")] == ["US-TST-1-2"]
+        assert [t.id for t in store.list_tasks(assignee="alice")] == ["US-TST-1-2"]
+        assert [t.id for t in store.list_tasks(tag="api")] == ["US-TST-1-1", "US-TST-2-1"]
+        assert [t.id for t in store.list_tasks(story_id="US-TST-2", tag="api")] == ["US-TST-2-1"]
+        assert store.list_tasks(story_id="US-TST-2", status="in-progress") == []
+
+    def test_list_stories_filters_by_epic_and_tag(self, store):
+        epic = store.create_epic("Epic", "Desc")
+        store.create_story("Story 1", "Desc", tags=["ui"])
+        store.create_story("Story 2", "Desc")
+        store.update("US-TST-2", epic_id=epic.id)
+
+        assert [s.id for s in store.list_stories(epic_id=epic.id)] == ["US-TST-2"]
+        assert [s.id for s in store.list_stories(tag="ui")] == ["US-TST-1"]
+        assert store.list_stories(epic_id=epic.id, tag="ui") == []
+
+    def test_indexes_follow_updates(self, store):
+        store.create_story("Story", "Desc")
+        store.create_task("US-TST-1", "Task", "Body")
+        assert len(store.list_tasks(status="todo")) == 1
+
+        store.update("US-TST-1-1", status="done", assignee="bob")
+        assert store.list_tasks(status="todo") == []
+        assert [t.id for t in store.list_tasks(status="done")] == ["US-TST-1-1"]
+        assert [t.id for t in store.list_tasks(assignee="bob")] == ["US-TST-1-1"]
+
+    def test_archived_story_leaves_indexes(self, store):
+        store.create_story("Story", "Desc", tags=["ui"])
+        store.list_stories()
+        store.archive("US-TST-1")
+
+        assert store.list_stories(tag="ui") == []
+        archived = store.list_stories(status="archived", tag="ui")
+        assert [s.id for s in archived] == ["US-TST-1"]
+
+    def test_external_edit_reindexes_entry(self, store):
+        store.create_story("Story", "Desc")
+        store.create_task("US-TST-1", "Task", "Body")
+        store.list_tasks()
+
+        import frontmatter as fm
+        path = store.tasks_dir / "US-TST-1-1.md"
+        post = fm.load(str(path))
+        post["status"] = "review"
+        post["size_bump"] = "x" * 32  # ensure the fingerprint changes
+        path.write_text(fm.dumps(post))
+
+        assert store.list_tasks(status="todo") == []
+        assert [t.id for t in store.list_tasks(status="review")] == ["US-TST-1-1"]
 
 
 class TestCachePerInstanceSharedDict:
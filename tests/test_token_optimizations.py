@@ -302,6 +302,44 @@ def test_pm_done_next_same_story_only_stops(tmp_project):
     assert "next_info" in result
 
 
+def test_pm_done_next_counts_blocked_separately(tmp_project):
+    from projectman.leases import LeaseTable
+    from projectman.server import (
+        pm_create_story, pm_create_tasks, pm_update, pm_grab, pm_done_next,
+    )
+    _story_with_tasks(1)
+    pm_create_tasks("US-TST-1", [{"title": "Thin task", "description": "tbd"}])
+    pm_create_story("Other story", "Other body")
+    pm_update("US-TST-2", status="active")
+    pm_create_tasks("US-TST-2", [
+        {"title": "Other task", "description": READY_TASK_BODY, "points": 1},
+    ])
+    # Ready, but leased by another agent
+    LeaseTable(tmp_project / ".project").acquire("US-TST-2-1", "bob")
+    pm_grab("US-TST-1-1")
+    result = yaml.safe_load(pm_done_next("US-TST-1-1"))
+    assert result["next"] is None
+    assert "(2 todo, 1 blocked" in result["next_info"]
+
+
+def test_pm_done_next_emits_events_after_flush(tmp_project, monkeypatch):
+    import projectman.server as server
+    from projectman.server import pm_grab, pm_done_next
+
+    _story_with_tasks(2)
+    pm_grab("US-TST-1-1")
+    tasks_dir = tmp_project / ".project" / "tasks"
+    events = []
+
+    def record(event_type, data):
+        on_disk = (tasks_dir / f"{data['taskId']}.md").read_text()
+        events.append((data["taskId"], f"status: {data['newStatus']}" in on_disk))
+
+    monkeypatch.setattr(server, "_emit", record)
+    pm_done_next("US-TST-1-1")
+    assert events == [("US-TST-1-1", True), ("US-TST-1-2", True)]
+
+
 def test_pm_done_next_without_note_skips_run_log(tmp_project):
     from projectman.server import pm_grab, pm_done_next
     from projectman.store import Store
@@ -0,0 +1,279 @@
+"""Tests for Store.transaction() batched mutations."""
+
+import json
+import subprocess
+import threading
+
+import pytest
+import yaml
+
+from projectman.store import Store
+
+
+def _activity_lines(store):
+    path = store.project_dir / "activity.jsonl"
+    if not path.exists():
+        return []
+    return [json.loads(line) for line in path.read_text().splitlines() if line]
+
+
+def _commit_count(cwd):
+    result = subprocess.run(
+        ["git", "rev-list", "--count", "HEAD"],
+        cwd=str(cwd), capture_output=True, text=True, check=True,
+    )
+    return int(result.stdout.strip())
+
+
+class TestTransactionStaging:
+    def test_writes_are_staged_until_exit(self, store):
+        store.create_story("Story", "Desc")
+        store.create_task("US-TST-1", "Task", "Body")
+        path = store.tasks_dir / "US-TST-1-1.md"
+        before = path.read_text()
+
+        with store.transaction():
+            store.update("US-TST-1-1", status="in-progress", body="New body")
+            assert path.read_text() == before
+            meta, body = store.get_task("US-TST-1-1")
+            assert meta.status.value == "in-progress"
+            assert body == "New body"
+            assert [t.id for t in store.list_tasks(status="in-progress")] == ["US-TST-1-1"]
+
+        assert "status: in-progress" in path.read_text()
+        assert store.get_task("US-TST-1-1")[1] == "New body"
+
+    def test_create_story_then_tasks_in_one_block(self, store):
+        with store.transaction():
+            story, _ = store.create_story("Story", "Desc")
+            first = store.create_task(story.id, "First", "Body")
+            second = store.create_task(story.id, "Second", "Body", depends_on=[first.id])
+            assert not (store.tasks_dir / f"{second.id}.md").exists()
+
+        assert [t.id for t in store.list_tasks(story_id=story.id)] == [first.id, second.id]
+        assert store.get_task(second.id)[0].depends_on == [first.id]
+
+    def test_repeated_updates_write_file_once(self, store, monkeypatch):
+        store.create_story("Story", "Desc")
+        store.create_task("US-TST-1", "Task", "Body")
+
+        writes = []
+        original = type(store.tasks_dir).write_text
+
+        def counting_write(self, *args, **kwargs):
+            writes.append(self.name)
+            return original(self, *args, **kwargs)
+
+        monkeypatch.setattr(type(store.tasks_dir), "write_text", counting_write)
+        with store.transaction():
+            store.update("US-TST-1-1", status="in-progress")
+            store.update("US-TST-1-1", assignee="alice")
+            store.update("US-TST-1-1", status="review")
+
+        assert writes.count("US-TST-1-1.md") == 1
+        meta, _ = store.get_task("US-TST-1-1")
+        assert (meta.status.value, meta.assignee) == ("review", "alice")
+
+    def test_nested_transactions_join_outer(self, store):
+        store.create_story("Story", "Desc")
+        path = store.stories_dir / "US-TST-1.md"
+
+        with store.transaction():
+            with store.transaction():
+                store.update("US-TST-1", title="Inner")
+            assert "Inner" not in path.read_text()
+
+        assert "title: Inner" in path.read_text()
+
+    def test_transaction_is_per_thread(self, store):
+        store.create_story("Story", "Desc")
+        seen = []
+
+        with store.transaction():
+            thread = threading.Thread(target=lambda: seen.append(store.in_transaction))
+            thread.start()
+            thread.join()
+            assert store.in_transaction
+
+        assert seen == [False]
+        assert not store.in_transaction
+
+    def test_other_threads_wait_for_flush(self, store):
+        store.create_story("Story", "Desc")
+        seen = []
+
+        def other_thread():
+            seen.append([t.id for t in store.list_tasks()])
+            seen.append(store.update("US-TST-1-1", status="in-progress").status.value)
+
+        with store.transaction():
+            store.create_task("US-TST-1", "Task", "Body")
+            thread = threading.Thread(target=other_thread)
+            thread.start()
+            thread.join(0.2)
+            assert thread.is_alive()
+            assert seen == []
+
+        thread.join(5)
+        assert seen == [["US-TST-1-1"], "in-progress"]
+        assert store.get_task("US-TST-1-1")[0].status.value == "in-progress"
+
+    def test_only_writing_transactions_block_their_project(self, store, tmp_path):
+        import shutil
+
+        shutil.copytree(store.project_dir, tmp_path / "other" / ".project")
+        other = Store(tmp_path / "other")
+        seen = []
+
+        def run(target):
+            thread = threading.Thread(target=lambda: seen.append(target()))
+            thread.start()
+            thread.join(5)
+            assert not thread.is_alive()
+
+        with store.transaction():
+            run(lambda: len(store.list_stories()))  # nothing staged yet
+            store.create_story("Story", "Desc")
+            run(lambda: other.create_story("Elsewhere", "Desc")[0].id)
+
+        assert seen == [0, "US-TST-1"]
+        assert [s.title for s in other.list_stories()] == ["Elsewhere"]
+
+
+class TestTransactionRollback:
+    def test_on_commit_waits_for_flush_and_is_dropped_on_failure(self, store):
+        store.create_story("Story", "Desc")
+        path = store.stories_dir / "US-TST-1.md"
+        seen = []
+
+        with store.transaction():
+            store.update("US-TST-1", title="Renamed")
+            store.on_commit(lambda: seen.append("Renamed" in path.read_text()))
+            assert seen == []
+        assert seen == [True]
+
+        with pytest.raises(RuntimeError):
+            with store.transaction():
+                store.on_commit(lambda: seen.append("failed"))
+                raise RuntimeError("boom")
+        store.on_commit(lambda: seen.append("now"))
+        assert seen == [True, "now"]
+
+    def test_exception_discards_staged_changes(self, store):
+        store.create_story("Story", "Desc")
+        path = store.stories_dir / "US-TST-1.md"
+        before = path.read_text()
+        log_before = len(_activity_lines(store))
+
+        with pytest.raises(RuntimeError):
+            with store.transaction():
+                store.update("US-TST-1", title="Changed")
+                store.create_task("US-TST-1", "Task", "Body")
+                raise RuntimeError("boom")
+
+        assert path.read_text() == before
+        assert not (store.tasks_dir / "US-TST-1-1.md").exists()
+        assert store.get_story("US-TST-1")[0].title == "Story"
+        assert store.list_tasks() == []
+        assert len(_activity_lines(store)) == log_before
+
+    def test_cycle_checked_once_at_end(self, store):
+        store.create_story("Story", "Desc")
+        store.create_task("US-TST-1", "A", "Body")
+        store.create_task("US-TST-1", "B", "Body")
+
+        with pytest.raises(ValueError, match="cycle"):
+            with store.transaction():
+                store.update("US-TST-1-1", depends_on=["US-TST-1-2"])
+                store.update("US-TST-1-2", depends_on=["US-TST-1-1"])
+
+        tasks = {t.id: t for t in store.list_tasks()}
+        assert tasks["US-TST-1-1"].depends_on == []
+        assert tasks["US-TST-1-2"].depends_on == []
+
+    def test_intermediate_cycle_resolved_within_block_is_allowed(self, store):
+        store.create_story("Story", "Desc")
+        store.create_task("US-TST-1", "A", "Body")
+        store.create_task("US-TST-1", "B", "Body", depends_on=["US-TST-1-1"])
+
+        with store.transaction():
+            store.update("US-TST-1-1", depends_on=["US-TST-1-2"])
+            store.update("US-TST-1-2", depends_on=[])
+
+        assert store.get_task("US-TST-1-1")[0].depends_on == ["US-TST-1-2"]
+
+
+class TestTransactionFlush:
+    def test_activity_log_appended_in_one_batch(self, store, monkeypatch):
+        import projectman.activity_log as activity_log
+
+        store.create_story("Story", "Desc")
+        store.create_task("US-TST-1", "Task", "Body")
+        single = []
+        monkeypatch.setattr(activity_log, "append_log_entry", lambda *a: single.append(a))
+
+        with store.transaction():
+            store.update("US-TST-1-1", status="in-progress")
+            store.update("US-TST-1", status="active")
+
+        assert single == []
+        events = _activity_lines(store)[-2:]
+        assert [e["item_id"] for e in events] == ["US-TST-1-1", "US-TST-1"]
+
+    def test_actor_resolved_once(self, store, monkeypatch):
+        store.create_story("Story", "Desc")
+        calls = []
+        original = Store._resolve_actor
+
+        def counting_resolve(self):
+            calls.append(1)
+            return original(self)
+
+        monkeypatch.setattr(Store, "_resolve_actor", counting_resolve)
+        with store.transaction():
+            store.update("US-TST-1", status="active")
+            store.update("US-TST-1", title="Renamed", note="done", outcome="success")
+
+        assert len(calls) == 1
+        assert len(store.get_run_log("US-TST-1")) == 1
+
+    def test_single_auto_commit(self, tmp_git_project):
+        config_path = tmp_git_project / ".project" / "config.yaml"
+        config = yaml.safe_load(config_path.read_text())
+        config["auto_commit"] = True
+        config_path.write_text(yaml.dump(config))
+        subprocess.run(["git", "commit", "-qam", "enable"], cwd=str(tmp_git_project), check=True)
+
+        store = Store(tmp_git_project)
+        store.create_story("Story", "Desc")
+        before = _commit_count(tmp_git_project)
+
+        with store.transaction():
+            store.create_task("US-TST-1", "A", "Body")
+            store.create_task("US-TST-1", "B", "Body")
+            store.update("US-TST-1", status="active")
+
+        assert _commit_count(tmp_git_project) == before + 1
+        status = subprocess.run(
+            ["git", "status", "--porcelain", ".project/stories", ".project/tasks"],
+            cwd=str(tmp_git_project), capture_output=True, text=True,
+        ).stdout
+        assert status == ""
+
+    def test_custom_commit_message(self, tmp_git_project):
+        config_path = tmp_git_project / ".project" / "config.yaml"
+        config = yaml.safe_load(config_path.read_text())
+        config["auto_commit"] = True
+        config_path.write_text(yaml.dump(config))
+        subprocess.run(["git", "commit", "-qam", "enable"], cwd=str(tmp_git_project), check=True)
+
+        store = Store(tmp_git_project)
+        with store.transaction(message="pm: plan sprint"):
+            store.create_story("One", "Desc")
+            store.create_story("Two", "Desc")
+
+        subject = subprocess.run(
+            ["git", "log", "-1", "--pretty=%s"],
+            cwd=str(tmp_git_project), capture_output=True, text=True,
+        ).stdout.strip()
+        assert subject == "pm: plan sprint"
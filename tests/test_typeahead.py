@@ -0,0 +1,40 @@
+"""Tests for the typeahead prefix index."""
+
+from projectman.typeahead import PrefixIndex, suggest
+
+
+def _ids(suggestions):
+    return [s.id for s in suggestions]
+
+
+ITEMS = [
+    ("US-TST-1", "Login page", "story"),
+    ("US-TST-2", "Audit log export", "story"),
+    ("US-TST-1-1", "Build   LOGIN form", "task"),
+    ("EPIC-TST-1", "Accounts", "epic"),
+]
+
+
+def test_ids_then_title_words():
+    index = PrefixIndex(ITEMS)
+    assert _ids(index.complete("us-tst-1")) == ["US-TST-1", "US-TST-1-1"]
+    assert _ids(index.complete("log")) == ["US-TST-2", "US-TST-1-1", "US-TST-1"]
+    assert _ids(index.complete("login FORM")) == ["US-TST-1-1"]
+    assert _ids(index.complete("acc")) == ["EPIC-TST-1"]
+
+
+def test_limit_empty_prefix_and_no_match():
+    index = PrefixIndex(ITEMS)
+    assert len(index.complete("log", limit=2)) == 2
+    assert index.complete("   ") == []
+    assert index.complete("zebra") == []
+
+
+def test_suggest_rebuilds_after_writes(store):
+    store.create_story("Login page", "Desc")
+    assert _ids(suggest(store.project_dir, "log")) == ["US-TST-1"]
+
+    store.update("US-TST-1", title="Signup page")
+    store.create_story("Logout button", "Desc")
+    assert _ids(suggest(store.project_dir, "log")) == ["US-TST-2"]
+    assert _ids(suggest(store.project_dir, "sign")) == ["US-TST-1"]
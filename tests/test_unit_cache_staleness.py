@@ -3,11 +3,11 @@
 import pytest
 import time
 
-from projectman.store import Store, _cache, _cache_mtimes, clear_all_caches
+from projectman.store import Store, _cache, _cache_fingerprints, clear_all_caches
 
 
 class TestCacheStaleness:
-    """Tests for mtime-based cache staleness detection."""
+    """Tests for fingerprint-based cache staleness detection."""
 
     def test_is_cache_stale_returns_false_when_fresh(self, store):
         """Newly populated cache is not stale."""
@@ -24,8 +24,8 @@ class TestCacheStaleness:
         """Cache becomes stale when a new file appears in an empty directory."""
         store.create_story("Story", "Desc")
         store.list_stories()  # populate cache with 1 story
-        mtime = _cache_mtimes.get(store._cache_key("stories"))
-        assert mtime is not None
+        fingerprints = _cache_fingerprints.get(store._cache_key("stories"))
+        assert fingerprints is not None
 
         # Simulate external file creation by touching a new file
         (store.stories_dir / "EXTERNAL-1.md").write_text(
@@ -49,45 +49,52 @@ class TestCacheStaleness:
         store.list_stories()
         assert store._is_cache_stale("unknown") is True
 
-    def test_get_dir_mtime_returns_zero_for_missing_dir(self, store):
-        """_get_dir_mtime returns (0.0, 0) for non-existent directory."""
-        # Create store without creating the stories dir via create_story
-        assert store._get_dir_mtime(store.stories_dir) == (0.0, 0)
+    def test_scan_fingerprints_empty_for_missing_dir(self, store):
+        """_scan_fingerprints returns {} for a non-existent directory."""
+        assert store._scan_fingerprints(store.epics_dir) == {}
 
-    def test_get_dir_mtime_returns_max_of_files(self, store):
-        """_get_dir_mtime returns the newest file's mtime and file count."""
+    def test_scan_fingerprints_records_inode_size_mtime(self, store):
+        """_scan_fingerprints returns (inode, size, mtime_ns) per *.md file."""
         store.create_story("Story 1", "Desc")
-        time.sleep(0.01)
         store.create_story("Story 2", "Desc")
-        mtime, count = store._get_dir_mtime(store.stories_dir)
-        newest = max(f.stat().st_mtime for f in store.stories_dir.glob("*.md"))
-        assert mtime == newest
-        assert count == 2
-
-    def test_cache_mtimes_updated_on_list_stories(self, store):
-        """_cache_mtimes is populated when list_stories populates cache."""
+        (store.stories_dir / "notes.txt").write_text("ignored")
+        fingerprints = store._scan_fingerprints(store.stories_dir)
+        assert set(fingerprints) == {"US-TST-1.md", "US-TST-2.md"}
+        st = (store.stories_dir / "US-TST-1.md").stat()
+        assert fingerprints["US-TST-1.md"] == (st.st_ino, st.st_size, st.st_mtime_ns)
+
+    def test_fingerprints_populated_on_list_stories(self, store):
+        """_cache_fingerprints is populated when list_stories populates cache."""
         store.create_story("Story", "Desc")
         store.list_stories()
         key = store._cache_key("stories")
-        assert key in _cache_mtimes
-        assert _cache_mtimes[key][0] > 0
+        assert key in _cache_fingerprints
+        assert _cache_fingerprints[key]["US-TST-1.md"][1] == "US-TST-1"
 
-    def test_cache_mtimes_updated_on_list_epics(self, store):
-        """_cache_mtimes is populated when list_epics populates cache."""
+    def test_fingerprints_populated_on_list_epics(self, store):
+        """_cache_fingerprints is populated when list_epics populates cache."""
         store.create_epic("Epic", "Desc")
         store.list_epics()
         key = store._cache_key("epics")
-        assert key in _cache_mtimes
-        assert _cache_mtimes[key][0] > 0
+        assert key in _cache_fingerprints
+        assert "EPIC-TST-1.md" in _cache_fingerprints[key]
 
-    def test_cache_mtimes_updated_on_list_tasks(self, store):
-        """_cache_mtimes is populated when list_tasks populates cache."""
+    def test_fingerprints_populated_on_list_tasks(self, store):
+        """_cache_fingerprints is populated when list_tasks populates cache."""
         store.create_story("Story", "Desc")
         store.create_task("US-TST-1", "Task", "Desc")
         store.list_tasks()
         key = store._cache_key("tasks")
-        assert key in _cache_mtimes
-        assert _cache_mtimes[key][0] > 0
+        assert key in _cache_fingerprints
+        assert "US-TST-1-1.md" in _cache_fingerprints[key]
+
+    def test_store_writes_do_not_make_cache_stale(self, store):
+        """Files written by the Store itself are fingerprinted on write."""
+        store.create_story("Story", "Desc")
+        store.list_stories()
+        store.create_story("Story 2", "Desc")
+        store.update("US-TST-1", title="Renamed")
+        assert store._is_cache_stale("stories") is False
 
 
 class TestCacheStalenessIntegration:
@@ -180,14 +187,78 @@ class TestCacheStalenessIntegration:
         assert body == "Modified externally"
 
 
-class TestClearAllCachesClearsMtimes:
-    """clear_all_caches also clears _cache_mtimes."""
+class TestClearAllCachesClearsFingerprints:
+    """clear_all_caches also clears _cache_fingerprints."""
 
-    def test_clear_all_caches_clears_mtimes(self, store):
-        """clear_all_caches resets _cache_mtimes along with _cache."""
+    def test_clear_all_caches_clears_fingerprints(self, store):
+        """clear_all_caches resets _cache_fingerprints along with _cache."""
         store.create_story("Story", "Desc")
         store.list_stories()
-        assert len(_cache_mtimes) > 0
+        assert len(_cache_fingerprints) > 0
 
         clear_all_caches()
-        assert len(_cache_mtimes) == 0
+        assert len(_cache_fingerprints) == 0
+
+
+class TestIncrementalRefresh:
+    """A stale cache re-parses only added or changed files."""
+
+    def _count_loads(self, monkeypatch):
+        import projectman.store as store_module
+
+        loaded = []
+        original_read_meta = store_module.read_meta
+
+        def counting_read_meta(path):
+            loaded.append(str(path))
+            return original_read_meta(path)
+
+        monkeypatch.setattr(store_module, "read_meta", counting_read_meta)
+        return loaded
+
+    def test_external_edit_reparses_only_that_file(self, store, monkeypatch):
+        store.create_story("Story", "Desc")
+        for i in range(5):
+            store.create_task("US-TST-1", f"Task {i}", "Body")
+        store.list_tasks()  # populate
+
+        task_path = store.tasks_dir / "US-TST-1-3.md"
+        task_path.write_text(task_path.read_text().replace("Task 2", "Edited"))
+
+        loaded = self._count_loads(monkeypatch)
+        tasks = store.list_tasks()
+        assert [p.rsplit("/", 1)[-1] for p in loaded] == ["US-TST-1-3.md"]
+        assert [t.title for t in tasks if t.id == "US-TST-1-3"] == ["Edited"]
+        assert len(tasks) == 5
+
+    def test_deleted_file_dropped_without_reparse(self, store, monkeypatch):
+        store.create_story("Story", "Desc")
+        store.create_task("US-TST-1", "Task 1", "Body")
+        store.create_task("US-TST-1", "Task 2", "Body")
+        store.list_tasks()
+
+        (store.tasks_dir / "US-TST-1-1.md").unlink()
+
+        loaded = self._count_loads(monkeypatch)
+        tasks = store.list_tasks()
+        assert loaded == []
+        assert [t.id for t in tasks] == ["US-TST-1-2"]
+
+    def test_added_file_keeps_file_name_order(self, store):
+        store.create_story("Story 1", "Desc")
+        store.create_story("Story 2", "Desc")
+        store.list_stories()
+
+        (store.stories_dir / "US-TST-10.md").write_text(
+            "---\nid: US-TST-10\ntitle: External\nstatus: backlog\npriority: should\npoints: null\ntags: []\ncreated: 2026-01-01\nupdated: 2026-01-01\n---\nBody\n"
+        )
+        ids = [s.id for s in store.list_stories()]
+        assert ids == ["US-TST-1", "US-TST-10", "US-TST-2"]
+
+    def test_unarchived_story_returns_to_cache(self, store):
+        store.create_story("Story", "Desc")
+        store.list_stories()
+        store.update("US-TST-1", status="archived")
+        assert store.list_stories() == []
+        store.update("US-TST-1", status="backlog")
+        assert [s.id for s in store.list_stories()] == ["US-TST-1"]
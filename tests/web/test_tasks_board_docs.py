@@ -235,6 +235,22 @@ def test_board_returns_grouped_tasks(client):
     assert data["summary"]["available"] + data["summary"]["not_ready"] >= 1
 
 
+def test_ready_lists_grabbable_tasks_in_pick_order(client):
+    story_id = _create_story(client, status="active")
+    long_desc = "This is a sufficiently long task description that passes the readiness check."
+    ids = [
+        client.post("/api/tasks", json={
+            "story_id": story_id, "title": title, "description": long_desc, "points": 2,
+        }).json()["id"]
+        for title in ("First", "Second")
+    ]
+    client.post("/api/tasks", json={"story_id": story_id, "title": "Thin", "description": "d"})
+
+    assert [t["id"] for t in client.get("/api/ready").json()] == ids
+    client.post(f"/api/tasks/{ids[0]}/grab", json={"assignee": "tester"})
+    assert [t["id"] for t in client.get("/api/ready?limit=5").json()] == ids[1:]
+
+
 def test_burndown_returns_points(client):
     r = client.get("/api/burndown")
     assert r.status_code == 200
@@ -260,6 +276,24 @@ def test_search_returns_results(client):
     assert any("Searchable" in item.get("title", "") for item in results)
 
 
+def test_search_filters(client):
+    _create_story(client, "Searchable Story", status="backlog")
+    active_id = _create_story(client, "Searchable Other")
+
+    r = client.get("/api/search?q=Searchable&status=active")
+    assert [item["id"] for item in r.json()] == [active_id]
+    assert client.get("/api/search?q=Searchable&type=task").json() == []
+
+
+def test_search_suggest(client):
+    story_id = _create_story(client, "Searchable Story")
+
+    r = client.get("/api/search/suggest?q=sea")
+    assert r.status_code == 200
+    assert r.json() == [{"id": story_id, "title": "Searchable Story", "type": "story"}]
+    assert client.get("/api/search/suggest?q=").json() == []
+
+
 def test_search_requires_query(client):
     r = client.get("/api/search")
     assert r.status_code == 422
@@ -296,3 +330,22 @@ def test_doc_update(client):
     # Verify content persisted
     r = client.get("/api/docs/project")
     assert r.json()["content"] == new_content
+
+
+def test_schedule_plans_remaining_tasks(client):
+    story_id = _create_story(client, status="active")
+    first = client.post("/api/tasks", json={
+        "story_id": story_id, "title": "First", "description": "d", "points": 3,
+    }).json()["id"]
+    client.post("/api/tasks", json={
+        "story_id": story_id, "title": "Second", "description": "d", "points": 2,
+        "depends_on": [first],
+    })
+
+    r = client.get("/api/schedule?agents=2")
+    assert r.status_code == 200
+    data = r.json()
+    assert data["critical_path_points"] == 5
+    assert data["makespan"] == 5
+    assert [t["id"] for t in data["tasks"]] == [first, f"{story_id}-2"]
+    assert data["scaling"][-1]["agents"] == 2